@@ -859,20 +859,33 @@ TOOL_REGISTRY = {
 
 import os
 import json
+import asyncio
+import inspect
+import contextvars
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from fastapi import FastAPI, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 
 from tools.portals.portal_handler import tc_get_org_id
+from tools.catalog.catalog_handler import tc_query_catalog
 from tools.courses.course_handler import (
     tc_create_course,
     tc_get_course,
+    tc_get_course_outline,
+    tc_export_course,
+    tc_import_course,
+    tc_clone_course,
+    tc_sync_course,
+    tc_reorder_course,
     tc_list_courses,
     tc_update_course,
     tc_delete_course,
     tc_view_course_access_requests,
-    tc_accept_or_reject_course_view_access_request
+    tc_accept_or_reject_course_view_access_request,
+    tc_bulk_respond_to_course_access_requests
 )
 from tools.chapters.chapter_handler import (
     tc_create_chapter,
@@ -881,6 +894,7 @@ from tools.chapters.chapter_handler import (
 )
 from tools.lessons.lesson_handler import (
     tc_create_lesson,
+    tc_create_lessons_bulk,
     tc_update_lesson,
     tc_delete_lesson
 )
@@ -888,19 +902,32 @@ from tools.live_workshops.live_workshop_handler import (
     tc_create_workshop,
     tc_update_workshop,
     tc_create_workshop_occurrence,
+    tc_create_recurring_workshop_occurrences,
     tc_update_workshop_occurrence,
+    tc_update_workshop_occurrence_series,
     tc_list_all_global_workshops,
-    tc_invite_user_to_session
+    tc_invite_user_to_session,
+    tc_invite_users_to_session_bulk
 )
 from tools.course_live_workshops.course_live_workshop_handler import (
     tc_create_course_live_session,
     tc_list_course_live_sessions,
     tc_delete_course_live_session,
-    invite_learner_to_course_or_course_live_session
+    invite_learner_to_course_or_course_live_session,
+    tc_invite_learners_bulk
 )
-
-
-logging.basicConfig(level=logging.INFO)
+from library import json_utils
+from library.http_client import get_http_client, get_async_http_client
+from library.cache import get_response_cache, token_fingerprint
+from library.progress import progress_reporter
+from library.logging_utils import configure_logging, log_payload, redact_token
+from tools.mcp_resources import get_widget_store
+from tools.mcp_catalog import ToolCatalog, AUTO_ORG_ID
+from library.oauth import resolve_default_org_id
+from library.catalog_mirror import get_catalog_mirror
+
+
+configure_logging()
 logger = logging.getLogger("mcp")
 
 app = FastAPI(title="TrainerCentral MCP Server (with Logging)")
@@ -925,464 +952,456 @@ widget_metadata = {
 
 TOOL_REGISTRY = {
     "tc_get_org_id": tc_get_org_id,
+    "tc_query_catalog": tc_query_catalog,
     "tc_create_course": tc_create_course,
     "tc_get_course": tc_get_course,
+    "tc_get_course_outline": tc_get_course_outline,
+    "tc_export_course": tc_export_course,
+    "tc_import_course": tc_import_course,
+    "tc_clone_course": tc_clone_course,
+    "tc_sync_course": tc_sync_course,
+    "tc_reorder_course": tc_reorder_course,
     "tc_list_courses": tc_list_courses,
     "tc_update_course": tc_update_course,
     "tc_delete_course": tc_delete_course,
     "tc_view_course_access_requests": tc_view_course_access_requests,
     "tc_accept_or_reject_course_view_access_request": tc_accept_or_reject_course_view_access_request,
+    "tc_bulk_respond_to_course_access_requests": tc_bulk_respond_to_course_access_requests,
     "tc_create_chapter": tc_create_chapter,
     "tc_update_chapter": tc_update_chapter,
     "tc_delete_chapter": tc_delete_chapter,
     "tc_create_lesson": tc_create_lesson,
+    "tc_create_lessons_bulk": tc_create_lessons_bulk,
     "tc_update_lesson": tc_update_lesson,
     "tc_delete_lesson": tc_delete_lesson,
     "tc_create_workshop": tc_create_workshop,
     "tc_update_workshop": tc_update_workshop,
     "tc_create_workshop_occurrence": tc_create_workshop_occurrence,
+    "tc_create_recurring_workshop_occurrences": tc_create_recurring_workshop_occurrences,
     "tc_update_workshop_occurrence": tc_update_workshop_occurrence,
+    "tc_update_workshop_occurrence_series": tc_update_workshop_occurrence_series,
     "tc_list_all_global_workshops": tc_list_all_global_workshops,
     "tc_invite_user_to_session": tc_invite_user_to_session,
+    "tc_invite_users_to_session_bulk": tc_invite_users_to_session_bulk,
     "tc_create_course_live_session": tc_create_course_live_session,
     "tc_list_course_live_sessions": tc_list_course_live_sessions,
     "tc_delete_course_live_session": tc_delete_course_live_session,
     "invite_learner_to_course_or_course_live_session": invite_learner_to_course_or_course_live_session,
+    "tc_invite_learners_bulk": tc_invite_learners_bulk,
 }
 
-@app.post("/")
-async def mcp_entrypoint(request: Request, authorization: str = Header(None)):
+TOOL_PARAMS = {name: set(inspect.signature(func).parameters) for name, func in TOOL_REGISTRY.items()}
+
+# Handlers that are still synchronous run here so they never block the event
+# loop; size it for the number of concurrent upstream calls per worker.
+TOOL_THREAD_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("TC_TOOL_THREADS", "32")),
+    thread_name_prefix="tc-tool",
+)
+
+
+async def call_tool(func, args: dict):
+    """
+    Await async tool handlers directly; offload sync ones to TOOL_THREAD_POOL.
+    """
+    if inspect.iscoroutinefunction(func):
+        return await func(**args)
+    loop = asyncio.get_running_loop()
+    # Copy the context so a bound progress reporter reaches the worker thread.
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(TOOL_THREAD_POOL, context.run, partial(func, **args))
+
+
+def send_payload(payload: bytes, headers: dict = None) -> Response:
+    """
+    Log an encoded JSON-RPC response and send those same bytes as the body.
+    """
+    log_payload(logger, "⬆️ MCP Response", payload)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+@app.on_event("startup")
+async def startup():
+    get_widget_store().preload()
+    mirror = get_catalog_mirror()
+    if mirror is not None:
+        mirror.start_refresher()
+
+
+@app.get("/widgets/{filename}")
+async def widget_html(filename: str, request: Request):
+    """
+    Serve a widget document directly, precompressed and cacheable by ETag.
+    """
+    try:
+        widget = get_widget_store().by_filename(filename)
+    except (KeyError, FileNotFoundError):
+        return JSONResponse(status_code=404, content={"error": "widget not found"})
+
+    headers = {"ETag": widget.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == widget.etag:
+        return Response(status_code=304, headers=headers)
+
+    encoding, body = widget.variant(request.headers.get("accept-encoding"))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="text/html", headers=headers)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    mirror = get_catalog_mirror()
+    if mirror is not None:
+        await mirror.stop_refresher()
+    await get_async_http_client().aclose()
+    TOOL_THREAD_POOL.shutdown(wait=False)
+
+
+# Members of one JSON-RPC batch run concurrently, at most this many at once.
+BATCH_CONCURRENCY = int(os.getenv("TC_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_SIZE = int(os.getenv("TC_BATCH_MAX_SIZE", "50"))
+
+
+# tools/call tasks that a notifications/cancelled can still reach, keyed by
+# (caller's token fingerprint, JSON-RPC id).
+IN_FLIGHT = {}
+
+
+def in_flight_key(authorization: str, req_id) -> tuple:
+    return token_fingerprint(authorization or ""), json_utils.dumps_str(req_id)
+
+
+class JSONRPCError(Exception):
+    """
+    Raised by a method handler to answer with a JSON-RPC error object.
+    """
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+# Static results are encoded once at import; every call splices the bytes
+# into its response instead of rebuilding and re-encoding them.
+INITIALIZE_RESULT = json_utils.dumps({
+    "protocolVersion":"2024-11-05",
+    "serverInfo":{"name":"trainercentral-fastmcp","version":"1.0.0"},
+    "capabilities":{"tools":{}}
+})
+
+TOOL_CATALOG = ToolCatalog(TOOL_REGISTRY)
+
+RESOURCES_LIST_RESULT = json_utils.dumps({
+    "resources": [
+        {
+            "uri": "ui://widget/courses.html",
+            "name": "Courses Widget",
+            "description": "Simple courses list",
+            "mimeType": "text/html+skybridge",
+            "_meta": widget_metadata
+        },
+        {
+            "uri": "ui://widget/course-details.html",
+            "name": "Course Details Widget",
+            "description": "Simple details view",
+            "mimeType": "text/html+skybridge",
+            "_meta": widget_metadata
+        }
+    ]
+})
+
+
+async def rpc_initialize(params: dict, request: Request, authorization: str):
+    return INITIALIZE_RESULT
+
+
+async def rpc_tools_list(params: dict, request: Request, authorization: str):
+    return TOOL_CATALOG.encoded
+
+
+async def rpc_resources_list(params: dict, request: Request, authorization: str):
+    return RESOURCES_LIST_RESULT
+
+
+async def rpc_resources_read(params: dict, request: Request, authorization: str):
+    uri = params.get("uri")
+    logger.info("📌 resources/read for URI: %s", uri)
+
+    try:
+        widget = get_widget_store().get(uri)
+    except KeyError:
+        logger.error("Resource not found: %s", uri)
+        raise JSONRPCError(-32002, "Resource not found")
+    except FileNotFoundError as e:
+        logger.error("Widget bundle missing: %s", e.filename)
+        raise JSONRPCError(-32002, "Widget build missing")
+
+    # The document only changes when the bundle is rebuilt, so clients
+    # can revalidate with If-None-Match instead of re-downloading it.
+    etag_headers = {"ETag": widget.etag}
+    if request is not None and request.headers.get("if-none-match") == widget.etag:
+        return Response(status_code=304, headers=etag_headers)
+
+    return {
+        "contents":[{"uri":uri,"mimeType":"text/html+skybridge","text":widget.html,"_meta":widget_metadata}]
+    }, etag_headers
+
+
+async def rpc_tools_call(params: dict, request: Request, authorization: str):
+    if not authorization or not authorization.startswith("Bearer "):
+        return {"content":[{"type":"text","text":"Authentication missing"}], "isError":True}
+
+    access_token = authorization.split("Bearer ")[-1].strip()
+    tool_name = params.get("name")
+    args = params.get("arguments", {})
+    args["access_token"] = access_token
+
+    logger.info("🔧 tools/call -> %s", tool_name)
+
+    func = TOOL_REGISTRY.get(tool_name)
+    if not func:
+        raise JSONRPCError(-32601, "Tool not found")
+
     try:
-        body = await request.json()
+        if AUTO_ORG_ID and not args.get("orgId") and "orgId" in TOOL_PARAMS[tool_name]:
+            args["orgId"] = await resolve_default_org_id(access_token)
+            logger.info("Using default orgId %s for %s", args["orgId"], tool_name)
+        result = await call_tool(func, args)
+        logger.info("📊 Tool result for %s", tool_name)
     except Exception as e:
-        logger.error("Invalid JSON in request: %s", str(e))
-        return JSONResponse(status_code=400, content={"error":"invalid json"})
+        logger.error("Tool exception: %s", str(e))
+        return {"content":[{"type":"text","text":str(e)}], "isError":True}
+
+    if isinstance(result, dict) and "_meta" in result:
+        tool_result = {
+            "content": result.get("content", []),
+            "structuredContent": result.get("structuredContent", {})
+        }
+        tool_result.update(result["_meta"])
+        return tool_result
+    return {"content":[{"type":"text","text":json_utils.dumps_str(result)}]}
+
+
+async def rpc_notifications_cancelled(params: dict, request: Request, authorization: str):
+    """
+    Cancel an in-flight tools/call started by the same caller.
+    """
+    task = IN_FLIGHT.get(in_flight_key(authorization, params.get("requestId")))
+    if task is not None and not task.done():
+        logger.info("🛑 Cancelling request %s: %s", params.get("requestId"), params.get("reason"))
+        task.cancel()
+    return None
+
+
+RPC_METHODS = {
+    "initialize": rpc_initialize,
+    "tools/list": rpc_tools_list,
+    "resources/list": rpc_resources_list,
+    "resources/read": rpc_resources_read,
+    "tools/call": rpc_tools_call,
+    "notifications/cancelled": rpc_notifications_cancelled,
+}
+
 
-    # Log incoming MCP request
-    logger.info("⬇️ MCP Request Authorization: %s", authorization)
-    logger.info(json.dumps(body, indent=2))
+def encode_result(req_id, result: bytes) -> bytes:
+    """
+    Wrap an already-encoded result in a JSON-RPC response without decoding it.
+    """
+    return b'{"jsonrpc":"2.0","id":' + json_utils.dumps(req_id) + b',"result":' + result + b'}'
 
-    method = body.get("method")
-    params = body.get("params", {})
-    req_id = body.get("id")
 
-    response_obj = {"jsonrpc":"2.0", "id": req_id}
+def encode_error(req_id, code: int, message: str) -> bytes:
+    return json_utils.dumps({"jsonrpc":"2.0", "id": req_id, "error": {"code": code, "message": message}})
 
+
+class RequestCancelled(Exception):
+    """
+    The client withdrew the request with notifications/cancelled.
+    """
+
+
+async def run_cancellable(coro, authorization: str, req_id):
+    """
+    Run `coro` as a task that notifications/cancelled can cancel by id.
+    """
+    key = in_flight_key(authorization, req_id)
+    task = asyncio.ensure_future(coro)
+    IN_FLIGHT[key] = task
     try:
-        if method == "initialize":
-            response_obj["result"] = {
-                "protocolVersion":"2024-11-05",
-                "serverInfo":{"name":"trainercentral-fastmcp","version":"1.0.0"},
-                "capabilities":{"tools":{}}
-            }
-
-        elif method == "tools/list":
-            tools_list = [
-                {
-                    "name": "tc_get_org_id",
-                    "description": "Get organizations. Call FIRST in every conversation.",
-                    "inputSchema": {"type": "object", "properties": {}, "required": []}
-                },
-                {
-                    "name": "tc_create_course",
-                    "description": "Create course. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "course_data": {"type": "object"}
-                        },
-                        "required": ["orgId", "course_data"]
-                    }
-                },
-                {
-                    "name": "tc_get_course",
-                    "description": "Get course. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "courseId": {"type": "string"}
-                        },
-                        "required": ["orgId", "courseId"]
-                    }
-                },
-                {
-                    "name": "tc_list_courses",
-                    "description": "List courses. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "limit": {"type": "integer"},
-                            "si": {"type": "integer"}
-                        },
-                        "required": ["orgId"]
-                    }
-                },
-                {
-                    "name": "tc_update_course",
-                    "description": "Update course. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "courseId": {"type": "string"},
-                            "updates": {"type": "object"}
-                        },
-                        "required": ["orgId", "courseId", "updates"]
-                    }
-                },
-                {
-                    "name": "tc_delete_course",
-                    "description": "Delete course. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "courseId": {"type": "string"}
-                        },
-                        "required": ["orgId", "courseId"]
-                    }
-                },
-                {
-                    "name": "tc_view_course_access_requests",
-                    "description": "View pending access requests for a course. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "courseId": {"type": "string"},
-                            "limit":{"type":"integer"}
-                        },
-                        "required": ["orgId", "courseId"]
-                    }
-                },
-                {
-                    "name": "tc_accept_or_reject_course_view_access_request",
-                    "description": "Accept or Reject a user's course view access request. responseStatus - 2 : Accept, 3 : Reject. Requires orgId and courseMembersId(found for each user when getting the list of user's requested).",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "courseMembersId": {"type": "string"},
-                            "responseStatus":{"type":"integer"}
-                        },
-                        "required": ["orgId", "courseMembersId", "responseStatus"]
-                    }
-                },
-                {
-                    "name": "tc_create_chapter",
-                    "description": "Create chapter. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "section_data": {"type": "object"}
-                        },
-                        "required": ["orgId", "section_data"]
-                    }
-                },
-                {
-                    "name": "tc_update_chapter",
-                    "description": "Update chapter. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "courseId": {"type": "string"},
-                            "section_id": {"type": "string"},
-                            "updates": {"type": "object"}
-                        },
-                        "required": ["orgId", "courseId", "section_id", "updates"]
-                    }
-                },
-                {
-                    "name": "tc_delete_chapter",
-                    "description": "Delete chapter. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "courseId": {"type": "string"},
-                            "section_id": {"type": "string"}
-                        },
-                        "required": ["orgId", "courseId", "section_id"]
-                    }
-                },
-                {
-                    "name": "tc_create_lesson",
-                    "description": "Create lesson. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "session_data": {"type": "object"},
-                            "content_html": {"type": "string"},
-                            "content_filename": {"type": "string"}
-                        },
-                        "required": ["orgId", "session_data", "content_html"]
-                    }
-                },
-                {
-                    "name": "tc_update_lesson",
-                    "description": "Update lesson. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "session_id": {"type": "string"},
-                            "updates": {"type": "object"}
-                        },
-                        "required": ["orgId", "session_id", "updates"]
-                    }
-                },
-                {
-                    "name": "tc_delete_lesson",
-                    "description": "Delete lesson. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "session_id": {"type": "string"}
-                        },
-                        "required": ["orgId", "session_id"]
-                    }
-                },
-                {
-                    "name": "tc_create_workshop",
-                    "description": "Create workshop. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "session_data": {"type": "object"}
-                        },
-                        "required": ["orgId", "session_data"]
-                    }
-                },
-                {
-                    "name": "tc_update_workshop",
-                    "description": "Update workshop. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "session_id": {"type": "string"},
-                            "updates": {"type": "object"}
-                        },
-                        "required": ["orgId", "session_id", "updates"]
-                    }
-                },
-                {
-                    "name": "tc_create_workshop_occurrence",
-                    "description": "Create workshop occurrence. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "talk_data": {"type": "object"}
-                        },
-                        "required": ["orgId", "talk_data"]
-                    }
-                },
-                {
-                    "name": "tc_update_workshop_occurrence",
-                    "description": "Update workshop occurrence. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "talk_id": {"type": "string"},
-                            "updates": {"type": "object"}
-                        },
-                        "required": ["orgId", "talk_id", "updates"]
-                    }
-                },
-                {
-                    "name": "tc_list_all_global_workshops",
-                    "description": "List workshops. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "filter_type": {"type": "integer"},
-                            "limit": {"type": "integer"},
-                            "si": {"type": "integer"}
-                        },
-                        "required": ["orgId"]
-                    }
-                },
-                {
-                    "name": "tc_invite_user_to_session",
-                    "description": "Invite user. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "session_id": {"type": "string"},
-                            "email": {"type": "string"},
-                            "role": {"type": "integer"},
-                            "source": {"type": "integer"}
-                        },
-                        "required": ["orgId", "session_id", "email"]
-                    }
-                },
-                {
-                    "name": "tc_create_course_live_session",
-                    "description": "Create course live session. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "courseId": {"type": "string"},
-                            "name": {"type": "string"},
-                            "description_html": {"type": "string"},
-                            "start_time": {"type": "string"},
-                            "end_time": {"type": "string"}
-                        },
-                        "required": ["orgId", "courseId", "name", "description_html", "start_time", "end_time"]
-                    }
-                },
-                {
-                    "name": "tc_list_course_live_sessions",
-                    "description": "List course live sessions. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "filter_type": {"type": "integer"},
-                            "limit": {"type": "integer"},
-                            "si": {"type": "integer"}
-                        },
-                        "required": ["orgId"]
-                    }
-                },
-                {
-                    "name": "tc_delete_course_live_session",
-                    "description": "Delete course live session. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "session_id": {"type": "string"}
-                        },
-                        "required": ["orgId", "session_id"]
-                    }
-                },
-                {
-                    "name": "invite_learner_to_course_or_course_live_session",
-                    "description": "Invite learner. Requires orgId.",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "orgId": {"type": "string"},
-                            "email": {"type": "string"},
-                            "first_name": {"type": "string"},
-                            "last_name": {"type": "string"},
-                            "courseId": {"type": "string"},
-                            "session_id": {"type": "string"}
-                        },
-                        "required": ["orgId", "email", "first_name", "last_name"]
-                    }
-                }
-            ]
-            response_obj["result"] = {"tools": tools_list}
-
-        elif method == "resources/list":
-            response_obj["result"] = {
-                "resources": [
-                    {
-                        "uri": "ui://widget/courses.html",
-                        "name": "Courses Widget",
-                        "description": "Simple courses list",
-                        "mimeType": "text/html+skybridge",
-                        "_meta": widget_metadata
-                    },
-                    {
-                        "uri": "ui://widget/course-details.html",
-                        "name": "Course Details Widget",
-                        "description": "Simple details view",
-                        "mimeType": "text/html+skybridge",
-                        "_meta": widget_metadata
-                    }
-                ]
-            }
-
-        elif method == "resources/read":
-            uri = params.get("uri")
-            logger.info("📌 resources/read for URI: %s", uri)
-
-            if uri == "ui://widget/courses.html":
-                js_path = os.path.join(os.path.dirname(__file__), "web/dist/courses-widget.js")
-            elif uri == "ui://widget/course-details.html":
-                js_path = os.path.join(os.path.dirname(__file__), "web/dist/course-details.js")
-            else:
-                response_obj["error"] = {"code": -32002, "message": "Resource not found"}
-                logger.error("Resource not found: %s", uri)
-                logger.info("⬆️ MCP Response:\n%s", json.dumps(response_obj,indent=2))
-                return JSONResponse(content=response_obj)
-
-            try:
-                with open(js_path,"r") as f:
-                    bundle = f.read()
-            except FileNotFoundError:
-                response_obj["error"] = {"code": -32002, "message": "Widget build missing"}
-                logger.error("Widget bundle missing: %s", js_path)
-                logger.info("⬆️ MCP Response:\n%s", json.dumps(response_obj,indent=2))
-                return JSONResponse(content=response_obj)
-
-            html = f"""
-            <!DOCTYPE html>
-            <html><body>
-              <div id="root"></div>
-              <script type="module">{bundle}</script>
-            </body></html>
-            """
-            response_obj["result"] = {
-                "contents":[{"uri":uri,"mimeType":"text/html+skybridge","text":html,"_meta":widget_metadata}]
-            }
-
-        elif method == "tools/call":
-            if not authorization or not authorization.startswith("Bearer "):
-                response_obj["result"] = {"content":[{"type":"text","text":"Authentication missing"}], "isError":True}
-            else:
-                access_token = authorization.split("Bearer ")[-1].strip()
-                tool_name = params.get("name")
-                args = params.get("arguments", {})
-                args["access_token"] = access_token
-
-                logger.info("🔧 tools/call -> %s", tool_name)
-                logger.info("Args: %s", json.dumps(args, indent=2))
-
-                func = TOOL_REGISTRY.get(tool_name)
-                if not func:
-                    response_obj["error"] = {"code":-32601,"message":"Tool not found"}
-                else:
-                    try:
-                        result = func(**args)
-                        logger.info("📊 Tool result for %s:\n%s", tool_name, json.dumps(result, indent=2))
-
-                        if isinstance(result, dict) and "_meta" in result:
-                            response_obj["result"] = {
-                                "content": result.get("content", []),
-                                "structuredContent": result.get("structuredContent", {})
-                            }
-                            response_obj["result"].update(result["_meta"])
-                        else:
-                            response_obj["result"] = {"content":[{"type":"text","text":json.dumps(result)}]}
-                    except Exception as e:
-                        response_obj["result"] = {"content":[{"type":"text","text":str(e)}], "isError":True}
-                        logger.error("Tool exception: %s", str(e))
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if task.cancelled():
+            raise RequestCancelled()
+        task.cancel()
+        raise
+    finally:
+        if IN_FLIGHT.get(key) is task:
+            del IN_FLIGHT[key]
+
+
+async def dispatch(message, request: Request, authorization: str) -> tuple:
+    """
+    Run one JSON-RPC message.
+
+    `request` is None for members of a batch, which cannot be answered
+    with a bare HTTP status.
+
+    Returns:
+        tuple: (encoded response bytes or a ready Response, extra headers);
+        the bytes are None when the request was cancelled.
+    """
+    if not isinstance(message, dict):
+        return encode_error(None, -32600, "Invalid Request"), None
+
+    method = message.get("method")
+    params = message.get("params", {})
+    req_id = message.get("id")
+
+    handler = RPC_METHODS.get(method)
+    if handler is None:
+        return encode_error(req_id, -32601, "Unsupported method"), None
 
+    try:
+        if method == "tools/call" and req_id is not None:
+            result = await run_cancellable(handler(params, request, authorization), authorization, req_id)
         else:
-            response_obj["error"] = {"code": -32601, "message": "Unsupported method"}
-
+            result = await handler(params, request, authorization)
+    except RequestCancelled:
+        return None, None
+    except JSONRPCError as e:
+        return encode_error(req_id, e.code, e.message), None
     except Exception as e:
-        response_obj = {"jsonrpc":"2.0","id":req_id,"error":{"code":-32000,"message":str(e)}}
         logger.error("Unexpected server error: %s", str(e))
+        return encode_error(req_id, -32000, str(e)), None
+
+    headers = None
+    if isinstance(result, Response):
+        return result, None
+    if isinstance(result, tuple):
+        result, headers = result
+    if not isinstance(result, bytes):
+        result = json_utils.dumps(result)
+    return encode_result(req_id, result), headers
+
+
+async def dispatch_batch(messages: list, authorization: str) -> Response:
+    """
+    Run a JSON-RPC batch with at most BATCH_CONCURRENCY members in flight.
+
+    Responses keep the order of the batch; notifications (no "id") get none.
+    """
+    if not messages:
+        return send_payload(encode_error(None, -32600, "Invalid Request"))
+    if len(messages) > BATCH_MAX_SIZE:
+        return send_payload(encode_error(None, -32600, f"Batch too large (max {BATCH_MAX_SIZE})"))
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run(message):
+        async with semaphore:
+            payload, _ = await dispatch(message, None, authorization)
+        return payload
+
+    payloads = await asyncio.gather(*(run(message) for message in messages))
+    replies = [
+        payload for message, payload in zip(messages, payloads)
+        if payload is not None and (not isinstance(message, dict) or "id" in message)
+    ]
+    if not replies:
+        return Response(status_code=202)
+    return send_payload(b"[" + b",".join(replies) + b"]")
 
 
-    logger.info("⬆️ MCP Response:\n%s", json.dumps(response_obj, indent=2))
+@app.post("/")
+async def mcp_entrypoint(request: Request, authorization: str = Header(None)):
+    raw_body = await request.body()
+    try:
+        body = json_utils.loads(raw_body)
+    except Exception as e:
+        logger.error("Invalid JSON in request: %s", str(e))
+        return JSONResponse(status_code=400, content={"error":"invalid json"})
 
-    return JSONResponse(content=response_obj)
\ No newline at end of file
+    # Log incoming MCP request as received, without re-encoding it
+    logger.info("⬇️ MCP Request Authorization: %s", redact_token(authorization))
+    log_payload(logger, "⬇️ MCP Request", raw_body)
+
+    if isinstance(body, list):
+        return await dispatch_batch(body, authorization)
+
+    if (
+        isinstance(body, dict) and body.get("method") == "tools/call" and "id" in body
+        and "text/event-stream" in request.headers.get("accept", "")
+    ):
+        return stream_tool_call(body, request, authorization)
+
+    payload, headers = await dispatch(body, request, authorization)
+    if isinstance(payload, Response):
+        return payload
+    if payload is None or (isinstance(body, dict) and "id" not in body):
+        # Notifications and cancelled requests get no JSON-RPC response.
+        return Response(status_code=202)
+    return send_payload(payload, headers)
+
+
+def sse_event(payload: bytes) -> bytes:
+    return b"event: message\ndata: " + payload + b"\n\n"
+
+
+def stream_tool_call(body: dict, request: Request, authorization: str) -> StreamingResponse:
+    """
+    Answer a tools/call as an MCP streamable-HTTP event stream.
+
+    If the call carries params._meta.progressToken, every report_progress()
+    step is sent as a notifications/progress event before the final
+    response. The call is cancelled if the client disconnects or sends
+    notifications/cancelled for it.
+    """
+    progress_token = ((body.get("params") or {}).get("_meta") or {}).get("progressToken")
+    events = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+
+    def reporter(progress, total=None, message=None):
+        params = {"progressToken": progress_token, "progress": progress}
+        if total is not None:
+            params["total"] = total
+        if message:
+            params["message"] = message
+        notification = {"jsonrpc": "2.0", "method": "notifications/progress", "params": params}
+        loop.call_soon_threadsafe(events.put_nowait, json_utils.dumps(notification))
+
+    async def run():
+        if progress_token is None:
+            return await dispatch(body, None, authorization)
+        with progress_reporter(reporter):
+            return await dispatch(body, None, authorization)
+
+    async def stream():
+        call = asyncio.ensure_future(run())
+        try:
+            while not call.done() or not events.empty():
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait({call, next_event}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event.done():
+                    yield sse_event(next_event.result())
+                else:
+                    next_event.cancel()
+            payload, _ = call.result()
+            if payload is not None:
+                log_payload(logger, "⬆️ MCP Response", payload)
+                yield sse_event(payload)
+        finally:
+            if not call.done():
+                logger.info("Client went away, cancelling request %s", body.get("id"))
+                call.cancel()
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "http_pool": get_http_client().pool_stats(),
+        "async_http_pool": get_async_http_client().pool_stats(),
+        "response_cache": get_response_cache().stats()
+    }
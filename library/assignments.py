@@ -1,11 +1,12 @@
 import os
-import requests
+from .http_client import get_http_client
 from .common_utils import TrainerCentralCommon  
 
 class TrainerCentralAssignments:
     def __init__(self):
         tc_api = os.getenv("TC_API_BASE_URL")
         self.base_url = f"{tc_api}/api/v4"
+        self.http = get_http_client()
         self.common = TrainerCentralCommon()
 
     def create_assignment(self, assignment_data: dict) -> dict:
@@ -18,7 +19,7 @@ class TrainerCentralAssignments:
             "Authorization": f"Bearer {self.oauth.get_access_token()}"
         }
         payload = {"session": assignment_data}
-        return requests.post(url, json=payload, headers=headers).json()
+        return self.http.post(url, json=payload, headers=headers).json()
 
     def add_text_instructions(self,
                               session_id: str,
@@ -47,7 +48,7 @@ class TrainerCentralAssignments:
             "filename": filename,
             "viewType": view_type
         }
-        return requests.post(url, json=body, headers=headers).json()
+        return self.http.post(url, json=body, headers=headers).json()
 
     def create_assignment_with_instructions(self,
                                             assignment_data: dict,
@@ -0,0 +1,185 @@
+"""
+TTL response cache shared by the TrainerCentral read wrappers.
+
+Entries are keyed by (principal, orgId, resource, resource_id), where the
+principal is a fingerprint of the caller's access token, so one user never
+sees another user's cached responses. Each resource has its own TTL and the
+whole cache is an LRU bounded by the JSON-encoded size of its entries.
+
+Configuration (environment variables):
+    TC_CACHE_MAX_BYTES        total size budget (default 32 MB, 0 disables)
+    TC_CACHE_TTL_<RESOURCE>   TTL in seconds for one resource,
+                              e.g. TC_CACHE_TTL_COURSES=30
+
+Resources that do not belong to an org (the caller's portal list) are
+stored under an empty orgId.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from . import json_utils
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {
+    "course": 300,
+    "courses": 60,
+    "course_lessons": 120,
+    "course_outline": 120,
+    "workshops": 60,
+    "portals": 600,
+}
+
+
+def token_fingerprint(access_token: str) -> str:
+    """
+    Stable, non-reversible identifier for an access token.
+    """
+    return hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+
+class ResponseCache:
+    """
+    Byte-bounded LRU cache with per-resource TTLs and hit/miss counters.
+    """
+
+    def __init__(self, max_bytes: int = None, ttls: dict = None):
+        if max_bytes is None:
+            max_bytes = int(os.getenv("TC_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS)
+        for resource in self.ttls:
+            env_ttl = os.getenv(f"TC_CACHE_TTL_{resource.upper()}")
+            if env_ttl is not None:
+                self.ttls[resource] = int(env_ttl)
+        self.ttls.update(ttls or {})
+
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = {}
+        self.misses = {}
+        self.evictions = 0
+
+    def key(self, access_token: str, orgId: str, resource: str, resource_id: str = "") -> tuple:
+        return (token_fingerprint(access_token), str(orgId), resource, str(resource_id))
+
+    def get(self, key: tuple):
+        """
+        Return the cached value for `key`, or None on a miss or expired entry.
+        """
+        resource = key[2]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits[resource] = self.hits.get(resource, 0) + 1
+                return entry[2]
+            if entry is not None:
+                self._drop(key)
+            self.misses[resource] = self.misses.get(resource, 0) + 1
+            return None
+
+    def set(self, key: tuple, value) -> None:
+        """
+        Store `value` under `key` for the TTL of its resource.
+        """
+        ttl = self.ttls.get(key[2], 0)
+        if ttl <= 0 or self.max_bytes <= 0:
+            return
+
+        size = len(json_utils.dumps(value))
+        if size > self.max_bytes:
+            logger.info("Not caching %s: %d bytes exceeds cache size", key[2], size)
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, orgId: str, resource: str, resource_id: str = None) -> int:
+        """
+        Drop cached entries of `resource` in `orgId` for every principal.
+
+        Args:
+            orgId (str): Organization whose entries are dropped.
+            resource (str): Resource name, e.g. "course" or "courses".
+            resource_id (str, optional): Only drop this ID; all IDs when omitted.
+
+        Returns:
+            int: number of entries dropped.
+        """
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if key[1] == str(orgId) and key[2] == resource
+                and (resource_id is None or key[3] == str(resource_id))
+            ]
+            for key in stale:
+                self._drop(key)
+        return len(stale)
+
+    def invalidate_course(self, orgId: str, courseId: str = None) -> None:
+        """
+        Drop the course list plus everything cached for one course
+        (or for every course in the org when courseId is omitted).
+        """
+        self.invalidate(orgId, "courses")
+        self.invalidate(orgId, "course", courseId)
+        self.invalidate_course_content(orgId, courseId)
+
+    def invalidate_course_content(self, orgId: str, courseId: str = None) -> None:
+        """
+        Drop the cached lessons and outline of one course (or of every
+        course in the org when courseId is omitted).
+        """
+        self.invalidate(orgId, "course_lessons", courseId)
+        self.invalidate(orgId, "course_outline", courseId)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": sum(self.hits.values()),
+                "misses": sum(self.misses.values()),
+                "evictions": self.evictions,
+                "by_resource": {
+                    resource: {
+                        "ttl": self.ttls.get(resource, 0),
+                        "hits": self.hits.get(resource, 0),
+                        "misses": self.misses.get(resource, 0),
+                    }
+                    for resource in sorted(set(self.ttls) | set(self.hits) | set(self.misses))
+                },
+            }
+
+    def _drop(self, key: tuple) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+
+response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Return the process-wide response cache.
+    """
+    return response_cache
@@ -0,0 +1,406 @@
+"""
+Optional local SQLite mirror of each portal's catalog.
+
+Questions such as "which courses have no lessons" or "find the course about
+Kubernetes" would otherwise need a full course listing plus a walk of every
+course. The mirror keeps the courses, sections, sessions and upcoming
+workshops of every portal that has been queried, indexed by name and IDs,
+and answers those questions locally.
+
+A portal is mirrored from its first query on. Every query first checks
+that the portal is one of the caller's (the mirror outlives the caller's
+session, so the data on disk alone proves nothing). A background task then
+refreshes every mirrored portal with the most recent caller's token,
+falling back to the last token a refresh succeeded with:
+the course list is read in full (it is one paginated call), but sections
+and sessions are re-read only for courses that are new or whose
+lastUpdatedTime changed (or that carry no such field); courses that
+disappeared are dropped. Every query result carries the portal's refresh
+time and age so callers can decide whether the answer is fresh enough.
+
+Tokens are kept in memory only. A token whose refresh fails is dropped,
+so one caller's expired token cannot stop the refreshes for everyone. A
+portal whose refresh fails keeps its last data, and its age keeps growing.
+
+Configuration (environment variables):
+    TC_MIRROR_PATH              SQLite file; unset disables the mirror
+    TC_MIRROR_REFRESH_SECONDS   interval between refreshes (default 300);
+                                data older than twice this is "stale"
+"""
+
+import os
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+
+from library import json_utils
+from library.courses import AsyncTrainerCentralCourses
+from library.live_workshops import AsyncTrainerCentralLiveWorkshops
+from library.concurrency import gather_bounded
+from library.oauth import get_user_portals_async, extract_all_org_ids
+
+logger = logging.getLogger(__name__)
+
+MIRROR_PATH = os.getenv("TC_MIRROR_PATH")
+MIRROR_REFRESH_SECONDS = int(os.getenv("TC_MIRROR_REFRESH_SECONDS", "300"))
+
+LIVE_DELIVERY_MODE = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    org_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    name TEXT,
+    last_updated TEXT,
+    data TEXT,
+    PRIMARY KEY (org_id, course_id)
+);
+CREATE INDEX IF NOT EXISTS courses_name ON courses (org_id, name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS sections (
+    org_id TEXT NOT NULL,
+    section_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    name TEXT,
+    data TEXT,
+    PRIMARY KEY (org_id, section_id)
+);
+CREATE INDEX IF NOT EXISTS sections_course ON sections (org_id, course_id);
+CREATE INDEX IF NOT EXISTS sections_name ON sections (org_id, name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    org_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    section_id TEXT,
+    name TEXT,
+    delivery_mode INTEGER,
+    data TEXT,
+    PRIMARY KEY (org_id, session_id)
+);
+CREATE INDEX IF NOT EXISTS sessions_course ON sessions (org_id, course_id);
+CREATE INDEX IF NOT EXISTS sessions_section ON sessions (org_id, section_id);
+CREATE INDEX IF NOT EXISTS sessions_name ON sessions (org_id, name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS workshops (
+    org_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    name TEXT,
+    start_time TEXT,
+    data TEXT,
+    PRIMARY KEY (org_id, session_id)
+);
+CREATE INDEX IF NOT EXISTS workshops_name ON workshops (org_id, name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS refreshes (
+    org_id TEXT PRIMARY KEY,
+    refreshed_at REAL,
+    duration REAL,
+    courses_changed INTEGER
+);
+"""
+
+# Columns returned by query(), per kind.
+QUERY_COLUMNS = {
+    "courses": ("course_id AS courseId", "name AS courseName", "last_updated AS lastUpdatedTime"),
+    "sections": ("section_id AS sectionId", "course_id AS courseId", "name"),
+    "sessions": ("session_id AS sessionId", "course_id AS courseId", "section_id AS sectionId",
+                 "name", "delivery_mode AS deliveryMode"),
+    "workshops": ("session_id AS sessionId", "name", "start_time AS startTime"),
+}
+
+
+def _course_version(course: dict) -> str:
+    value = course.get("lastUpdatedTime") or course.get("lastModifiedTime") or course.get("updatedTime")
+    return str(value) if value else None
+
+
+class CatalogMirror:
+    """
+    SQLite-backed catalog of the portals queried so far.
+    """
+
+    def __init__(self, path: str, refresh_seconds: int = MIRROR_REFRESH_SECONDS):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self.courses = AsyncTrainerCentralCourses()
+        self.workshops = AsyncTrainerCentralLiveWorkshops()
+        self.tokens = {}            # orgId -> last token a refresh succeeded with
+        self.candidates = {}        # orgId -> latest caller's token, not yet refreshed with
+        self.refreshing = {}        # orgId -> in-flight refresh task
+        self._task = None
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+
+    def _run(self, func, *args):
+        # One connection shared by worker threads; the lock serializes use.
+        def locked():
+            with self._lock:
+                return func(*args)
+        return asyncio.to_thread(locked)
+
+    # ---- refresh ----
+
+    def track(self, orgId: str, access_token: str) -> None:
+        """
+        Mirror `orgId` from now on, trying `access_token` at the next refresh.
+        """
+        orgId = str(orgId)
+        if self.tokens.get(orgId) != access_token:
+            self.candidates[orgId] = access_token
+
+    async def refresh(self, orgId: str, access_token: str = None) -> dict:
+        """
+        Bring one portal up to date; concurrent calls share one refresh.
+        """
+        orgId = str(orgId)
+        task = self.refreshing.get(orgId)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(
+                orgId, access_token or self.candidates.get(orgId) or self.tokens[orgId]
+            ))
+            self.refreshing[orgId] = task
+            task.add_done_callback(lambda _: self.refreshing.pop(orgId, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(self, orgId: str, access_token: str) -> dict:
+        started = time.time()
+        # Read upstream, not the response cache.
+        self.courses.cache.invalidate(orgId, "courses")
+        self.workshops.cache.invalidate(orgId, "workshops")
+
+        known = dict(await self._run(self._course_versions, orgId))
+        listed = []
+        changed = []
+        pages = self.courses.iter_courses(orgId, access_token)
+        async for course in pages:
+            course_id = str(course.get("courseId") or course.get("id"))
+            version = _course_version(course)
+            listed.append((course_id, course.get("courseName") or course.get("name"), version,
+                           json_utils.dumps_str(course)))
+            if course_id not in known or version is None or known[course_id] != version:
+                changed.append(course_id)
+        # An error body has no course list; it must not empty the mirror.
+        if "courses" not in (pages.first_page or {}):
+            raise RuntimeError(f"Cannot list courses of {orgId}: {pages.first_page}")
+
+        def children_factory(course_id):
+            async def children():
+                return await asyncio.gather(
+                    self.courses.iter_course_children(course_id, orgId, access_token, "sections").collect(),
+                    self.courses.iter_course_children(course_id, orgId, access_token, "sessions").collect(),
+                )
+            return children
+
+        children = await gather_bounded(children_factory(course_id) for course_id in changed)
+        workshop_pages = self.workshops.iter_upcoming_workshops(orgId, access_token)
+        workshops = await workshop_pages.collect()
+        if "sessions" not in (workshop_pages.first_page or {}):
+            raise RuntimeError(f"Cannot list workshops of {orgId}: {workshop_pages.first_page}")
+
+        failed = [course_id for course_id, result in zip(changed, children) if isinstance(result, Exception)]
+        if failed:
+            logger.warning("Mirror refresh of %s: %d courses failed, e.g. %s: %s",
+                           orgId, len(failed), failed[0], children[changed.index(failed[0])])
+        updates = {
+            course_id: result for course_id, result in zip(changed, children)
+            if not isinstance(result, Exception)
+        }
+        # A course whose children could not be read keeps its old version,
+        # so the next refresh reads it again.
+        listed = [
+            (course_id, name, known.get(course_id) if course_id in failed else version, data)
+            for course_id, name, version, data in listed
+        ]
+        await self._run(self._store, orgId, listed, updates, workshops, started)
+        self.tokens[orgId] = access_token
+        if self.candidates.get(orgId) == access_token:
+            del self.candidates[orgId]
+        logger.info("Mirror refreshed %s: %d courses, %d re-read, %.2fs",
+                    orgId, len(listed), len(updates), time.time() - started)
+        return {"courses": len(listed), "changed": len(updates), "failed": len(failed)}
+
+    def _course_versions(self, orgId: str) -> list:
+        return self._db.execute(
+            "SELECT course_id, last_updated FROM courses WHERE org_id = ?", (orgId,)
+        ).fetchall()
+
+    def _store(self, orgId, listed, updates, workshops, started):
+        db = self._db
+        with db:
+            listed_ids = {row[0] for row in listed}
+            gone = [row[0] for row in db.execute(
+                "SELECT course_id FROM courses WHERE org_id = ?", (orgId,)
+            ) if row[0] not in listed_ids]
+            for table in ("courses", "sections", "sessions"):
+                db.executemany(f"DELETE FROM {table} WHERE org_id = ? AND course_id = ?",
+                               [(orgId, course_id) for course_id in gone])
+
+            db.executemany(
+                "INSERT OR REPLACE INTO courses (org_id, course_id, name, last_updated, data) VALUES (?, ?, ?, ?, ?)",
+                [(orgId, course_id, name, version, data) for course_id, name, version, data in listed]
+            )
+
+            for course_id, (sections, sessions) in updates.items():
+                db.execute("DELETE FROM sections WHERE org_id = ? AND course_id = ?", (orgId, course_id))
+                db.execute("DELETE FROM sessions WHERE org_id = ? AND course_id = ?", (orgId, course_id))
+                db.executemany(
+                    "INSERT OR REPLACE INTO sections (org_id, section_id, course_id, name, data) VALUES (?, ?, ?, ?, ?)",
+                    [(orgId, str(s.get("sectionId") or s.get("id")), course_id, s.get("name"),
+                      json_utils.dumps_str(s)) for s in sections]
+                )
+                db.executemany(
+                    "INSERT OR REPLACE INTO sessions (org_id, session_id, course_id, section_id, name, delivery_mode, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(orgId, str(s.get("sessionId") or s.get("id")), course_id,
+                      str(s["sectionId"]) if s.get("sectionId") else None, s.get("name"),
+                      int(s["deliveryMode"]) if str(s.get("deliveryMode", "")).isdigit() else None,
+                      json_utils.dumps_str(s)) for s in sessions]
+                )
+
+            db.execute("DELETE FROM workshops WHERE org_id = ?", (orgId,))
+            db.executemany(
+                "INSERT OR REPLACE INTO workshops (org_id, session_id, name, start_time, data) VALUES (?, ?, ?, ?, ?)",
+                [(orgId, str(w.get("sessionId") or w.get("id")), w.get("name"),
+                  str(w.get("startTime") or w.get("scheduledTime") or ""), json_utils.dumps_str(w))
+                 for w in workshops]
+            )
+
+            db.execute(
+                "INSERT OR REPLACE INTO refreshes (org_id, refreshed_at, duration, courses_changed) VALUES (?, ?, ?, ?)",
+                (orgId, time.time(), time.time() - started, len(updates))
+            )
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            for orgId in list(dict.fromkeys([*self.candidates, *self.tokens])):
+                await self._refresh_with_known_tokens(orgId)
+
+    async def _refresh_with_known_tokens(self, orgId: str) -> None:
+        # The newest caller's token first, then the last one that worked.
+        for access_token in dict.fromkeys(filter(None, (self.candidates.get(orgId), self.tokens.get(orgId)))):
+            try:
+                await self.refresh(orgId, access_token)
+                return
+            except Exception as e:
+                logger.warning("Mirror refresh of %s failed: %s", orgId, e)
+                if self.candidates.get(orgId) == access_token:
+                    del self.candidates[orgId]
+
+    def start_refresher(self) -> None:
+        """
+        Start the background refresh task on the running loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+    async def stop_refresher(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---- queries ----
+
+    def _staleness(self, orgId: str) -> dict:
+        row = self._db.execute(
+            "SELECT refreshed_at, duration FROM refreshes WHERE org_id = ?", (orgId,)
+        ).fetchone()
+        if row is None:
+            return {"refreshedAt": None, "ageSeconds": None, "stale": True}
+        age = time.time() - row["refreshed_at"]
+        return {
+            "refreshedAt": int(row["refreshed_at"] * 1000),
+            "ageSeconds": round(age, 1),
+            "stale": age > 2 * self.refresh_seconds,
+            "refreshSeconds": self.refresh_seconds,
+        }
+
+    def _query(self, orgId, kind, name_contains, courseId, without_lessons, limit):
+        conditions = ["org_id = ?"]
+        args = [orgId]
+        if name_contains:
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            escaped = name_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            args.append(f"%{escaped}%")
+        if courseId and kind in ("sections", "sessions", "courses"):
+            conditions.append("course_id = ?")
+            args.append(str(courseId))
+        columns = list(QUERY_COLUMNS[kind])
+        if kind == "courses":
+            lessons = (
+                "(SELECT COUNT(*) FROM sessions s WHERE s.org_id = courses.org_id "
+                "AND s.course_id = courses.course_id AND COALESCE(s.delivery_mode, 0) != %d)" % LIVE_DELIVERY_MODE
+            )
+            columns.append(f"{lessons} AS lessonCount")
+            columns.append(
+                "(SELECT COUNT(*) FROM sections c WHERE c.org_id = courses.org_id "
+                "AND c.course_id = courses.course_id) AS chapterCount"
+            )
+            if without_lessons:
+                conditions.append(f"{lessons} = 0")
+        where = " AND ".join(conditions)
+        rows = self._db.execute(
+            f"SELECT {', '.join(columns)} FROM {kind} WHERE {where} ORDER BY name COLLATE NOCASE LIMIT ?",
+            args + [limit + 1]
+        ).fetchall()
+        items = [dict(row) for row in rows]
+        return items[:limit], len(items) > limit, self._staleness(orgId)
+
+    async def query(self, orgId: str, access_token: str, kind: str = "courses", name_contains: str = None,
+                    courseId: str = None, without_lessons: bool = False, limit: int = 25,
+                    refresh: bool = False) -> dict:
+        """
+        Answer a catalog question from the mirror.
+
+        The first query for a portal (or refresh=True) refreshes it before
+        answering; later queries answer immediately from the last refresh.
+
+        Raises:
+            ValueError: `orgId` is not one of the caller's portals.
+
+        Returns:
+            dict: {kind: [...], "truncated": False,
+                   "mirror": {"refreshedAt": ms, "ageSeconds": 12.5, "stale": False, ...}}
+        """
+        if kind not in QUERY_COLUMNS:
+            raise ValueError(f"kind must be one of {', '.join(QUERY_COLUMNS)}")
+        orgId = str(orgId)
+        portals = await get_user_portals_async(access_token)
+        if orgId not in {str(org_id) for org_id in extract_all_org_ids(portals)}:
+            raise ValueError(f"Not one of your portals: {orgId}")
+        first = orgId not in self.tokens and orgId not in self.candidates
+        self.track(orgId, access_token)
+        if refresh or (first and (await self._run(self._staleness, orgId))["refreshedAt"] is None):
+            await self.refresh(orgId, access_token)
+
+        items, truncated, staleness = await self._run(
+            self._query, orgId, kind, name_contains, courseId, without_lessons, max(1, min(limit, 200))
+        )
+        staleness["refreshing"] = orgId in self.refreshing
+        return {kind: items, "truncated": truncated, "mirror": staleness}
+
+
+_mirror = None
+
+
+def get_catalog_mirror():
+    """
+    Return the process-wide CatalogMirror, or None when TC_MIRROR_PATH is unset.
+    """
+    global _mirror
+    if _mirror is None and MIRROR_PATH:
+        _mirror = CatalogMirror(MIRROR_PATH)
+    return _mirror
@@ -3,7 +3,8 @@ TrainerCentral Chapters (Sections) API Wrapper.
 """
 
 import os
-import requests
+from .http_client import get_http_client, get_async_http_client
+from .cache import get_response_cache
 # from .oauth import ZohoOAuth
 
 
@@ -16,6 +17,8 @@ class TrainerCentralChapters:
     def __init__(self):
         tc_api = os.getenv("TC_API_BASE_URL", "https://myacademy.trainercentral.in")
         self.base_url = f"{tc_api}/api/v4"
+        self.http = get_http_client()
+        self.cache = get_response_cache()
 
     def create_chapter(self, section_data: dict, orgId: str, access_token: str):
         """
@@ -51,7 +54,9 @@ class TrainerCentralChapters:
         }
         data = {"section": section_data}
 
-        return requests.post(request_url, json=data, headers=headers).json()
+        response = self.http.post(request_url, json=data, headers=headers).json()
+        self.cache.invalidate_course(orgId, section_data.get("courseId"))
+        return response
 
     def update_chapter(self, courseId: str, section_id: str, updates: dict, orgId: str, access_token: str):
         """
@@ -88,7 +93,9 @@ class TrainerCentralChapters:
         }
         data = {"section": updates}
 
-        return requests.put(request_url, json=data, headers=headers).json()
+        response = self.http.put(request_url, json=data, headers=headers).json()
+        self.cache.invalidate_course(orgId, courseId)
+        return response
 
     def delete_chapter(self, courseId: str, section_id: str, orgId: str, access_token: str):
         """
@@ -114,4 +121,66 @@ class TrainerCentralChapters:
             "Authorization": f"Bearer {access_token}"
         }
 
-        return requests.delete(request_url, headers=headers).json()
+        response = self.http.delete(request_url, headers=headers).json()
+        self.cache.invalidate_course(orgId, courseId)
+        return response
+
+
+class AsyncTrainerCentralChapters:
+    """
+    Async version of TrainerCentralChapters, for callers running on an event loop.
+    See TrainerCentralChapters for the API details of each call.
+    """
+
+    def __init__(self):
+        tc_api = os.getenv("TC_API_BASE_URL", "https://myacademy.trainercentral.in")
+        self.base_url = f"{tc_api}/api/v4"
+        self.http = get_async_http_client()
+        self.cache = get_response_cache()
+
+    async def create_chapter(self, section_data: dict, orgId: str, access_token: str):
+        """
+        Create a chapter under a course.
+        """
+        request_url = f"{self.base_url}/{orgId}/sections.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        data = {"section": section_data}
+
+        response = (await self.http.post(request_url, json=data, headers=headers)).json()
+        self.cache.invalidate_course(orgId, section_data.get("courseId"))
+        return response
+
+    async def update_chapter(self, courseId: str, section_id: str, updates: dict, orgId: str, access_token: str):
+        """
+        Edit a chapter name or reorder a chapter inside a course.
+        """
+        request_url = (
+            f"{self.base_url}/{orgId}/course/{courseId}/sections/{section_id}.json"
+        )
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        data = {"section": updates}
+
+        response = (await self.http.put(request_url, json=data, headers=headers)).json()
+        self.cache.invalidate_course(orgId, courseId)
+        return response
+
+    async def delete_chapter(self, courseId: str, section_id: str, orgId: str, access_token: str):
+        """
+        Delete a chapter from a course.
+        """
+        request_url = (
+            f"{self.base_url}/{orgId}/course/{courseId}/sections/{section_id}.json"
+        )
+        headers = {
+            "Authorization": f"Bearer {access_token}"
+        }
+
+        response = (await self.http.delete(request_url, headers=headers)).json()
+        self.cache.invalidate_course(orgId, courseId)
+        return response
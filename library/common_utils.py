@@ -1,7 +1,7 @@
 # library/common_utils.py
 
 import os
-import requests
+from .http_client import get_http_client, get_async_http_client
 from datetime import datetime
 
 class TrainerCentralCommon:
@@ -12,6 +12,7 @@ class TrainerCentralCommon:
     def __init__(self):
         tc_api = os.getenv("TC_API_BASE_URL")
         self.base_url = f"{tc_api}/api/v4"
+        self.http = get_http_client()
 
     def delete_resource(self, resource: str, resource_id: str, orgId: str, access_token: str) -> dict:
         """
@@ -28,7 +29,35 @@ class TrainerCentralCommon:
         headers = {
             "Authorization": f"Bearer {access_token}"
         }
-        response = requests.delete(request_url, headers=headers)
+        response = self.http.delete(request_url, headers=headers)
+        return response.json()
+
+
+class AsyncTrainerCentralCommon:
+    """
+    Async version of TrainerCentralCommon.
+    """
+    def __init__(self):
+        tc_api = os.getenv("TC_API_BASE_URL")
+        self.base_url = f"{tc_api}/api/v4"
+        self.http = get_async_http_client()
+
+    async def delete_resource(self, resource: str, resource_id: str, orgId: str, access_token: str) -> dict:
+        """
+        Delete a generic resource.
+
+        Args:
+            resource (str): the resource path (e.g. "sessions", "courses", "course/<courseId>/sections")
+            resource_id (str): the ID of the resource to delete.
+
+        Returns:
+            dict: API response JSON.
+        """
+        request_url = f"{self.base_url}/{orgId}/{resource}/{resource_id}.json"
+        headers = {
+            "Authorization": f"Bearer {access_token}"
+        }
+        response = await self.http.delete(request_url, headers=headers)
         return response.json()
 
 
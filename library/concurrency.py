@@ -0,0 +1,248 @@
+"""
+Helpers for fanning out many TrainerCentral calls at once.
+
+Bulk operations use these instead of bare asyncio.gather so that a
+100-item request never opens 100 upstream calls at the same time, and so
+one failed item does not abort the others. run_dag() does the same for
+work whose steps depend on each other (e.g. a course before its chapters).
+
+Configuration (environment variables):
+    TC_BULK_CONCURRENCY  upstream calls a bulk operation keeps in flight (default 4)
+    TC_BULK_MAX_ITEMS    largest accepted bulk request (default 100)
+    TC_RATE_LIMIT_PER_SEC  sustained upstream calls per second and per org
+                           for rate-limited fan-outs (default 10, 0 = unlimited)
+    TC_RATE_LIMIT_BURST    calls allowed back to back before the rate applies
+                           (default: the per-second rate)
+"""
+
+import os
+import time
+import asyncio
+
+BULK_CONCURRENCY = int(os.getenv("TC_BULK_CONCURRENCY", "4"))
+BULK_MAX_ITEMS = int(os.getenv("TC_BULK_MAX_ITEMS", "100"))
+RATE_LIMIT_PER_SEC = float(os.getenv("TC_RATE_LIMIT_PER_SEC", "10"))
+RATE_LIMIT_BURST = int(os.getenv("TC_RATE_LIMIT_BURST", "0")) or None
+
+
+async def gather_bounded(factories, limit: int = None) -> list:
+    """
+    Run coroutine factories with at most `limit` running at once.
+
+    Args:
+        factories: iterable of zero-argument callables returning a coroutine.
+        limit (int, optional): concurrency cap (default BULK_CONCURRENCY).
+
+    Returns:
+        list: one entry per factory, in order; a failed item's entry is the
+        exception it raised.
+    """
+    semaphore = asyncio.Semaphore(limit or BULK_CONCURRENCY)
+
+    async def run(factory):
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(run(factory) for factory in factories), return_exceptions=True)
+
+
+def check_bulk_size(items: list, what: str = "items") -> None:
+    """
+    Reject empty or oversized bulk requests with a ValueError.
+    """
+    if not items:
+        raise ValueError(f"No {what} given")
+    if len(items) > BULK_MAX_ITEMS:
+        raise ValueError(f"Too many {what}: {len(items)} (max {BULK_MAX_ITEMS})")
+
+
+def check_response(response, what: str):
+    """
+    Raise RuntimeError when an upstream write answered with an error body.
+    """
+    if isinstance(response, dict) and ("error" in response or "errors" in response):
+        raise RuntimeError(f"{what} failed: {response}")
+    return response
+
+
+async def map_bounded(func, items, limit: int = None, rate_limiter=None) -> list:
+    """
+    Await `func(item)` for every item with at most `limit` calls in flight.
+
+    `items` is consumed lazily, so a generator (e.g. rows streamed from a
+    CSV) is only read as fast as calls complete.
+
+    Args:
+        func: coroutine function taking one item.
+        items: iterable of items.
+        limit (int, optional): concurrency cap (default BULK_CONCURRENCY).
+        rate_limiter (RateLimiter, optional): also wait for a token per call.
+
+    Returns:
+        list: one entry per item, in order; exceptions are returned, not raised.
+    """
+    semaphore = asyncio.Semaphore(limit or BULK_CONCURRENCY)
+
+    async def run(item):
+        try:
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            return await func(item)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    try:
+        for item in items:
+            await semaphore.acquire()
+            tasks.append(asyncio.ensure_future(run(item)))
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_dag(nodes: dict, limit: int = None, rate_limiter=None, on_done=None) -> dict:
+    """
+    Run a dependency graph of coroutines, each as soon as its dependencies
+    succeed, with at most `limit` running at once.
+
+    Args:
+        nodes (dict): {key: (deps, func)} where `deps` lists the keys that
+            must finish first and `func(results)` returns a coroutine;
+            `results` maps every finished key to its return value.
+        limit (int, optional): concurrency cap (default BULK_CONCURRENCY).
+        rate_limiter (RateLimiter, optional): also wait for a token per node.
+        on_done (callable, optional): called as on_done(key, outcome) after
+            each node finishes, fails or is skipped.
+
+    Returns:
+        dict: {key: {"status": "done", "result": ...}
+                    | {"status": "failed", "error": "..."}
+                    | {"status": "skipped", "error": "dependency <key> failed"}}
+
+    Raises:
+        ValueError: a node depends on an unknown key, or the graph has a cycle.
+    """
+    dependents = {key: [] for key in nodes}
+    waiting = {}
+    for key, (deps, _) in nodes.items():
+        for dep in deps:
+            if dep not in nodes:
+                raise ValueError(f"{key} depends on unknown node {dep}")
+            dependents[dep].append(key)
+        waiting[key] = len(set(deps))
+
+    # Kahn's algorithm up front, so a cycle fails before any call is made.
+    pending = dict(waiting)
+    ready = [key for key, count in pending.items() if count == 0]
+    visited = 0
+    while ready:
+        key = ready.pop()
+        visited += 1
+        for dependent in set(dependents[key]):
+            pending[dependent] -= 1
+            if pending[dependent] == 0:
+                ready.append(dependent)
+    if visited != len(nodes):
+        raise ValueError("Dependency graph has a cycle")
+
+    semaphore = asyncio.Semaphore(limit or BULK_CONCURRENCY)
+    results = {}
+    outcomes = {}
+
+    def finish(key, outcome):
+        outcomes[key] = outcome
+        if on_done is not None:
+            on_done(key, outcome)
+
+    def skip(key, failed_key):
+        for dependent in dependents[key]:
+            if dependent not in outcomes:
+                finish(dependent, {"status": "skipped", "error": f"dependency {failed_key} failed"})
+                skip(dependent, failed_key)
+
+    async def run(key):
+        async with semaphore:
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            return await nodes[key][1](results)
+
+    tasks = {}
+
+    def start(key):
+        task = asyncio.ensure_future(run(key))
+        tasks[task] = key
+
+    for key, count in waiting.items():
+        if count == 0:
+            start(key)
+    try:
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key = tasks.pop(task)
+                if task.exception() is not None:
+                    finish(key, {"status": "failed", "error": str(task.exception())})
+                    skip(key, key)
+                    continue
+                results[key] = task.result()
+                finish(key, {"status": "done", "result": results[key]})
+                for dependent in set(dependents[key]):
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0 and dependent not in outcomes:
+                        start(dependent)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return outcomes
+
+
+class RateLimiter:
+    """
+    Token bucket: `rate` calls per second on average, bursts of up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.waited = 0
+        self._lock = None
+        self._loop = None
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        # A limiter shared per org may outlive the loop that first used it.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                delay = (1 - self.tokens) / self.rate
+                self.waited += 1
+                await asyncio.sleep(delay)
+                self.updated = time.monotonic()
+                self.tokens = 1
+            self.tokens -= 1
+
+
+_rate_limiters = {}
+
+
+def get_rate_limiter(key: str) -> RateLimiter:
+    """
+    Return the shared RateLimiter for `key` (e.g. an orgId), creating it with
+    TC_RATE_LIMIT_PER_SEC / TC_RATE_LIMIT_BURST on first use.
+    """
+    limiter = _rate_limiters.get(key)
+    if limiter is None:
+        limiter = _rate_limiters[key] = RateLimiter(RATE_LIMIT_PER_SEC, RATE_LIMIT_BURST)
+    return limiter
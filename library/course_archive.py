@@ -0,0 +1,754 @@
+"""
+Course snapshots as streaming line-delimited archives, and course import.
+
+An archive is gzip-compressed NDJSON: one JSON record per line, each with a
+"type" field, written in this order:
+
+    {"type": "archive", "version": 1, "courseId": ..., "orgId": ..., "exportedAt": ...}
+    {"type": "course", "data": {...}}
+    {"type": "section", "data": {...}}                          # one per chapter
+    {"type": "session", "data": {...}}                          # one per lesson / live workshop
+    {"type": "content", "sessionId": ..., "data": {...}}        # rich-text files of a lesson
+    {"type": "test", "sessionId": ..., "form": {...}, "fields": [...]}
+    {"type": "error", "sessionId": ..., "error": "..."}         # a lesson that could not be read
+    {"type": "end", "counts": {...}}
+
+Sections and sessions are read page by page and every record is written as
+soon as it is known, so memory use does not grow with the size of the
+course. The per-lesson content and test fetches run concurrently
+(TC_BULK_CONCURRENCY at a time); their records may therefore interleave
+across lessons, and each carries its sessionId. The archive is written to
+"<name>.part" and renamed into place only once the "end" record is written.
+
+AsyncCourseImporter builds a course from a spec, or from an archive read
+record by record, by planning it as a dependency graph and running it with
+library.concurrency.run_dag:
+
+    course -> chapter 1 -> chapter 2 -> ...          chapters keep their order
+    chapter -> lesson 1 -> lesson 2 -> ...           lessons keep their order
+    lesson -> its content uploads, its tests
+
+Chapters' lessons, and every upload and test, run in parallel up to
+TC_BULK_CONCURRENCY calls (and the org's rate limit). A failed step skips
+only the steps that depend on it, which, to keep their order, includes the
+later chapters or lessons of the same chain. A lesson with an "error"
+record is still created, with what was exported, and adds a failed step.
+
+AsyncCourseCloner copies a course to other portals of the same user: the
+source is exported once to a temporary archive and imported into every
+target portal at the same time, each under its own org's rate limit.
+
+Upstream reads:
+    GET /<orgId>/courses/<courseId>.json
+    GET /<orgId>/course/<courseId>/sections.json
+    GET /<orgId>/course/<courseId>/sessions.json
+    GET /<orgId>/session/<sessionId>/files.json
+    GET /<orgId>/session/<sessionId>/forms.json?type=3
+    GET /<orgId>/session/<sessionId>/form/<formIdValue>/fields.json?type=3
+
+Configuration (environment variables):
+    TC_EXPORT_DIR  directory archives are written to, one subdirectory per
+                   portal (default: "exports" under the system temp directory)
+"""
+
+import os
+import gzip
+import time
+import asyncio
+import logging
+import tempfile
+
+from library import json_utils
+from library.courses import AsyncTrainerCentralCourses
+from library.chapters import AsyncTrainerCentralChapters
+from library.lessons import AsyncTrainerCentralLessons
+from library.tests import AsyncTrainerCentralTests
+from library.concurrency import BULK_CONCURRENCY, run_dag, get_rate_limiter, check_bulk_size, check_response
+from library.progress import report_progress, current_reporter, progress_reporter
+from library.oauth import get_user_portals_async, extract_all_org_ids
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+ARCHIVE_SUFFIX = ".ndjson.gz"
+EXPORT_DIR = os.getenv("TC_EXPORT_DIR") or os.path.join(tempfile.gettempdir(), "exports")
+
+# Sessions with this deliveryMode are live workshops and have no files or tests.
+LIVE_DELIVERY_MODE = "3"
+
+# Course fields that are copied when a course is imported from an archive.
+COURSE_IMPORT_FIELDS = ("courseName", "subTitle", "description", "courseCategories")
+
+
+def lesson_contents(lesson: dict) -> list:
+    """
+    The rich-text files a spec lesson asks for: its "content_html", if any,
+    followed by its "contents" list.
+    """
+    contents = list(lesson.get("contents") or [])
+    if lesson.get("content_html"):
+        contents.insert(0, {
+            "content_html": lesson["content_html"],
+            "content_filename": lesson.get("content_filename", "Content"),
+        })
+    return contents
+
+
+def archive_path(name: str, orgId: str) -> str:
+    """
+    Resolve an archive name inside the portal's directory of TC_EXPORT_DIR.
+
+    Archives are kept per portal, so one portal's exports can only be read
+    by callers of that portal (see open_archive). Only base names are used,
+    so a caller cannot read or write outside the export directory.
+    """
+    name = os.path.basename(name or "")
+    org_dir = os.path.basename(str(orgId or ""))
+    if not name:
+        raise ValueError("Archive name is required")
+    if not org_dir or org_dir in (".", ".."):
+        raise ValueError("orgId is required")
+    if not name.endswith(ARCHIVE_SUFFIX):
+        name += ARCHIVE_SUFFIX
+    return os.path.join(EXPORT_DIR, org_dir, name)
+
+
+async def open_archive(name: str, orgId: str, access_token: str) -> str:
+    """
+    Resolve an archive of portal `orgId` for a caller, checking that the
+    portal is one of the caller's and that the archive was exported from it.
+
+    Raises:
+        ValueError: not the caller's portal, no such archive, or the archive
+        belongs to another portal.
+    """
+    if str(orgId) not in {str(org_id) for org_id in extract_all_org_ids(await get_user_portals_async(access_token))}:
+        raise ValueError(f"Not one of your portals: {orgId}")
+    path = archive_path(name, orgId)
+    if not os.path.exists(path):
+        raise ValueError(f"No archive {os.path.basename(path)} in portal {orgId}")
+    header = next(iter_archive(path))
+    if str(header.get("orgId")) != str(orgId):
+        raise ValueError(f"{os.path.basename(path)} was not exported from portal {orgId}")
+    return path
+
+
+class ArchiveWriter:
+    """
+    Append records to a gzip NDJSON file, counting them by type.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.part_path = path + ".part"
+        self.counts = {}
+        self._file = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = gzip.open(self.part_path, "wb")
+        return self
+
+    def write(self, record: dict) -> None:
+        self._file.write(json_utils.dumps(record) + b"\n")
+        self.counts[record["type"]] = self.counts.get(record["type"], 0) + 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.part_path, self.path)
+        else:
+            os.remove(self.part_path)
+        return False
+
+
+class AsyncCourseExporter:
+    """
+    Export a course and everything under it to an archive.
+    """
+
+    def __init__(self, courses: AsyncTrainerCentralCourses = None):
+        self.courses = courses or AsyncTrainerCentralCourses()
+        self.base_url = self.courses.base_url
+        self.http = self.courses.http
+
+    async def _get_json(self, url: str, access_token: str, params: dict = None) -> dict:
+        headers = {"Authorization": f"Bearer {access_token}"}
+        response = await self.http.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def _session_records(self, session: dict, orgId: str, access_token: str) -> list:
+        """
+        Read the rich-text files and tests of one lesson.
+        """
+        session_id = session.get("sessionId") or session.get("id")
+        if str(session.get("deliveryMode")) == LIVE_DELIVERY_MODE:
+            return []
+
+        session_url = f"{self.base_url}/{orgId}/session/{session_id}"
+        files, forms = await asyncio.gather(
+            self._get_json(f"{session_url}/files.json", access_token),
+            self._get_json(f"{session_url}/forms.json", access_token, {"type": 3}),
+        )
+
+        records = [
+            {"type": "content", "sessionId": session_id, "data": file}
+            for file in files.get("files") or []
+        ]
+        for form in forms.get("forms") or []:
+            form_id = form.get("formIdValue")
+            fields = await self._get_json(f"{session_url}/form/{form_id}/fields.json", access_token, {"type": 3})
+            records.append({
+                "type": "test",
+                "sessionId": session_id,
+                "form": form,
+                "fields": fields.get("fields") or fields.get("field") or [],
+            })
+        return records
+
+    async def export_course(self, courseId: str, orgId: str, access_token: str, path: str) -> dict:
+        """
+        Write the archive of one course to `path`.
+
+        Returns:
+            dict: {"path": ..., "bytes": 48213, "counts": {"section": 4, "session": 31, ...}}
+
+        Raises:
+            RuntimeError: the course itself cannot be read.
+        """
+        course_data = await self.courses.get_course(courseId, orgId, access_token)
+        if not isinstance(course_data, dict) or "course" not in course_data:
+            raise RuntimeError(f"Cannot export course {courseId}: {course_data}")
+
+        with ArchiveWriter(path) as writer:
+            writer.write({
+                "type": "archive",
+                "version": ARCHIVE_VERSION,
+                "courseId": courseId,
+                "orgId": orgId,
+                "exportedAt": int(time.time() * 1000),
+            })
+            writer.write({"type": "course", "data": course_data["course"]})
+
+            async for section in self.courses.iter_course_children(courseId, orgId, access_token, "sections"):
+                writer.write({"type": "section", "data": section})
+
+            semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+            done = 0
+
+            async def export_session(session: dict):
+                nonlocal done
+                session_id = session.get("sessionId") or session.get("id")
+                try:
+                    records = await self._session_records(session, orgId, access_token)
+                except Exception as e:
+                    logger.warning("Export of session %s failed: %s", session_id, e)
+                    records = [{"type": "error", "sessionId": session_id, "error": str(e)}]
+                finally:
+                    semaphore.release()
+                for record in records:
+                    writer.write(record)
+                done += 1
+                report_progress(done, None, f"Exported {done} lessons")
+
+            # Lessons are listed in course order; at most BULK_CONCURRENCY are
+            # being read at a time, so only their records are held in memory.
+            tasks = set()
+            try:
+                async for session in self.courses.iter_course_children(courseId, orgId, access_token, "sessions"):
+                    writer.write({"type": "session", "data": session})
+                    await semaphore.acquire()
+                    task = asyncio.ensure_future(export_session(session))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                if tasks:
+                    await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            writer.write({"type": "end", "counts": dict(writer.counts)})
+
+        return {"path": path, "bytes": os.path.getsize(path), "counts": writer.counts}
+
+
+def iter_archive(path: str):
+    """
+    Yield the records of an archive one at a time.
+
+    Raises:
+        ValueError: the file is not a course archive of a supported version.
+    """
+    with gzip.open(path, "rb") as archive:
+        for number, line in enumerate(archive):
+            record = json_utils.loads(line)
+            if number == 0 and (record.get("type") != "archive" or record.get("version") != ARCHIVE_VERSION):
+                raise ValueError(f"{os.path.basename(path)} is not a version {ARCHIVE_VERSION} course archive")
+            yield record
+
+
+def _course_fields(data: dict) -> dict:
+    return {field: data[field] for field in COURSE_IMPORT_FIELDS if data.get(field)}
+
+
+def _content_from_record(record: dict) -> dict:
+    return {
+        "content_html": record["data"].get("richTextContent", ""),
+        "content_filename": record["data"].get("fileName") or record["data"].get("filename") or "Content",
+    }
+
+
+def _test_from_record(record: dict) -> dict:
+    return {
+        "name": record["form"].get("name"),
+        "description_html": record["form"].get("description", ""),
+        "questions": {"field": record["fields"]},
+    }
+
+
+def spec_from_archive(path: str) -> dict:
+    """
+    Turn an archive into an import spec (see AsyncCourseImporter.import_course).
+
+    Live workshops are left out: they are scheduled, not content, and need
+    new times in the target course. A lesson whose files or tests could not
+    be exported carries the reason as "exportError".
+    """
+    spec = {"course": {}, "chapters": [], "lessons": []}
+    chapters = {}
+    lessons = {}
+    for record in iter_archive(path):
+        kind = record["type"]
+        if kind == "course":
+            spec["course"] = _course_fields(record["data"])
+        elif kind == "section":
+            section = record["data"]
+            chapter = {"name": section.get("name"), "lessons": []}
+            chapters[str(section.get("sectionId") or section.get("id"))] = chapter
+            spec["chapters"].append(chapter)
+        elif kind == "session":
+            session = record["data"]
+            if str(session.get("deliveryMode")) == LIVE_DELIVERY_MODE:
+                continue
+            lesson = {
+                "name": session.get("name"),
+                "description": session.get("description", ""),
+                "contents": [],
+                "tests": [],
+            }
+            lessons[str(session.get("sessionId") or session.get("id"))] = lesson
+            chapter = chapters.get(str(session.get("sectionId")))
+            (chapter["lessons"] if chapter else spec["lessons"]).append(lesson)
+        elif kind in ("content", "test", "error"):
+            lesson = lessons.get(str(record["sessionId"]))
+            if lesson is None:
+                continue
+            if kind == "content":
+                lesson["contents"].append(_content_from_record(record))
+            elif kind == "test":
+                lesson["tests"].append(_test_from_record(record))
+            else:
+                lesson["exportError"] = record["error"]
+    return spec
+
+
+class ArchivePayloads:
+    """
+    Spool of the content and test payloads of an archive being imported.
+
+    run_dag needs every node before it starts, but holding every lesson's
+    HTML in node closures would load the whole course into memory. Payloads
+    are written to an unnamed temporary file instead and read back when
+    their node runs; only their offsets stay in memory. Payloads are keyed
+    by their record's position in the archive, so several imports of the
+    same archive (a clone into many portals) share one copy.
+    """
+
+    def __init__(self):
+        self._file = None
+        self._refs = {}
+
+    def __enter__(self):
+        self._file = tempfile.TemporaryFile()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        return False
+
+    def store(self, number: int, payload: dict) -> tuple:
+        ref = self._refs.get(number)
+        if ref is None:
+            data = json_utils.dumps(payload)
+            self._file.seek(0, os.SEEK_END)
+            ref = self._refs[number] = (self._file.tell(), len(data))
+            self._file.write(data)
+        return ref
+
+    def load(self, ref: tuple) -> dict:
+        offset, size = ref
+        self._file.seek(offset)
+        return json_utils.loads(self._file.read(size))
+
+
+class AsyncCourseImporter:
+    """
+    Build a course in TrainerCentral from a declarative spec or an archive.
+    """
+
+    def __init__(self):
+        self.courses = AsyncTrainerCentralCourses()
+        self.chapters = AsyncTrainerCentralChapters()
+        self.lessons = AsyncTrainerCentralLessons()
+        self.tests = AsyncTrainerCentralTests()
+
+    # ---- nodes ----
+
+    def _add_course(self, nodes: dict, course_data: dict, orgId: str, access_token: str) -> None:
+        if not course_data.get("courseName"):
+            raise ValueError("spec.course.courseName is required")
+
+        async def create_course(results):
+            response = await self.courses.post_course(course_data, orgId, access_token)
+            course = response.get("course") if isinstance(response, dict) else None
+            course_id = (course.get("courseId") or course.get("id")) if isinstance(course, dict) else None
+            if not course_id:
+                raise RuntimeError(f"Failed to find courseId in response: {response}")
+            return course_id
+        nodes["course"] = ((), create_course)
+
+    def _add_chapter(self, nodes: dict, key: str, name: str, previous: str, orgId: str, access_token: str) -> None:
+        async def create_chapter(results):
+            section_data = {"courseId": results["course"], "name": name}
+            response = await self.chapters.create_chapter(section_data, orgId, access_token)
+            section = response.get("section") if isinstance(response, dict) else None
+            section_id = (section.get("sectionId") or section.get("id")) if isinstance(section, dict) else None
+            if not section_id:
+                raise RuntimeError(f"Failed to find sectionId in response: {response}")
+            return section_id
+        nodes[key] = (("course",) + ((previous,) if previous else ()), create_chapter)
+
+    def _add_lesson(self, nodes: dict, key: str, chapter_key: str, lesson: dict, previous: str,
+                    orgId: str, access_token: str) -> None:
+        async def create_lesson(results):
+            session_data = {
+                "name": lesson.get("name"),
+                "description": lesson.get("description", ""),
+                "courseId": results["course"],
+                "deliveryMode": lesson.get("deliveryMode", 4),
+            }
+            if chapter_key:
+                session_data["sectionId"] = results[chapter_key]
+            _, session_id = await self.lessons.create_session(session_data, orgId, access_token)
+            return session_id
+        deps = (chapter_key or "course",) + ((previous,) if previous else ())
+        nodes[key] = (deps, create_lesson)
+
+    def _add_content(self, nodes: dict, key: str, lesson_key: str, load, orgId: str, access_token: str) -> None:
+        async def upload(results):
+            content = load()
+            return check_response(await self.lessons.upload_content(
+                results[lesson_key], content.get("content_html", ""),
+                content.get("content_filename") or "Content", orgId, access_token
+            ), "upload content")
+        nodes[key] = ((lesson_key,), upload)
+
+    def _add_test(self, nodes: dict, key: str, lesson_key: str, load, orgId: str, access_token: str) -> None:
+        async def create_test(results):
+            test = load()
+            response = await self.tests.create_full_test(
+                results[lesson_key], test.get("name"), test.get("description_html", ""),
+                test.get("questions") or {"field": []}, orgId, access_token
+            )
+            check_response(response["questions"], "add questions")
+            return response
+        nodes[key] = ((lesson_key,), create_test)
+
+    @staticmethod
+    def _add_export_error(nodes: dict, key: str, error: str) -> None:
+        # The lesson is still created, but the import must not read as complete.
+        async def export_failed(results):
+            raise RuntimeError(f"Lesson was not fully exported: {error}")
+        nodes[key] = ((), export_failed)
+
+    # ---- plans ----
+
+    def plan(self, spec: dict, orgId: str, access_token: str) -> dict:
+        """
+        Turn a spec into run_dag nodes keyed "course", "chapter:<i>",
+        "lesson:<i>:<j>", "content:<i>:<j>:<k>", "test:<i>:<j>:<k>" and
+        "export:<i>:<j>" (a lesson with an exportError, which fails);
+        lessons outside any chapter use "-" for <i>.
+        """
+        nodes = {}
+        self._add_course(nodes, dict(spec.get("course") or {}), orgId, access_token)
+
+        def add_lesson(suffix, chapter_key, lesson, previous):
+            lesson_key = f"lesson:{suffix}"
+            self._add_lesson(nodes, lesson_key, chapter_key, lesson, previous, orgId, access_token)
+            for k, content in enumerate(lesson_contents(lesson)):
+                self._add_content(nodes, f"content:{suffix}:{k}", lesson_key, lambda content=content: content,
+                                  orgId, access_token)
+            for k, test in enumerate(lesson.get("tests") or []):
+                self._add_test(nodes, f"test:{suffix}:{k}", lesson_key, lambda test=test: test,
+                               orgId, access_token)
+            if lesson.get("exportError"):
+                self._add_export_error(nodes, f"export:{suffix}", lesson["exportError"])
+            return lesson_key
+
+        previous_chapter = None
+        for i, chapter in enumerate(spec.get("chapters") or []):
+            chapter_key = f"chapter:{i}"
+            self._add_chapter(nodes, chapter_key, chapter.get("name"), previous_chapter, orgId, access_token)
+            previous_chapter = chapter_key
+            previous_lesson = None
+            for j, lesson in enumerate(chapter.get("lessons") or []):
+                previous_lesson = add_lesson(f"{i}:{j}", chapter_key, lesson, previous_lesson)
+
+        previous_lesson = None
+        for j, lesson in enumerate(spec.get("lessons") or []):
+            previous_lesson = add_lesson(f"-:{j}", None, lesson, previous_lesson)
+
+        return nodes
+
+    def plan_archive(self, path: str, orgId: str, access_token: str, payloads: ArchivePayloads,
+                     course_overrides: dict = None) -> dict:
+        """
+        Plan the import of an archive while reading it, record by record.
+
+        Produces the same nodes as plan(spec_from_archive(path)), but content
+        and test payloads go to `payloads` rather than memory.
+        """
+        nodes = {}
+        chapter_keys = {}           # archive sectionId -> (i, chapter key)
+        lesson_keys = {}            # archive sessionId -> suffix "<i>:<j>"
+        lesson_counts = {}          # i -> lessons planned in that chapter
+        last_lesson = {}            # i -> last lesson key of that chapter
+        item_counts = {}            # suffix -> contents / tests planned so far
+        previous_chapter = None
+
+        for number, record in enumerate(iter_archive(path)):
+            kind = record["type"]
+            if kind == "course":
+                course_data = {**_course_fields(record["data"]), **(course_overrides or {})}
+                self._add_course(nodes, course_data, orgId, access_token)
+            elif kind == "section":
+                section = record["data"]
+                i = str(len(chapter_keys))
+                chapter_key = f"chapter:{i}"
+                chapter_keys[str(section.get("sectionId") or section.get("id"))] = (i, chapter_key)
+                self._add_chapter(nodes, chapter_key, section.get("name"), previous_chapter, orgId, access_token)
+                previous_chapter = chapter_key
+            elif kind == "session":
+                session = record["data"]
+                if str(session.get("deliveryMode")) == LIVE_DELIVERY_MODE:
+                    continue
+                i, chapter_key = chapter_keys.get(str(session.get("sectionId")), ("-", None))
+                suffix = f"{i}:{lesson_counts.get(i, 0)}"
+                lesson_counts[i] = lesson_counts.get(i, 0) + 1
+                lesson = {"name": session.get("name"), "description": session.get("description", "")}
+                self._add_lesson(nodes, f"lesson:{suffix}", chapter_key, lesson, last_lesson.get(i),
+                                 orgId, access_token)
+                last_lesson[i] = f"lesson:{suffix}"
+                lesson_keys[str(session.get("sessionId") or session.get("id"))] = suffix
+            elif kind in ("content", "test", "error"):
+                suffix = lesson_keys.get(str(record["sessionId"]))
+                if suffix is None:
+                    continue
+                lesson_key = f"lesson:{suffix}"
+                if kind == "error":
+                    self._add_export_error(nodes, f"export:{suffix}", record["error"])
+                    continue
+                payload = _content_from_record(record) if kind == "content" else _test_from_record(record)
+                ref = payloads.store(number, payload)
+                index = item_counts[(kind, suffix)] = item_counts.get((kind, suffix), -1) + 1
+                add = self._add_content if kind == "content" else self._add_test
+                add(nodes, f"{kind}:{suffix}:{index}", lesson_key, lambda ref=ref: payloads.load(ref),
+                    orgId, access_token)
+
+        if "course" not in nodes:
+            raise ValueError(f"{os.path.basename(path)} has no course record")
+        return nodes
+
+    # ---- runs ----
+
+    async def import_course(self, spec: dict, orgId: str, access_token: str, dry_run: bool = False) -> dict:
+        """
+        Create the course described by `spec`.
+
+        Spec:
+            {
+                "course": {"courseName": "...", "subTitle": "...", ...},
+                "chapters": [
+                    {"name": "Chapter 1", "lessons": [
+                        {"name": "Lesson 1", "description": "...",
+                         "content_html": "<p>...</p>",            # or "contents": [{content_html, content_filename}]
+                         "tests": [{"name": "Quiz", "description_html": "...",
+                                    "questions": {"field": [...]}}]}
+                    ]}
+                ],
+                "lessons": [...]                                   # lessons outside any chapter
+            }
+
+        Returns:
+            dict: {
+                "courseId": "...",
+                "chapters": {"0": sectionId, ...}, "lessons": {"0:1": sessionId, ...},
+                "failures": [{"step": "test:0:1:0", "status": "failed", "error": "..."}],
+                "done": 57, "failed": 1, "skipped": 0, "total": 58
+            }
+            With dry_run, only the planned steps and their dependencies.
+        """
+        return await self.run(self.plan(spec, orgId, access_token), orgId, dry_run)
+
+    async def import_archive(self, path: str, orgId: str, access_token: str, course_overrides: dict = None,
+                             dry_run: bool = False, payloads: ArchivePayloads = None) -> dict:
+        """
+        Create the course stored in the archive at `path`, streaming it.
+
+        Pass `payloads` to share one spool between imports of the same
+        archive. Returns the same result as import_course().
+        """
+        if payloads is None:
+            with ArchivePayloads() as payloads:
+                return await self.import_archive(path, orgId, access_token, course_overrides, dry_run, payloads)
+        nodes = self.plan_archive(path, orgId, access_token, payloads, course_overrides)
+        return await self.run(nodes, orgId, dry_run)
+
+    async def run(self, nodes: dict, orgId: str, dry_run: bool = False) -> dict:
+        """
+        Run planned import nodes and summarize them.
+        """
+        if dry_run:
+            return {
+                "steps": {key: list(deps) for key, (deps, _) in nodes.items()},
+                "total": len(nodes)
+            }
+
+        total = len(nodes)
+        finished = 0
+
+        def on_done(key, outcome):
+            nonlocal finished
+            finished += 1
+            report_progress(finished, total, f"{key}: {outcome['status']}")
+
+        outcomes = await run_dag(nodes, rate_limiter=get_rate_limiter(orgId), on_done=on_done)
+
+        def created(prefix):
+            return {
+                key.split(":", 1)[1]: outcome["result"]
+                for key, outcome in outcomes.items()
+                if key.startswith(prefix) and outcome["status"] == "done"
+            }
+
+        course = outcomes["course"]
+        if course["status"] == "done":
+            self.lessons.cache.invalidate_course_content(orgId, course["result"])
+
+        counts = {status: 0 for status in ("done", "failed", "skipped")}
+        for outcome in outcomes.values():
+            counts[outcome["status"]] += 1
+        return {
+            "courseId": course.get("result"),
+            "chapters": created("chapter:"),
+            "lessons": created("lesson:"),
+            "failures": [
+                {"step": key, "status": outcome["status"], "error": outcome["error"]}
+                for key, outcome in outcomes.items() if outcome["status"] != "done"
+            ],
+            **counts,
+            "total": total
+        }
+
+
+class AsyncCourseCloner:
+    """
+    Copy a course from one portal into one or more others.
+    """
+
+    def __init__(self, exporter: AsyncCourseExporter = None, importer: AsyncCourseImporter = None):
+        self.exporter = exporter or AsyncCourseExporter()
+        self.importer = importer or AsyncCourseImporter()
+
+    async def clone_course(self, courseId: str, orgId: str, target_org_ids: list, access_token: str,
+                           course_overrides: dict = None) -> dict:
+        """
+        Recreate course `courseId` of portal `orgId` in every target portal.
+
+        Targets are checked against the caller's portals before anything is
+        read. The source is streamed into a temporary archive (see
+        AsyncCourseExporter), which every target then imports by streaming
+        it (see AsyncCourseImporter.import_archive); the archive is removed
+        afterwards. A failure in one target portal does not stop the others,
+        and a target counts as cloned only if every step, including every
+        lesson's export, succeeded.
+
+        Returns:
+            dict: {
+                "source": {"orgId", "courseId", "counts": {...}},
+                "targets": {"<orgId>": {"courseId", "done", "failed", "skipped", "total", "failures"}
+                            | {"error": "..."}},
+                "cloned": 9, "failed": 1, "total": 10
+            }
+        """
+        targets = list(dict.fromkeys(str(org_id) for org_id in target_org_ids or []))
+        check_bulk_size(targets, "target portals")
+        known = {str(org_id) for org_id in extract_all_org_ids(await get_user_portals_async(access_token))}
+        unknown = [org_id for org_id in targets if org_id not in known]
+        if unknown:
+            raise ValueError(f"Not one of your portals: {', '.join(unknown)}")
+
+        outer = current_reporter()
+        exported = 0
+
+        def report_export(progress, total, message):
+            nonlocal exported
+            exported = progress
+            if outer is not None:
+                outer(progress, None, f"{orgId}: {message}")
+
+        # Each target reports its own step count; the caller sees the sum.
+        done = {}
+        totals = {}
+
+        def report_import(target):
+            def report(progress, total, message):
+                done[target] = progress
+                totals[target] = total or 0
+                if outer is not None:
+                    outer(exported + sum(done.values()), exported + sum(totals.values()), f"{target}: {message}")
+            return report
+
+        async def clone_into(target, payloads):
+            with progress_reporter(report_import(target)):
+                return await self.importer.import_archive(path, target, access_token, course_overrides,
+                                                          payloads=payloads)
+
+        # Every target plans from the same archive and shares its payload spool.
+        path = archive_path(f"clone-{courseId}-{int(time.time() * 1000)}", orgId)
+        try:
+            with progress_reporter(report_export):
+                export = await self.exporter.export_course(courseId, orgId, access_token, path)
+            with ArchivePayloads() as payloads:
+                outcomes = await asyncio.gather(*(clone_into(target, payloads) for target in targets),
+                                                return_exceptions=True)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+        results = {}
+        for target, outcome in zip(targets, outcomes):
+            if isinstance(outcome, Exception):
+                results[target] = {"error": str(outcome)}
+            else:
+                results[target] = {key: value for key, value in outcome.items() if key not in ("chapters", "lessons")}
+        cloned = sum(1 for result in results.values() if result.get("courseId") and not result.get("failed"))
+        return {
+            "source": {"orgId": orgId, "courseId": courseId, "counts": export["counts"]},
+            "targets": results,
+            "cloned": cloned,
+            "failed": len(targets) - cloned,
+            "total": len(targets)
+        }
@@ -1,6 +1,11 @@
 import os
-import requests
+import httpx
+from library.http_client import get_http_client, get_async_http_client
+from library.cache import get_response_cache
+from library.pagination import AsyncPaginator, DEFAULT_PAGE_SIZE
 from library.common_utils import DateConverter
+from library.concurrency import map_bounded, get_rate_limiter, check_response
+from library.recipients import iter_recipients, summarize
 
 
 class TrainerCentralLiveWorkshops:
@@ -25,6 +30,8 @@ class TrainerCentralLiveWorkshops:
     def __init__(self):
         tc_api = os.getenv("TC_API_BASE_URL")
         self.base_url = f"{tc_api}/api/v4"
+        self.http = get_http_client()
+        self.cache = get_response_cache()
         self.date_converter = DateConverter()
 
 
@@ -84,7 +91,10 @@ class TrainerCentralLiveWorkshops:
             }
         }
 
-        return requests.post(url, json=body, headers=headers).json()
+        response = self.http.post(url, json=body, headers=headers).json()
+        self.cache.invalidate(orgId, "workshops")
+        self.cache.invalidate_course_content(orgId, courseId)
+        return response
 
 
     def list_upcoming_live_sessions(self, orgId: str, access_token: str, filter_type=5, limit=50, si=0):
@@ -93,7 +103,7 @@ class TrainerCentralLiveWorkshops:
         headers = {"Authorization": f"Bearer {access_token}"}
         params = {"filterType": filter_type, "limit": limit, "si": si}
 
-        return requests.get(url, params=params, headers=headers).json()
+        return self.http.get(url, params=params, headers=headers).json()
 
 
     def delete_live_session(self, session_id: str, orgId: str, access_token: str):
@@ -101,7 +111,10 @@ class TrainerCentralLiveWorkshops:
         url = f"{self.base_url}/{orgId}/sessions/{session_id}.json"
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        return requests.delete(url, headers=headers).json()
+        response = self.http.delete(url, headers=headers).json()
+        self.cache.invalidate(orgId, "workshops")
+        self.cache.invalidate_course_content(orgId)
+        return response
 
 
     def invite_learner_to_course_or_course_live_session(
@@ -160,4 +173,192 @@ class TrainerCentralLiveWorkshops:
 
         body = {"courseAttendee": attendee}
 
-        return requests.post(url, json=body, headers=headers).json()
\ No newline at end of file
+        return self.http.post(url, json=body, headers=headers).json()
+
+
+class AsyncTrainerCentralLiveWorkshops:
+    """
+    Async version of TrainerCentralLiveWorkshops (LIVE WORKSHOPS inside a
+    course), for callers running on an event loop.
+
+    Same date format rule applies: "DD-MM-YYYY HH:MMAM/PM".
+    """
+
+    def __init__(self):
+        tc_api = os.getenv("TC_API_BASE_URL")
+        self.base_url = f"{tc_api}/api/v4"
+        self.http = get_async_http_client()
+        self.cache = get_response_cache()
+        self.date_converter = DateConverter()
+
+    async def create_course_live_workshop(
+        self,
+        orgId: str,
+        access_token: str,
+        courseId: str,
+        name: str,
+        description_html: str,
+        start_time_str: str,
+        end_time_str: str,
+    ):
+        """
+        Create a LIVE WORKSHOP inside a course.
+        """
+        start_ms = int(self.date_converter.convert_date_to_time(start_time_str))
+        end_ms = int(self.date_converter.convert_date_to_time(end_time_str))
+
+        url = f"{self.base_url}/{orgId}/sessions.json"
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+
+        body = {
+            "session": {
+                "name": name,
+                "description": description_html,
+                "courseId": courseId,
+                "deliveryMode": 3,
+                "scheduledTime": start_ms,
+                "scheduledEndTime": end_ms,
+                "durationTime": end_ms - start_ms,
+            }
+        }
+
+        response = (await self.http.post(url, json=body, headers=headers)).json()
+        self.cache.invalidate(orgId, "workshops")
+        self.cache.invalidate_course_content(orgId, courseId)
+        return response
+
+    async def list_upcoming_live_sessions(self, orgId: str, access_token: str, filter_type=5, limit=50, si=0):
+        """List upcoming live sessions"""
+        url = f"{self.base_url}/{orgId}/upcomingSessions.json"
+        headers = {"Authorization": f"Bearer {access_token}"}
+        params = {"filterType": filter_type, "limit": limit, "si": si}
+
+        return (await self.http.get(url, params=params, headers=headers)).json()
+
+    def iter_upcoming_live_sessions(self, orgId: str, access_token: str, filter_type=5,
+                                    page_size: int = DEFAULT_PAGE_SIZE, si: int = 0,
+                                    max_items: int = None) -> AsyncPaginator:
+        """Lazily iterate upcoming live sessions across all pages"""
+        async def fetch_page(page_si, page_limit):
+            return await self.list_upcoming_live_sessions(orgId, access_token, filter_type, page_limit, page_si)
+
+        return AsyncPaginator(fetch_page, "sessions", page_size, si, max_items)
+
+    async def delete_live_session(self, session_id: str, orgId: str, access_token: str):
+        """Delete a live session"""
+        url = f"{self.base_url}/{orgId}/sessions/{session_id}.json"
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        response = (await self.http.delete(url, headers=headers)).json()
+        self.cache.invalidate(orgId, "workshops")
+        self.cache.invalidate_course_content(orgId)
+        return response
+
+    async def invite_learner_to_course_or_course_live_session(
+        self,
+        email: str,
+        orgId: str,
+        access_token: str,
+        first_name: str,
+        last_name: str,
+        courseId: str = None,
+        session_id: str = None,
+        is_access_granted: bool = True,
+        expiry_time: int = None,
+        expiry_duration: str = None
+    ) -> dict:
+        """
+        Invite a learner to a COURSE or COURSE LIVE WORKSHOP.
+        """
+        response = await self._post_attendee(
+            email, orgId, access_token, first_name, last_name,
+            courseId, session_id, is_access_granted, expiry_time, expiry_duration
+        )
+        return response.json()
+
+    async def _post_attendee(self, email, orgId, access_token, first_name, last_name, courseId, session_id,
+                             is_access_granted, expiry_time, expiry_duration) -> httpx.Response:
+        if not courseId and not session_id:
+            raise ValueError("You must provide either courseId or session_id.")
+
+        url = f"{self.base_url}/{orgId}/addCourseAttendee.json"
+
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+
+        attendee = {
+            "email": email,
+            "firstName": first_name,
+            "lastName": last_name,
+            "isAccessGranted": is_access_granted
+        }
+
+        if courseId:
+            attendee["courseId"] = courseId
+        if session_id:
+            attendee["sessionId"] = session_id
+        if expiry_time:
+            attendee["expiryTime"] = expiry_time
+        if expiry_duration:
+            attendee["expiryDuration"] = expiry_duration
+
+        body = {"courseAttendee": attendee}
+
+        return await self.http.post(url, json=body, headers=headers)
+
+    async def invite_learners_bulk(
+        self,
+        orgId: str,
+        access_token: str,
+        recipients: list = None,
+        csv_text: str = None,
+        courseId: str = None,
+        session_id: str = None,
+        is_access_granted: bool = True,
+        expiry_time: int = None,
+        expiry_duration: str = None
+    ) -> dict:
+        """
+        Invite many learners to a COURSE or COURSE LIVE WORKSHOP.
+
+        addCourseAttendee.json takes one attendee per request, so recipients
+        (streamed from `recipients` and/or `csv_text`, see library.recipients)
+        are invited concurrently, TC_BULK_CONCURRENCY at a time and under the
+        org's rate limit.
+
+        Returns:
+            dict: {
+                "results": [{"email": ..., "status": "invited" | "failed" | "skipped", "error": ...}],
+                "invited": 1998, "failed": 1, "skipped": 1, "total": 2000
+            }
+        """
+        if not courseId and not session_id:
+            raise ValueError("You must provide either courseId or session_id.")
+
+        async def invite(recipient):
+            if "error" in recipient:
+                return {"email": recipient["email"], "status": "skipped", "error": recipient["error"]}
+            try:
+                response = await self._post_attendee(
+                    recipient["email"], orgId, access_token,
+                    recipient["first_name"], recipient["last_name"],
+                    courseId, session_id, is_access_granted, expiry_time, expiry_duration
+                )
+                response.raise_for_status()
+                check_response(response.json(), "addCourseAttendee")
+            except Exception as e:
+                return {"email": recipient["email"], "status": "failed", "error": str(e)}
+            return {"email": recipient["email"], "status": "invited"}
+
+        results = await map_bounded(
+            invite, iter_recipients(recipients, csv_text), rate_limiter=get_rate_limiter(orgId)
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return summarize(results)
@@ -0,0 +1,216 @@
+"""
+Minimal-move reordering of a course's chapters and lessons.
+
+Chapters are moved with update_chapter {"sectionIndex"} and lessons with
+update_lesson {"sessionIndex", "sectionId"}; both indexes are 0-based and
+an item moved to index i pushes the items from i on down by one.
+
+Rather than setting every item's index, plan_moves() keeps the longest run
+of items that are already in the right relative order (a longest increasing
+subsequence of their target positions) and moves only the rest. Each moved
+item is placed right after its target predecessor, which is either kept or
+already moved, so the moves are applied one after another in plan order
+and every index is computed against the list as it will be at that point.
+Reversing ten lessons therefore costs nine calls, and moving one lesson one.
+"""
+
+from bisect import bisect_left
+
+from library.courses import AsyncTrainerCentralCourses
+from library.chapters import AsyncTrainerCentralChapters
+from library.lessons import AsyncTrainerCentralLessons
+from library.concurrency import run_dag, get_rate_limiter, check_response
+from library.progress import report_progress
+
+
+def longest_increasing_subsequence(values: list) -> list:
+    """
+    Return the positions in `values` of one longest strictly increasing
+    subsequence, in O(n log n).
+    """
+    tails = []          # tails[k]: value ending the best subsequence of length k + 1
+    tail_positions = []
+    previous = [None] * len(values)
+    for position, value in enumerate(values):
+        k = bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[k] = value
+            tail_positions[k] = position
+        previous[position] = tail_positions[k - 1] if k else None
+
+    result = []
+    position = tail_positions[-1] if tail_positions else None
+    while position is not None:
+        result.append(position)
+        position = previous[position]
+    return result[::-1]
+
+
+def plan_moves(current: dict, target: dict) -> list:
+    """
+    Plan the moves that turn `current` into `target`.
+
+    Both map a container (a sectionId, or one key for a flat list) to its
+    ordered item ids; items may change container. Containers are handled
+    in the order of `target`.
+
+    Returns:
+        list: [(item, container, index, changed_container)] in the order
+        the moves must be applied.
+
+    Raises:
+        ValueError: an item is unknown, listed twice, or a container is unknown.
+    """
+    lists = {container: list(items) for container, items in current.items()}
+    location = {item: container for container, items in lists.items() for item in items}
+
+    seen = set()
+    for container, items in target.items():
+        if container not in lists:
+            raise ValueError(f"Unknown container: {container}")
+        for item in items:
+            if item not in location:
+                raise ValueError(f"Unknown item: {item}")
+            if item in seen:
+                raise ValueError(f"Item listed twice: {item}")
+            seen.add(item)
+
+    moves = []
+    for container, items in target.items():
+        position = {item: index for index, item in enumerate(items)}
+        in_place = [item for item in lists[container] if item in position]
+        keep = {in_place[i] for i in longest_increasing_subsequence([position[item] for item in in_place])}
+
+        for index, item in enumerate(items):
+            if item in keep:
+                continue
+            source = location[item]
+            lists[source].remove(item)
+            at = lists[container].index(items[index - 1]) + 1 if index else 0
+            lists[container].insert(at, item)
+            location[item] = container
+            moves.append((item, container, at, source != container))
+    return moves
+
+
+class AsyncCourseReorder:
+    """
+    Reorder a course's chapters and lessons with as few updates as possible.
+    """
+
+    def __init__(self):
+        self.courses = AsyncTrainerCentralCourses()
+        self.chapters = AsyncTrainerCentralChapters()
+        self.lessons = AsyncTrainerCentralLessons()
+
+    async def current_order(self, courseId: str, orgId: str, access_token: str) -> tuple:
+        """
+        Read the chapter order and each chapter's lesson order.
+
+        Returns:
+            tuple: ([sectionId, ...], {sectionId: [sessionId, ...]})
+        """
+        sections = await self.courses.iter_course_children(courseId, orgId, access_token, "sections").collect()
+        section_ids = [str(s.get("sectionId") or s.get("id")) for s in sections]
+        lessons = {section_id: [] for section_id in section_ids}
+        async for session in self.courses.iter_course_children(courseId, orgId, access_token, "sessions"):
+            section_id = str(session.get("sectionId") or "")
+            if section_id in lessons:
+                lessons[section_id].append(str(session.get("sessionId") or session.get("id")))
+        return section_ids, lessons
+
+    async def reorder(self, courseId: str, order: list, orgId: str, access_token: str,
+                      dry_run: bool = False) -> dict:
+        """
+        Apply a target order.
+
+        Args:
+            order (list): chapters in their new order, each
+                {"sectionId": "...", "sessionIds": ["...", ...]} listing the
+                chapter's lessons in their new order (lessons may come from
+                other chapters). Chapters left out keep their relative order
+                after the listed ones; lessons left out stay in their chapter,
+                after the listed ones.
+
+        Returns:
+            dict: {
+                "moves": [{"type": "chapter", "sectionId", "sectionIndex", "status"},
+                          {"type": "lesson", "sessionId", "sectionId", "sessionIndex", "status"}],
+                "chapters": 12, "lessons": 140,          # items in the course
+                "done": 5, "failed": 0, "skipped": 0, "total": 5
+            }
+        """
+        section_ids, lessons = await self.current_order(courseId, orgId, access_token)
+
+        target_sections = [str(entry["sectionId"]) for entry in order]
+        target_sections += [sid for sid in section_ids if sid not in target_sections]
+        listed = {str(lesson) for entry in order for lesson in entry.get("sessionIds") or []}
+        target_lessons = {}
+        for entry in order:
+            section_id = str(entry["sectionId"])
+            target_lessons[section_id] = [str(lesson) for lesson in entry.get("sessionIds") or []]
+        for section_id in target_sections:
+            target_lessons.setdefault(section_id, [])
+            target_lessons[section_id] += [lesson for lesson in lessons.get(section_id, []) if lesson not in listed]
+
+        chapter_moves = plan_moves({"": section_ids}, {"": target_sections})
+        lesson_moves = plan_moves(lessons, target_lessons)
+
+        moves = [
+            {"type": "chapter", "sectionId": section_id, "sectionIndex": index}
+            for section_id, _, index, _ in chapter_moves
+        ] + [
+            {"type": "lesson", "sessionId": session_id, "sectionId": section_id, "sessionIndex": index,
+             "changedSection": changed}
+            for session_id, section_id, index, changed in lesson_moves
+        ]
+        summary = {"chapters": len(section_ids), "lessons": sum(len(v) for v in lessons.values())}
+        if dry_run or not moves:
+            return {"moves": moves, **summary, "total": len(moves)}
+
+        # Each index assumes the moves before it in the same list were applied,
+        # so chapter moves form one chain and lesson moves another; the two
+        # chains run side by side.
+        nodes = {}
+        previous = {"chapter": None, "lesson": None}
+        for number, move in enumerate(moves):
+            key = f"{move['type']}:{number}"
+            if move["type"] == "chapter":
+                async def apply(results, move=move):
+                    return check_response(await self.chapters.update_chapter(
+                        courseId, move["sectionId"], {"sectionIndex": move["sectionIndex"]}, orgId, access_token
+                    ), "update_chapter")
+            else:
+                async def apply(results, move=move):
+                    updates = {"sessionIndex": move["sessionIndex"]}
+                    if move["changedSection"]:
+                        updates["sectionId"] = move["sectionId"]
+                    return check_response(await self.lessons.update_lesson(move["sessionId"], updates, orgId, access_token),
+                                          "update_lesson")
+            deps = (previous[move["type"]],) if previous[move["type"]] else ()
+            nodes[key] = (deps, apply)
+            previous[move["type"]] = key
+            move["step"] = key
+
+        total = len(nodes)
+        finished = 0
+
+        def on_done(key, outcome):
+            nonlocal finished
+            finished += 1
+            report_progress(finished, total, f"{key}: {outcome['status']}")
+
+        outcomes = await run_dag(nodes, limit=2, rate_limiter=get_rate_limiter(orgId), on_done=on_done)
+        self.lessons.cache.invalidate_course_content(orgId, courseId)
+
+        counts = {status: 0 for status in ("done", "failed", "skipped")}
+        for move in moves:
+            outcome = outcomes[move.pop("step")]
+            move["status"] = outcome["status"]
+            if "error" in outcome:
+                move["error"] = outcome["error"]
+            counts[outcome["status"]] += 1
+        return {"moves": moves, **summary, **counts, "total": total}
@@ -0,0 +1,374 @@
+"""
+Diff-based course sync.
+
+AsyncCourseSync brings an existing course in line with a desired spec (the
+same spec AsyncCourseImporter takes) by issuing only the calls that change
+something:
+
+    course fields that differ          -> update_course
+    chapter missing / renamed          -> create_chapter / update_chapter
+    lesson missing                     -> create lesson (+ content, tests)
+    lesson description or chapter moved -> update_lesson
+    lesson content hash differs        -> one PUT of the lesson's text file
+    chapter / lesson not in the spec   -> delete (only with prune=True)
+
+Chapters are matched by "sectionId" when the spec gives one and by name
+otherwise; lessons by "sessionId", else by name within their chapter.
+A lesson's content ("content_html" and/or "contents", as spec_from_archive
+produces) is compared by hash of the HTML, so an unchanged lesson costs no
+write at all; a changed file overwrites a current file that matches nothing
+in the spec, or is uploaded when none is left. Tests of existing lessons
+are left alone.
+
+The current tree is read fresh (not from the response cache). The writes
+run concurrently through library.concurrency.run_dag; creations inside a
+new chapter wait for the chapter, new lessons of a chapter are created one
+after another in spec order, and a pruned chapter is deleted only after
+its lessons have been moved out.
+"""
+
+import asyncio
+import hashlib
+import logging
+
+from library.courses import AsyncTrainerCentralCourses
+from library.chapters import AsyncTrainerCentralChapters
+from library.lessons import AsyncTrainerCentralLessons
+from library.tests import AsyncTrainerCentralTests
+from library.course_archive import COURSE_IMPORT_FIELDS, LIVE_DELIVERY_MODE, lesson_contents
+from library.concurrency import gather_bounded, run_dag, get_rate_limiter, check_response
+from library.progress import report_progress
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(html: str) -> str:
+    """
+    Stable hash of lesson HTML; surrounding whitespace is ignored.
+    """
+    return hashlib.sha256((html or "").strip().encode()).hexdigest()
+
+
+def _first_id(response, key: str, *fields) -> str:
+    obj = response.get(key) if isinstance(response, dict) else None
+    for field in fields:
+        if isinstance(obj, dict) and obj.get(field):
+            return obj[field]
+    raise RuntimeError(f"Failed to find {fields[0]} in response: {response}")
+
+
+class AsyncCourseSync:
+    """
+    Diff a course against a spec and apply the difference.
+    """
+
+    def __init__(self):
+        self.courses = AsyncTrainerCentralCourses()
+        self.chapters = AsyncTrainerCentralChapters()
+        self.lessons = AsyncTrainerCentralLessons()
+        self.tests = AsyncTrainerCentralTests()
+        self.base_url = self.courses.base_url
+        self.http = self.courses.http
+
+    async def _lesson_files(self, session_id: str, orgId: str, access_token: str) -> list:
+        url = f"{self.base_url}/{orgId}/session/{session_id}/files.json"
+        response = await self.http.get(url, headers={"Authorization": f"Bearer {access_token}"})
+        response.raise_for_status()
+        return response.json().get("files") or []
+
+    async def _put_lesson_file(self, session_id: str, file: dict, content_html: str,
+                               orgId: str, access_token: str) -> dict:
+        file_id = file.get("fileId") or file.get("id")
+        url = f"{self.base_url}/{orgId}/session/{session_id}/files/{file_id}.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        body = {"file": {"richTextContent": content_html}}
+        return (await self.http.put(url, json=body, headers=headers)).json()
+
+    async def fetch_tree(self, courseId: str, orgId: str, access_token: str) -> dict:
+        """
+        Read the course, its chapters and its lessons (live workshops excluded).
+        """
+        course_data, sections, sessions = await asyncio.gather(
+            self.courses.get_course(courseId, orgId, access_token),
+            self.courses.iter_course_children(courseId, orgId, access_token, "sections").collect(),
+            self.courses.iter_course_children(courseId, orgId, access_token, "sessions").collect(),
+        )
+        if not isinstance(course_data, dict) or "course" not in course_data:
+            raise RuntimeError(f"Cannot read course {courseId}: {course_data}")
+        return {
+            "course": course_data["course"],
+            "sections": sections,
+            "sessions": [s for s in sessions if str(s.get("deliveryMode")) != LIVE_DELIVERY_MODE],
+        }
+
+    async def plan(self, courseId: str, spec: dict, orgId: str, access_token: str,
+                   prune: bool = False) -> tuple:
+        """
+        Diff the course against `spec`.
+
+        Returns:
+            tuple: (steps, nodes) where `steps` describes each call
+            ({"step", "op", "name", ...}) and `nodes` are the matching
+            run_dag nodes.
+        """
+        # The diff must see the course as it is now, not a cached copy.
+        self.courses.cache.invalidate_course(orgId, courseId)
+        tree = await self.fetch_tree(courseId, orgId, access_token)
+
+        steps = []
+        nodes = {}
+
+        def add(key, deps, func, **description):
+            steps.append({"step": key, **description})
+            nodes[key] = (tuple(deps), func)
+
+        # Course fields.
+        desired_course = spec.get("course") or {}
+        course_updates = {
+            field: desired_course[field] for field in COURSE_IMPORT_FIELDS
+            if field in desired_course and desired_course[field] != tree["course"].get(field)
+        }
+        if course_updates:
+            async def update_course(results):
+                return check_response(await self.courses.update_course(courseId, course_updates, orgId, access_token),
+                              "update_course")
+            add("course", (), update_course, op="update_course", fields=sorted(course_updates))
+
+        # Chapters: match by sectionId, else by name (in order, for repeated names).
+        current_sections = {str(s.get("sectionId") or s.get("id")): s for s in tree["sections"]}
+        by_name = {}
+        for section_id, section in current_sections.items():
+            by_name.setdefault(section.get("name"), []).append(section_id)
+        claimed = set()
+
+        chapter_refs = []       # per spec chapter: (sectionId or None, node key creating it or None)
+        last_chapter = None     # last create_chapter key, so new chapters keep their order
+        for i, chapter in enumerate(spec.get("chapters") or []):
+            section_id = str(chapter["sectionId"]) if chapter.get("sectionId") else None
+            if section_id is None:
+                candidates = [sid for sid in by_name.get(chapter.get("name"), []) if sid not in claimed]
+                section_id = candidates[0] if candidates else None
+            if section_id is not None and section_id not in current_sections:
+                raise ValueError(f"Chapter {i}: sectionId {section_id} is not in course {courseId}")
+
+            if section_id is None:
+                key = f"create_chapter:{i}"
+
+                async def create_chapter(results, chapter=chapter):
+                    response = await self.chapters.create_chapter(
+                        {"courseId": courseId, "name": chapter.get("name")}, orgId, access_token
+                    )
+                    return _first_id(response, "section", "sectionId", "id")
+                add(key, (last_chapter,) if last_chapter else (), create_chapter, op="create_chapter",
+                    name=chapter.get("name"))
+                chapter_refs.append((None, key))
+                last_chapter = key
+                continue
+
+            claimed.add(section_id)
+            chapter_refs.append((section_id, None))
+            if chapter.get("name") and chapter["name"] != current_sections[section_id].get("name"):
+                async def rename_chapter(results, section_id=section_id, name=chapter["name"]):
+                    return check_response(await self.chapters.update_chapter(
+                        courseId, section_id, {"name": name}, orgId, access_token
+                    ), "update_chapter")
+                add(f"update_chapter:{i}", (), rename_chapter, op="update_chapter",
+                    sectionId=section_id, name=chapter["name"])
+
+        # Lessons: match by sessionId, else by name within the chapter.
+        current_sessions = {str(s.get("sessionId") or s.get("id")): s for s in tree["sessions"]}
+        lessons_by_chapter = {}
+        for session_id, session in current_sessions.items():
+            lessons_by_chapter.setdefault((str(session.get("sectionId") or ""), session.get("name")), []).append(session_id)
+        claimed_lessons = set()
+
+        desired = [(i, j, lesson) for i, chapter in enumerate(spec.get("chapters") or [])
+                   for j, lesson in enumerate(chapter.get("lessons") or [])]
+        desired += [("-", j, lesson) for j, lesson in enumerate(spec.get("lessons") or [])]
+
+        matched = []            # (suffix, session_id, lesson, section_ref)
+        moves_out_of = {}       # current sectionId -> lesson step keys that move lessons out of it
+        last_created = {}       # chapter index -> last create_lesson key, so new lessons keep their order
+        for i, j, lesson in desired:
+            suffix = f"{i}:{j}"
+            section_ref = chapter_refs[i] if i != "-" else ("", None)
+            session_id = str(lesson["sessionId"]) if lesson.get("sessionId") else None
+            if session_id is None and section_ref[0] is not None:
+                candidates = [sid for sid in lessons_by_chapter.get((section_ref[0], lesson.get("name")), [])
+                              if sid not in claimed_lessons]
+                session_id = candidates[0] if candidates else None
+            if session_id is not None and session_id not in current_sessions:
+                raise ValueError(f"Lesson {suffix}: sessionId {session_id} is not in course {courseId}")
+
+            if session_id is None:
+                last_created[i] = self._plan_new_lesson(add, suffix, lesson, section_ref, last_created.get(i),
+                                                        courseId, orgId, access_token)
+                continue
+
+            claimed_lessons.add(session_id)
+            matched.append((suffix, session_id, lesson, section_ref))
+            current = current_sessions[session_id]
+            updates = {}
+            if lesson.get("name") and lesson["name"] != current.get("name"):
+                updates["name"] = lesson["name"]
+            if "description" in lesson and (lesson["description"] or "") != (current.get("description") or ""):
+                updates["description"] = lesson["description"]
+            current_section = str(current.get("sectionId") or "")
+            moved = section_ref[1] is not None or (section_ref[0] or "") != current_section
+            if not updates and not moved:
+                continue
+
+            key = f"update_lesson:{suffix}"
+
+            async def update_lesson(results, session_id=session_id, updates=updates, section_ref=section_ref,
+                                    moved=moved):
+                payload = dict(updates)
+                if moved:
+                    payload["sectionId"] = results[section_ref[1]] if section_ref[1] else section_ref[0]
+                return check_response(await self.lessons.update_lesson(session_id, payload, orgId, access_token),
+                              "update_lesson")
+            deps = (section_ref[1],) if section_ref[1] else ()
+            add(key, deps, update_lesson, op="update_lesson", sessionId=session_id,
+                fields=sorted(updates) + (["sectionId"] if moved else []))
+            if moved:
+                moves_out_of.setdefault(current_section, []).append(key)
+
+        # Content: only lessons whose spec has content need their current files read.
+        with_content = [(suffix, session_id, lesson_contents(lesson))
+                        for suffix, session_id, lesson, _ in matched if lesson_contents(lesson)]
+        files = await gather_bounded(
+            (lambda session_id=session_id: self._lesson_files(session_id, orgId, access_token))
+            for _, session_id, _ in with_content
+        )
+        for (suffix, session_id, contents), current_files in zip(with_content, files):
+            if isinstance(current_files, Exception):
+                raise RuntimeError(f"Cannot read content of lesson {session_id}: {current_files}")
+            # A wanted file that already exists costs nothing; the rest
+            # overwrite, in order, the files nothing matched, or are uploaded.
+            current_hashes = [content_hash(f.get("richTextContent")) for f in current_files]
+            wanted_hashes = {content_hash(content.get("content_html")) for content in contents}
+            spare = [f for f, h in zip(current_files, current_hashes)
+                     if h not in wanted_hashes and (f.get("fileId") or f.get("id"))]
+            for index, content in enumerate(contents):
+                if content_hash(content.get("content_html")) in current_hashes:
+                    continue
+                if spare:
+                    async def put_content(results, session_id=session_id, file=spare.pop(0),
+                                          html=content.get("content_html", "")):
+                        return check_response(await self._put_lesson_file(session_id, file, html, orgId, access_token),
+                                      "update content")
+                    op = "update_content"
+                else:
+                    async def put_content(results, session_id=session_id, content=content):
+                        return check_response(await self.lessons.upload_content(
+                            session_id, content.get("content_html", ""), content.get("content_filename") or "Content",
+                            orgId, access_token
+                        ), "upload content")
+                    op = "upload_content"
+                add(f"content:{suffix}:{index}", (), put_content, op=op, sessionId=session_id)
+
+        # Prune what the spec no longer has.
+        if prune:
+            for session_id, session in current_sessions.items():
+                if session_id in claimed_lessons:
+                    continue
+
+                async def delete_lesson(results, session_id=session_id):
+                    return check_response(await self.lessons.delete_lesson(session_id, orgId, access_token),
+                                  "delete_lesson")
+                key = f"delete_lesson:{session_id}"
+                add(key, (), delete_lesson, op="delete_lesson", sessionId=session_id, name=session.get("name"))
+                moves_out_of.setdefault(str(session.get("sectionId") or ""), []).append(key)
+
+            for section_id, section in current_sections.items():
+                if section_id in claimed:
+                    continue
+
+                async def delete_chapter(results, section_id=section_id):
+                    return check_response(await self.chapters.delete_chapter(courseId, section_id, orgId, access_token),
+                                  "delete_chapter")
+                add(f"delete_chapter:{section_id}", moves_out_of.get(section_id, []), delete_chapter,
+                    op="delete_chapter", sectionId=section_id, name=section.get("name"))
+
+        return steps, nodes
+
+    def _plan_new_lesson(self, add, suffix, lesson, section_ref, previous, courseId, orgId, access_token) -> str:
+        """
+        Plan the creation of one lesson after `previous` (the chapter's last
+        planned creation) and return its step key.
+        """
+        key = f"create_lesson:{suffix}"
+
+        async def create_lesson(results):
+            session_data = {
+                "name": lesson.get("name"),
+                "description": lesson.get("description", ""),
+                "courseId": courseId,
+                "deliveryMode": lesson.get("deliveryMode", 4),
+            }
+            section_id = results[section_ref[1]] if section_ref[1] else section_ref[0]
+            if section_id:
+                session_data["sectionId"] = section_id
+            _, session_id = await self.lessons.create_session(session_data, orgId, access_token)
+            return session_id
+        deps = tuple(dep for dep in (section_ref[1], previous) if dep)
+        add(key, deps, create_lesson, op="create_lesson", name=lesson.get("name"))
+
+        for index, content in enumerate(lesson_contents(lesson)):
+            async def upload(results, content=content):
+                return check_response(await self.lessons.upload_content(
+                    results[key], content.get("content_html", ""), content.get("content_filename") or "Content",
+                    orgId, access_token
+                ), "upload content")
+            add(f"content:{suffix}:{index}", (key,), upload, op="upload_content", name=lesson.get("name"))
+
+        for index, test in enumerate(lesson.get("tests") or []):
+            async def create_test(results, test=test):
+                response = await self.tests.create_full_test(
+                    results[key], test.get("name"), test.get("description_html", ""),
+                    test.get("questions") or {"field": []}, orgId, access_token
+                )
+                check_response(response["questions"], "add questions")
+                return response
+            add(f"test:{suffix}:{index}", (key,), create_test, op="create_test", name=test.get("name"))
+        return key
+
+    async def sync_course(self, courseId: str, spec: dict, orgId: str, access_token: str,
+                          prune: bool = False, dry_run: bool = False) -> dict:
+        """
+        Make the course match `spec` with as few writes as possible.
+
+        Returns:
+            dict: {
+                "steps": [{"step", "op", ..., "status", "error"?}],
+                "done": 1, "failed": 0, "skipped": 0, "total": 1
+            }
+            With dry_run, the steps carry no status; "total": 0 means the
+            course already matches.
+        """
+        steps, nodes = await self.plan(courseId, spec, orgId, access_token, prune)
+        if dry_run or not nodes:
+            return {"steps": steps, "total": len(steps)}
+
+        total = len(nodes)
+        finished = 0
+
+        def on_done(key, outcome):
+            nonlocal finished
+            finished += 1
+            report_progress(finished, total, f"{key}: {outcome['status']}")
+
+        outcomes = await run_dag(nodes, rate_limiter=get_rate_limiter(orgId), on_done=on_done)
+        self.lessons.cache.invalidate_course_content(orgId, courseId)
+
+        counts = {status: 0 for status in ("done", "failed", "skipped")}
+        for step in steps:
+            outcome = outcomes[step["step"]]
+            step["status"] = outcome["status"]
+            if "error" in outcome:
+                step["error"] = outcome["error"]
+            counts[outcome["status"]] += 1
+        return {"steps": steps, **counts, "total": total}
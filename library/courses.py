@@ -3,11 +3,21 @@ TrainerCentral Course Management API Wrapper
 """
 
 import os
+import asyncio
+import httpx
 import requests
+from .http_client import get_http_client, get_async_http_client
+from .cache import get_response_cache
+from .pagination import AsyncPaginator, DEFAULT_PAGE_SIZE
+from .logging_utils import log_payload
+from .concurrency import map_bounded, get_rate_limiter
 import logging
 
 logger = logging.getLogger(__name__)
 
+# courseMembers.json returns at most 15 requests per call, whatever limit is sent.
+ACCESS_REQUESTS_PAGE_SIZE = 15
+
 
 class TrainerCentralCourses:
     """
@@ -17,6 +27,8 @@ class TrainerCentralCourses:
     def __init__(self):
         tc_api = os.getenv("TC_API_BASE_URL")
         self.base_url = f"{tc_api}/api/v4"
+        self.http = get_http_client()
+        self.cache = get_response_cache()
 
     def post_course(self, course_data: dict, orgId: str, access_token: str):
         """
@@ -36,58 +48,79 @@ class TrainerCentralCourses:
 
         logger.info("=" * 80)
         logger.info("CREATING COURSE IN TRAINERCENTRAL")
-        logger.info(f"URL: {request_url}")
-        logger.info(f"Payload: {data}")
+        logger.info("URL: %s", request_url)
+        log_payload(logger, "Payload", data)
         logger.info("=" * 80)
         
         try:
-            response = requests.post(request_url, json=data, headers=headers)
+            response = self.http.post(request_url, json=data, headers=headers)
             
-            logger.info(f"Response Status Code: {response.status_code}")
-            logger.info(f"Response Body: {response.text}")
+            logger.info("Response Status Code: %s", response.status_code)
+            log_payload(logger, "Response Body", response.content)
             
             # Check if request was successful
             if response.status_code >= 400:
-                logger.error(f"❌ TrainerCentral API Error: {response.status_code}")
-                logger.error(f"Error Response: {response.text}")
+                logger.error("❌ TrainerCentral API Error: %s", response.status_code)
+                log_payload(logger, "Error Response", response.content, logging.ERROR)
             else:
                 logger.info("✅ Course created successfully")
+                self.cache.invalidate(orgId, "courses")
             
             response_json = response.json()
             return response_json
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"❌ HTTP Request failed: {str(e)}")
+            logger.error("❌ HTTP Request failed: %s", e)
             raise
         except Exception as e:
-            logger.error(f"❌ Unexpected error: {str(e)}")
+            logger.error("❌ Unexpected error: %s", e)
             raise
 
     def get_course(self, courseId: str, orgId: str, access_token: str):
         """
         Fetch the details of a single course.
+        Served from the response cache while fresh.
         """
+        cache_key = self.cache.key(access_token, orgId, "course", courseId)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         request_url = f"{self.base_url}/{orgId}/courses/{courseId}.json"
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        logger.info(f"Getting course: {request_url}")
-        response = requests.get(request_url, headers=headers)
-        logger.info(f"Get course status: {response.status_code}")
-        
-        return response.json()
+        logger.info("Getting course: %s", request_url)
+        response = self.http.get(request_url, headers=headers)
+        logger.info("Get course status: %s", response.status_code)
+
+        course = response.json()
+        if response.status_code < 400:
+            self.cache.set(cache_key, course)
+        return course
 
-    def list_courses(self, orgId: str, access_token: str):
+    def list_courses(self, orgId: str, access_token: str, limit: int = None, si: int = None):
         """
         List all courses (or paginated subset) from TrainerCentral.
+        `limit` and `si` select one page; both are optional.
+        Served from the response cache while fresh.
         """
+        cache_key = self.cache.key(access_token, orgId, "courses", f"{limit}:{si}")
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         request_url = f"{self.base_url}/{orgId}/courses.json"
         headers = {"Authorization": f"Bearer {access_token}"}
+        params = {key: value for key, value in (("limit", limit), ("si", si)) if value is not None}
 
-        logger.info(f"Listing courses: {request_url}")
-        response = requests.get(request_url, headers=headers)
-        logger.info(f"List courses status: {response.status_code}")
-        
-        return response.json()
+        logger.info("Listing courses: %s %s", request_url, params)
+        response = self.http.get(request_url, params=params, headers=headers)
+        logger.info("List courses status: %s", response.status_code)
+
+        courses = response.json()
+        if response.status_code < 400:
+            self.cache.set(cache_key, courses)
+        return courses
 
     def update_course(self, courseId: str, updates: dict, orgId: str, access_token: str):
         """
@@ -100,12 +133,13 @@ class TrainerCentralCourses:
         }
         data = {"course": updates}
 
-        logger.info(f"Updating course: {request_url}")
-        logger.info(f"Update data: {data}")
+        logger.info("Updating course: %s", request_url)
+        log_payload(logger, "Update data", data)
         
-        response = requests.put(request_url, json=data, headers=headers)
-        logger.info(f"Update course status: {response.status_code}")
-        logger.info(f"Update response: {response.text}")
+        response = self.http.put(request_url, json=data, headers=headers)
+        logger.info("Update course status: %s", response.status_code)
+        self.cache.invalidate_course(orgId, courseId)
+        log_payload(logger, "Update response", response.content)
         
         return response.json()
 
@@ -116,23 +150,24 @@ class TrainerCentralCourses:
         request_url = f"{self.base_url}/{orgId}/courses/{courseId}.json"
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        logger.info(f"Deleting course: {response.status_code}")
-        response = requests.delete(request_url, headers=headers)
-        logger.info(f"Delete course status: {response.status_code}")
+        logger.info("Deleting course: %s", request_url)
+        response = self.http.delete(request_url, headers=headers)
+        logger.info("Delete course status: %s", response.status_code)
+        self.cache.invalidate_course(orgId, courseId)
         
         return response.json()
 
     
-    def view_course_access_requests(self, courseId: str, orgId: str, access_token: str, limit: int = 15):
+    def view_course_access_requests(self, courseId: str, orgId: str, access_token: str, limit: int = 15, si: int = 0):
         """
         Get view course requests for a TrainerCentral course.
         """
-        request_url = f"{self.base_url}/{orgId}/course/{courseId}/courseMembers.json?filter=2&limit={limit}"
+        request_url = f"{self.base_url}/{orgId}/course/{courseId}/courseMembers.json?filter=2&limit={limit}&si={si}"
         headers = {"Authorization": f"Bearer {access_token}"}
 
-        logger.info(f"Requesting course access requests from: {request_url}")
-        response = requests.get(request_url, headers=headers)
-        logger.info(f"Getting course access status: {response.status_code}")
+        logger.info("Requesting course access requests from: %s", request_url)
+        response = self.http.get(request_url, headers=headers)
+        logger.info("Getting course access status: %s", response.status_code)
         
         return response.json()
 
@@ -144,8 +179,377 @@ class TrainerCentralCourses:
         headers = {"Authorization": f"Bearer {access_token}"}
         data = {"courseMembers": [{"status": responseStatus}]}
 
-        logger.info(f"Sending request to accept/reject course access to: {request_url}")
-        response = requests.put(request_url, headers=headers, json=data)  
-        logger.info(f"Accept/Reject course access status: {response.status_code}")
+        logger.info("Sending request to accept/reject course access to: %s", request_url)
+        response = self.http.put(request_url, headers=headers, json=data)  
+        logger.info("Accept/Reject course access status: %s", response.status_code)
+
+        return response.json()
+
+
+class AsyncTrainerCentralCourses:
+    """
+    Async version of TrainerCentralCourses, for callers running on an event loop.
+    """
+
+    def __init__(self):
+        tc_api = os.getenv("TC_API_BASE_URL")
+        self.base_url = f"{tc_api}/api/v4"
+        self.http = get_async_http_client()
+        self.cache = get_response_cache()
+
+    async def post_course(self, course_data: dict, orgId: str, access_token: str):
+        """
+        Create a new course in TrainerCentral.
+        """
+        request_url = f"{self.base_url}/{orgId}/courses.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+
+        cleaned_data = course_data.copy()
+        if "courseCategories" in cleaned_data and not cleaned_data["courseCategories"]:
+            del cleaned_data["courseCategories"]
 
-        return response.json()
\ No newline at end of file
+        data = {"course": cleaned_data}
+
+        logger.info("Creating course: %s", request_url)
+        log_payload(logger, "Payload", data)
+
+        try:
+            response = await self.http.post(request_url, json=data, headers=headers)
+
+            logger.info("Response Status Code: %s", response.status_code)
+            if response.status_code >= 400:
+                logger.error("❌ TrainerCentral API Error: %s", response.status_code)
+                log_payload(logger, "Error Response", response.content, logging.ERROR)
+            else:
+                logger.info("✅ Course created successfully")
+                self.cache.invalidate(orgId, "courses")
+
+            return response.json()
+
+        except httpx.HTTPError as e:
+            logger.error("❌ HTTP Request failed: %s", e)
+            raise
+
+    async def get_course(self, courseId: str, orgId: str, access_token: str):
+        """
+        Fetch the details of a single course.
+        Served from the response cache while fresh.
+        """
+        cache_key = self.cache.key(access_token, orgId, "course", courseId)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        request_url = f"{self.base_url}/{orgId}/courses/{courseId}.json"
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        logger.info("Getting course: %s", request_url)
+        response = await self.http.get(request_url, headers=headers)
+        logger.info("Get course status: %s", response.status_code)
+
+        course = response.json()
+        if response.status_code < 400:
+            self.cache.set(cache_key, course)
+        return course
+
+    async def list_courses(self, orgId: str, access_token: str, limit: int = None, si: int = None):
+        """
+        List all courses (or paginated subset) from TrainerCentral.
+        `limit` and `si` select one page; both are optional.
+        Served from the response cache while fresh.
+        """
+        cache_key = self.cache.key(access_token, orgId, "courses", f"{limit}:{si}")
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        request_url = f"{self.base_url}/{orgId}/courses.json"
+        headers = {"Authorization": f"Bearer {access_token}"}
+        params = {key: value for key, value in (("limit", limit), ("si", si)) if value is not None}
+
+        logger.info("Listing courses: %s %s", request_url, params)
+        response = await self.http.get(request_url, params=params, headers=headers)
+        logger.info("List courses status: %s", response.status_code)
+
+        courses = response.json()
+        if response.status_code < 400:
+            self.cache.set(cache_key, courses)
+        return courses
+
+    async def update_course(self, courseId: str, updates: dict, orgId: str, access_token: str):
+        """
+        Edit/update an existing TrainerCentral course.
+        """
+        request_url = f"{self.base_url}/{orgId}/courses/{courseId}.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        data = {"course": updates}
+
+        logger.info("Updating course: %s", request_url)
+        response = await self.http.put(request_url, json=data, headers=headers)
+        logger.info("Update course status: %s", response.status_code)
+        self.cache.invalidate_course(orgId, courseId)
+
+        return response.json()
+
+    async def delete_course(self, courseId: str, orgId: str, access_token: str):
+        """
+        Permanently delete a TrainerCentral course.
+        """
+        request_url = f"{self.base_url}/{orgId}/courses/{courseId}.json"
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        logger.info("Deleting course: %s", request_url)
+        response = await self.http.delete(request_url, headers=headers)
+        logger.info("Delete course status: %s", response.status_code)
+        self.cache.invalidate_course(orgId, courseId)
+
+        return response.json()
+
+    async def view_course_access_requests(self, courseId: str, orgId: str, access_token: str, limit: int = 15, si: int = 0):
+        """
+        Get view course requests for a TrainerCentral course.
+        """
+        request_url = f"{self.base_url}/{orgId}/course/{courseId}/courseMembers.json?filter=2&limit={limit}&si={si}"
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        logger.info("Requesting course access requests from: %s", request_url)
+        response = await self.http.get(request_url, headers=headers)
+        logger.info("Getting course access status: %s", response.status_code)
+
+        return response.json()
+
+    async def accept_or_reject_course_view_access_request(self, courseMembersId: str, orgId: str, access_token: str, responseStatus: int):
+        """
+        Accept or Reject a user's course view access request.
+        """
+        return (await self._respond_to_access_request(courseMembersId, orgId, access_token, responseStatus)).json()
+
+    async def _respond_to_access_request(self, courseMembersId: str, orgId: str, access_token: str,
+                                         responseStatus: int) -> httpx.Response:
+        request_url = f"{self.base_url}/{orgId}/updateCourseAttendee/{courseMembersId}.json"
+        headers = {"Authorization": f"Bearer {access_token}"}
+        data = {"courseMembers": [{"status": responseStatus}]}
+
+        logger.info("Sending request to accept/reject course access to: %s", request_url)
+        response = await self.http.put(request_url, headers=headers, json=data)
+        logger.info("Accept/Reject course access status: %s", response.status_code)
+        return response
+
+    async def bulk_respond_to_access_requests(
+        self,
+        courseId: str,
+        orgId: str,
+        access_token: str,
+        responseStatus: int,
+        courseMembersIds: list = None,
+        emails: list = None,
+        email_domain: str = None,
+        all_pending: bool = False,
+        dry_run: bool = False,
+    ) -> dict:
+        """
+        Accept (2) or reject (3) many pending course access requests.
+
+        Every pending request is read first and the matching ones are
+        selected; only then are decisions sent, because each decision removes
+        a request from the pending list and would shift later pages. Requests
+        match when their ID is in `courseMembersIds`, their email is in
+        `emails`, or their email ends with `@email_domain`; `all_pending`
+        selects every request. Decisions are sent concurrently under the
+        org's rate limit.
+
+        Returns:
+            dict: {
+                "results": [{"courseMembersId", "email", "status": "accepted" | "rejected" | "failed" | "matched"}],
+                "pending": 2400, "matched": 310, "accepted": 309, "failed": 1
+            }
+            With dry_run=True nothing is sent and every match is "matched".
+            A matched request without an ID is never sent and is "failed".
+        """
+        if responseStatus not in (2, 3):
+            raise ValueError("responseStatus must be 2 (accept) or 3 (reject)")
+        if not (courseMembersIds or emails or email_domain or all_pending):
+            raise ValueError("Select requests with courseMembersIds, emails, email_domain or all_pending")
+
+        wanted_ids = {str(member_id) for member_id in courseMembersIds or []}
+        wanted_emails = {email.lower() for email in emails or []}
+        domain = f"@{email_domain.lower().lstrip('@')}" if email_domain else None
+
+        pending = 0
+        selected = []
+        async for member in self.iter_course_access_requests(courseId, orgId, access_token):
+            pending += 1
+            member_id = member.get("courseMembersId") or member.get("id")
+            member_id = str(member_id) if member_id else None
+            email = (member.get("emailId") or member.get("email") or "").lower()
+            if (
+                all_pending or member_id in wanted_ids or email in wanted_emails
+                or (domain and email.endswith(domain))
+            ):
+                selected.append({"courseMembersId": member_id, "email": email})
+
+        summary = {"pending": pending, "matched": len(selected)}
+        if dry_run:
+            return {"results": [
+                {**member, "status": "matched" if member["courseMembersId"] else "failed"} for member in selected
+            ], **summary}
+
+        done_status = "accepted" if responseStatus == 2 else "rejected"
+
+        async def respond(member):
+            if member["courseMembersId"] is None:
+                return {**member, "status": "failed", "error": "Access request has no courseMembersId"}
+            try:
+                response = await self._respond_to_access_request(
+                    member["courseMembersId"], orgId, access_token, responseStatus
+                )
+            except httpx.HTTPError as e:
+                return {**member, "status": "failed", "error": str(e)}
+            if response.status_code >= 400:
+                return {**member, "status": "failed", "error": response.text}
+            return {**member, "status": done_status}
+
+        results = await map_bounded(respond, selected, rate_limiter=get_rate_limiter(orgId))
+        summary[done_status] = sum(1 for result in results if result["status"] == done_status)
+        summary["failed"] = len(results) - summary[done_status]
+        return {"results": results, **summary}
+
+    def iter_courses(self, orgId: str, access_token: str, page_size: int = DEFAULT_PAGE_SIZE,
+                     si: int = 0, max_items: int = None) -> AsyncPaginator:
+        """
+        Lazily iterate every course in the org, one page in memory at a time.
+
+        Usage:
+            async for course in tc.iter_courses(orgId, access_token):
+                ...
+        """
+        async def fetch_page(page_si, page_limit):
+            return await self.list_courses(orgId, access_token, limit=page_limit, si=page_si)
+
+        return AsyncPaginator(fetch_page, "courses", page_size, si, max_items)
+
+    def iter_course_access_requests(self, courseId: str, orgId: str, access_token: str,
+                                    page_size: int = ACCESS_REQUESTS_PAGE_SIZE, si: int = 0,
+                                    max_items: int = None) -> AsyncPaginator:
+        """
+        Lazily iterate the pending access requests of a course.
+
+        Pages must not be larger than upstream's cap: the paginator takes a
+        short page for the last one.
+        """
+        async def fetch_page(page_si, page_limit):
+            return await self.view_course_access_requests(courseId, orgId, access_token, page_limit, page_si)
+
+        return AsyncPaginator(fetch_page, "courseMembers", page_size, si, max_items)
+
+    def iter_course_children(self, courseId: str, orgId: str, access_token: str, kind: str) -> AsyncPaginator:
+        """
+        Iterate /course/<courseId>/<kind>.json, e.g. kind="sections".
+        """
+        request_url = f"{self.base_url}/{orgId}/course/{courseId}/{kind}.json"
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        async def fetch_page(page_si, page_limit):
+            response = await self.http.get(request_url, params={"limit": page_limit, "si": page_si}, headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+        return AsyncPaginator(fetch_page, kind, DEFAULT_PAGE_SIZE)
+
+    async def get_course_outline(self, courseId: str, orgId: str, access_token: str) -> dict:
+        """
+        Fetch a course with its chapters, lessons and live workshops in one call.
+
+        The course, its sections and its sessions are fetched concurrently and
+        assembled into a tree; live workshops are the sessions with
+        deliveryMode 3. Served from the response cache while fresh.
+
+        Returns:
+            dict: {
+                "course": {...},
+                "chapters": [{"sectionId", "name", "lessons": [...]}, ...],
+                "unassigned_lessons": [...],   # sessions without a section
+                "live_workshops": [...],
+                "total_lessons": 12
+            }
+        """
+        cache_key = self.cache.key(access_token, orgId, "course_outline", courseId)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            course_data, sections, sessions = await asyncio.gather(
+                self.get_course(courseId, orgId, access_token),
+                self.iter_course_children(courseId, orgId, access_token, "sections").collect(),
+                self.iter_course_children(courseId, orgId, access_token, "sessions").collect(),
+            )
+        except httpx.HTTPError as e:
+            logger.error("Failed to get course outline: %s", e)
+            return {
+                "error": f"Failed to retrieve course outline: {str(e)}",
+                "courseId": courseId
+            }
+
+        if "course" not in course_data:
+            return {
+                "error": "'course' key missing in response",
+                "raw": course_data
+            }
+        course_obj = course_data["course"]
+
+        chapters = []
+        chapters_by_id = {}
+        for section in sections:
+            chapter = {
+                "sectionId": section.get("sectionId") or section.get("id"),
+                "name": section.get("name"),
+                "lessons": [],
+            }
+            chapters.append(chapter)
+            chapters_by_id[str(chapter["sectionId"])] = chapter
+
+        unassigned = []
+        live_workshops = []
+        total_lessons = 0
+        for session in sessions:
+            summary = {
+                "sessionId": session.get("sessionId"),
+                "name": session.get("name"),
+                "description": session.get("description", ""),
+                "deliveryMode": session.get("deliveryMode"),
+                "sectionId": session.get("sectionId"),
+                "links": session.get("links", {})
+            }
+            if str(session.get("deliveryMode")) == "3":
+                summary["startTime"] = session.get("startTime")
+                summary["endTime"] = session.get("endTime")
+                live_workshops.append(summary)
+                continue
+            total_lessons += 1
+            chapter = chapters_by_id.get(str(session.get("sectionId")))
+            if chapter is not None:
+                chapter["lessons"].append(summary)
+            else:
+                unassigned.append(summary)
+
+        outline = {
+            "course": {
+                "courseId": course_obj.get("courseId"),
+                "courseName": course_obj.get("courseName"),
+                "subTitle": course_obj.get("subTitle"),
+                "links": course_obj.get("links", {})
+            },
+            "chapters": chapters,
+            "unassigned_lessons": unassigned,
+            "live_workshops": live_workshops,
+            "total_lessons": total_lessons
+        }
+        self.cache.set(cache_key, outline)
+        return outline
@@ -0,0 +1,325 @@
+"""
+Shared HTTP transport for all TrainerCentral API wrappers.
+
+Every TrainerCentral* class sends its requests through one pooled
+`requests.Session`, so connections to TrainerCentral are kept alive and
+reused instead of paying a fresh TCP + TLS handshake on every tool call.
+The AsyncTrainerCentral* classes do the same through one `httpx.AsyncClient`.
+
+Both clients coalesce identical concurrent GETs (same URL, query and
+Authorization header): one upstream call is made and every caller waiting
+on it receives the same response.
+
+Configuration (environment variables):
+    TC_HTTP_POOL_SIZE   max connections kept per host (default 20)
+    TC_HTTP_POOL_HOSTS  number of hosts that get their own pool (default 4)
+    TC_HTTP_POOL_BLOCK  "true" to wait for a free connection instead of
+                        opening an overflow one (default "true")
+    TC_HTTP_TIMEOUT     seconds before a request without its own timeout
+                        gives up (default 30)
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+_metrics_lock = threading.Lock()
+
+
+class _MeteredPoolMixin:
+    """
+    Counts connection checkouts that found every slot of the pool in use.
+    """
+
+    waited = 0
+
+    def _get_conn(self, timeout=None):
+        if self.pool is not None and self.pool.empty():
+            with _metrics_lock:
+                self.waited += 1
+        return super()._get_conn(timeout)
+
+
+class _MeteredHTTPConnectionPool(_MeteredPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _MeteredHTTPSConnectionPool(_MeteredPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+_METERED_POOL_CLASSES = {
+    "http": _MeteredHTTPConnectionPool,
+    "https": _MeteredHTTPSConnectionPool,
+}
+
+
+def _flight_key(url: str, kwargs: dict) -> tuple:
+    """
+    Identify a GET by everything that can change its response.
+    """
+    headers = kwargs.get("headers") or {}
+    params = kwargs.get("params") or {}
+    return (url, tuple(sorted(params.items())), headers.get("Authorization"))
+
+
+class _MeteredAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _METERED_POOL_CLASSES
+
+
+class TrainerCentralHTTPClient:
+    """
+    Keep-alive connection pool shared by every TrainerCentral* class.
+    """
+
+    def __init__(self, pool_size: int = None, pool_hosts: int = None, pool_block: bool = None):
+        self.pool_size = pool_size or int(os.getenv("TC_HTTP_POOL_SIZE", "20"))
+        self.pool_hosts = pool_hosts or int(os.getenv("TC_HTTP_POOL_HOSTS", "4"))
+        if pool_block is None:
+            pool_block = os.getenv("TC_HTTP_POOL_BLOCK", "true").lower() == "true"
+        self.pool_block = pool_block
+        self.timeout = float(os.getenv("TC_HTTP_TIMEOUT", "30"))
+
+        self.adapter = _MeteredAdapter(
+            pool_connections=self.pool_hosts,
+            pool_maxsize=self.pool_size,
+            pool_block=self.pool_block,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self.coalesced = 0
+
+        logger.info(
+            "HTTP pool ready (size per host=%d, hosts=%d, block=%s)",
+            self.pool_size, self.pool_hosts, self.pool_block
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request over the shared session.
+
+        Accepts the same keyword arguments as `requests.request`.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET `url`, sharing the in-flight call if an identical GET is running.
+        """
+        key = _flight_key(url, kwargs)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._flights[key] = flight
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            response = self.request("GET", url, **kwargs)
+            flight.set_result(response)
+            return response
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def pool_stats(self) -> dict:
+        """
+        Report connection pool usage per host.
+
+        Returns:
+            dict: {
+                "pool_size": 20,
+                "hosts": {
+                    "https://myacademy.trainercentral.in": {
+                        "open": 3,      # idle + checked out
+                        "idle": 2,      # kept alive, ready for reuse
+                        "in_use": 1,
+                        "waited": 0     # checkouts that found the pool exhausted
+                    }
+                },
+                "open": 3, "idle": 2, "in_use": 1, "waited": 0
+            }
+        """
+        pools = self.adapter.poolmanager.pools
+        hosts = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None or pool.pool is None:
+                continue
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+            in_use = pool.pool.maxsize - pool.pool.qsize()
+            hosts[f"{key.key_scheme}://{key.key_host}"] = {
+                "open": idle + in_use,
+                "idle": idle,
+                "in_use": in_use,
+                "waited": pool.waited,
+            }
+
+        totals = {
+            field: sum(host[field] for host in hosts.values())
+            for field in ("open", "idle", "in_use", "waited")
+        }
+        return {"pool_size": self.pool_size, "hosts": hosts, **totals, "coalesced": self.coalesced}
+
+
+http_client = TrainerCentralHTTPClient()
+
+
+def get_http_client() -> TrainerCentralHTTPClient:
+    """
+    Return the process-wide pooled HTTP client.
+    """
+    return http_client
+
+
+class AsyncTrainerCentralHTTPClient:
+    """
+    Async counterpart of TrainerCentralHTTPClient, built on httpx.
+
+    httpx limits connections for the whole client rather than per host, so
+    the limit is TC_HTTP_POOL_SIZE * TC_HTTP_POOL_HOSTS connections.
+
+    Pooled connections belong to the event loop that opened them, so the
+    underlying httpx client is recreated if it is used from a new loop.
+    """
+
+    def __init__(self, pool_size: int = None, pool_hosts: int = None):
+        self.pool_size = pool_size or int(os.getenv("TC_HTTP_POOL_SIZE", "20"))
+        self.pool_hosts = pool_hosts or int(os.getenv("TC_HTTP_POOL_HOSTS", "4"))
+        self.max_connections = self.pool_size * self.pool_hosts
+        # A coalesced GET holds every waiter on its key, so none may hang forever.
+        self.timeout = float(os.getenv("TC_HTTP_TIMEOUT", "30"))
+
+        self.client = None
+        self._loop = None
+        self._flights = {}
+        self.in_flight = 0
+        self.waited = 0
+        self.coalesced = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._loop is not loop:
+            self.client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+            )
+            self._loop = loop
+        return self.client
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request over the shared async client.
+
+        Accepts the same keyword arguments as `httpx.AsyncClient.request`.
+        """
+        if self.in_flight >= self.max_connections:
+            self.waited += 1
+        self.in_flight += 1
+        try:
+            return await self._get_client().request(method, url, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET `url`, sharing the in-flight call if an identical GET is running.
+
+        The shared call is shielded, so one waiter being cancelled does not
+        cancel it for the others.
+        """
+        key = _flight_key(url, kwargs)
+        flight = self._flights.get(key)
+        if flight is not None and flight.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            return await asyncio.shield(flight)
+
+        flight = asyncio.ensure_future(self.request("GET", url, **kwargs))
+        self._flights[key] = flight
+
+        def land(_):
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+        flight.add_done_callback(land)
+        return await asyncio.shield(flight)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def pool_stats(self) -> dict:
+        """
+        Report connection pool usage in the same shape as
+        TrainerCentralHTTPClient.pool_stats(), without the per-host split.
+        """
+        transport = getattr(self.client, "_transport", None)
+        pool = getattr(transport, "_pool", None)
+        connections = list(pool.connections) if pool is not None else []
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "pool_size": self.max_connections,
+            "open": len(connections),
+            "idle": idle,
+            "in_use": len(connections) - idle,
+            "waited": self.waited,
+            "coalesced": self.coalesced,
+        }
+
+
+_async_http_client = None
+
+
+def get_async_http_client() -> AsyncTrainerCentralHTTPClient:
+    """
+    Return the process-wide pooled async HTTP client, creating it on first use.
+    """
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = AsyncTrainerCentralHTTPClient()
+    return _async_http_client
@@ -0,0 +1,39 @@
+"""
+Fast JSON encoding for MCP request and response payloads.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both paths produce compact UTF-8 JSON, and objects JSON cannot
+represent natively are encoded with str().
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """
+    Encode `obj` to compact UTF-8 JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_str(obj) -> str:
+    """
+    Encode `obj` to a compact JSON string.
+    """
+    return dumps(obj).decode()
+
+
+def loads(data):
+    """
+    Decode JSON from bytes or str.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,6 +1,12 @@
 import os
+import asyncio
+import httpx
 import requests
-from .common_utils import TrainerCentralCommon
+from .common_utils import TrainerCentralCommon, AsyncTrainerCentralCommon
+from .http_client import get_http_client, get_async_http_client
+from .cache import get_response_cache
+from .progress import report_progress
+from .concurrency import BULK_CONCURRENCY, check_bulk_size, check_response
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,6 +15,8 @@ class TrainerCentralLessons:
     def __init__(self):
         tc_api = os.getenv("TC_API_BASE_URL")
         self.base_url = f"{tc_api}/api/v4"
+        self.http = get_http_client()
+        self.cache = get_response_cache()
         self.common = TrainerCentralCommon()
 
     def create_lesson_with_content(
@@ -47,7 +55,8 @@ class TrainerCentralLessons:
             "Authorization": f"Bearer {access_token}"
         }
         payload = {"session": lesson_data}
-        create_resp = requests.post(url, json=payload, headers=headers).json()
+        create_resp = self.http.post(url, json=payload, headers=headers).json()
+        report_progress(1, 2, "Lesson created")
 
         # Step 2: upload content
         session_obj = create_resp.get("session")
@@ -66,7 +75,10 @@ class TrainerCentralLessons:
             "richTextContent": content_html,
             "filename": content_filename
         }
-        content_resp = requests.post(content_url, json=content_body, headers=content_headers).json()
+        content_resp = self.http.post(content_url, json=content_body, headers=content_headers).json()
+        report_progress(2, 2, "Lesson content uploaded")
+
+        self.cache.invalidate_course_content(orgId, lesson_data.get("courseId"))
 
         return {
             "lesson": create_resp,
@@ -111,6 +123,11 @@ class TrainerCentralLessons:
                 "total_lessons": 5
             }
         """
+        cache_key = self.cache.key(access_token, orgId, "course_lessons", courseId)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json"
@@ -120,8 +137,8 @@ class TrainerCentralLessons:
         course_url = f"{self.base_url}/{orgId}/courses/{courseId}.json"
         
         try:
-            logger.info(f"Fetching course details: {course_url}")
-            course_res = requests.get(course_url, headers=headers)
+            logger.info("Fetching course details: %s", course_url)
+            course_res = self.http.get(course_url, headers=headers)
             course_res.raise_for_status()
             course_data = course_res.json()
             
@@ -152,8 +169,8 @@ class TrainerCentralLessons:
             # sessions_link is relative, e.g., "/api/v4/{orgId}/course/{courseId}/sessions.json"
             sessions_url = f"{self.base_url.split('/api/v4')[0]}{sessions_link}"
             
-            logger.info(f"Fetching lessons: {sessions_url}")
-            sessions_res = requests.get(sessions_url, headers=headers)
+            logger.info("Fetching lessons: %s", sessions_url)
+            sessions_res = self.http.get(sessions_url, headers=headers)
             sessions_res.raise_for_status()
             sessions_data = sessions_res.json()
             
@@ -169,9 +186,9 @@ class TrainerCentralLessons:
                     "links": session.get("links", {})
                 })
             
-            logger.info(f"Found {len(lessons_list)} lessons")
+            logger.info("Found %d lessons", len(lessons_list))
             
-            return {
+            result = {
                 "course": {
                     "courseId": course_obj.get("courseId"),
                     "courseName": course_obj.get("courseName")
@@ -179,15 +196,17 @@ class TrainerCentralLessons:
                 "lessons": lessons_list,
                 "total_lessons": len(lessons_list)
             }
+            self.cache.set(cache_key, result)
+            return result
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to get course lessons: {e}")
+            logger.error("Failed to get course lessons: %s", e)
             return {
                 "error": f"Failed to retrieve lessons: {str(e)}",
                 "courseId": courseId
             }
         except Exception as e:
-            logger.error(f"Unexpected error: {e}", exc_info=True)
+            logger.error("Unexpected error: %s", e, exc_info=True)
             return {
                 "error": f"Unexpected error: {str(e)}",
                 "courseId": courseId
@@ -200,7 +219,274 @@ class TrainerCentralLessons:
             "Authorization": f"Bearer {access_token}"
         }
         payload = {"session": updates}
-        return requests.put(url, json=payload, headers=headers).json()
+        response = self.http.put(url, json=payload, headers=headers).json()
+        # The session's course isn't known here, so drop every course's lessons.
+        self.cache.invalidate_course_content(orgId)
+        return response
 
     def delete_lesson(self, session_id: str, orgId: str, access_token: str) -> dict:
-        return self.common.delete_resource("sessions", session_id, orgId, access_token)
+        response = self.common.delete_resource("sessions", session_id, orgId, access_token)
+        # The session's course isn't known here, so drop every course's lessons.
+        self.cache.invalidate_course_content(orgId)
+        return response
+
+
+class AsyncTrainerCentralLessons:
+    """
+    Async version of TrainerCentralLessons, for callers running on an event loop.
+    See TrainerCentralLessons for the arguments and return shapes.
+    """
+
+    def __init__(self):
+        tc_api = os.getenv("TC_API_BASE_URL")
+        self.base_url = f"{tc_api}/api/v4"
+        self.http = get_async_http_client()
+        self.cache = get_response_cache()
+        self.common = AsyncTrainerCentralCommon()
+
+    async def create_lesson_with_content(
+        self,
+        lesson_data: dict,
+        content_html: str,
+        orgId: str,
+        access_token: str,
+        content_filename: str = "Content",
+    ) -> dict:
+        """
+        Create a lesson (session) with full rich-text content.
+        """
+        # Step 1: create session
+        create_resp, session_id = await self.create_session(lesson_data, orgId, access_token)
+        report_progress(1, 2, "Lesson created")
+
+        # Step 2: upload content
+        content_resp = await self.upload_content(session_id, content_html, content_filename, orgId, access_token)
+        report_progress(2, 2, "Lesson content uploaded")
+
+        self.cache.invalidate_course_content(orgId, lesson_data.get("courseId"))
+
+        return {
+            "lesson": create_resp,
+            "content": content_resp
+        }
+
+    async def create_session(self, lesson_data: dict, orgId: str, access_token: str) -> tuple:
+        """
+        POST the session; returns (response, sessionId).
+        """
+        url = f"{self.base_url}/{orgId}/sessions.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        payload = {"session": lesson_data}
+        create_resp = (await self.http.post(url, json=payload, headers=headers)).json()
+
+        session_obj = create_resp.get("session")
+        session_id = None
+        if isinstance(session_obj, dict):
+            session_id = session_obj.get("id") or session_obj.get("sessionId")
+        if not session_id:
+            raise RuntimeError(f"Failed to find sessionId in response: {create_resp}")
+        return create_resp, session_id
+
+    async def upload_content(self, session_id: str, content_html: str, content_filename: str,
+                             orgId: str, access_token: str) -> dict:
+        """
+        POST a session's rich-text content.
+        """
+        content_url = f"{self.base_url}/{orgId}/session/{session_id}/createTextFile.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        content_body = {
+            "richTextContent": content_html,
+            "filename": content_filename
+        }
+        return (await self.http.post(content_url, json=content_body, headers=headers)).json()
+
+    async def create_lessons_bulk(self, lessons: list, orgId: str, access_token: str,
+                                  concurrency: int = None) -> dict:
+        """
+        Create many lessons with their content in one call.
+
+        Sessions are created one at a time, in the given order, so lessons
+        keep that order in their chapter; each lesson's content upload starts
+        as soon as its session exists and runs alongside the next creations,
+        with at most `concurrency` uploads in flight. A failed item does not
+        stop the others.
+
+        Args:
+            lessons (list): [{"session_data": {...}, "content_html": "...",
+                              "content_filename": "Content"}, ...]
+            concurrency (int, optional): upload cap (default TC_BULK_CONCURRENCY).
+
+        Returns:
+            dict: {
+                "results": [{"index": 0, "status": "created", "sessionId": ...,
+                             "lesson": ..., "content": ...}, ...],
+                "created": 39, "partial": 0, "failed": 1, "total": 40
+            }
+            "partial" items have a session but no uploaded content.
+        """
+        check_bulk_size(lessons, "lessons")
+        total = len(lessons)
+        results = [None] * total
+        upload_slots = asyncio.Semaphore(concurrency or BULK_CONCURRENCY)
+        finished = 0
+
+        def finish(index: int, result: dict):
+            nonlocal finished
+            results[index] = {"index": index, **result}
+            finished += 1
+            report_progress(finished, total, f"Lesson {index + 1}: {result['status']}")
+
+        async def upload(index: int, spec: dict, create_resp: dict, session_id: str):
+            try:
+                async with upload_slots:
+                    content_resp = check_response(await self.upload_content(
+                        session_id, spec["content_html"], spec.get("content_filename", "Content"),
+                        orgId, access_token
+                    ), "upload content")
+            except Exception as e:
+                logger.error("Content upload failed for session %s: %s", session_id, e)
+                finish(index, {"status": "partial", "sessionId": session_id,
+                               "lesson": create_resp, "error": str(e)})
+                return
+            finish(index, {"status": "created", "sessionId": session_id,
+                           "lesson": create_resp, "content": content_resp})
+
+        uploads = []
+        try:
+            for index, spec in enumerate(lessons):
+                try:
+                    if not isinstance(spec, dict) or "session_data" not in spec or "content_html" not in spec:
+                        raise ValueError("Each lesson needs session_data and content_html")
+                    create_resp, session_id = await self.create_session(spec["session_data"], orgId, access_token)
+                except Exception as e:
+                    logger.error("Lesson %d not created: %s", index, e)
+                    finish(index, {"status": "failed", "error": str(e)})
+                    continue
+                uploads.append(asyncio.ensure_future(upload(index, spec, create_resp, session_id)))
+            await asyncio.gather(*uploads)
+        finally:
+            for task in uploads:
+                task.cancel()
+            course_ids = {
+                spec["session_data"].get("courseId") for spec in lessons
+                if isinstance(spec, dict) and isinstance(spec.get("session_data"), dict)
+            }
+            for course_id in course_ids:
+                self.cache.invalidate_course_content(orgId, course_id)
+
+        counts = {status: sum(1 for r in results if r["status"] == status)
+                  for status in ("created", "partial", "failed")}
+        return {"results": results, **counts, "total": total}
+
+    async def get_course_lessons(self, courseId: str, orgId: str, access_token: str) -> dict:
+        """
+        Fetch all lessons (sessions) under a course.
+        """
+        cache_key = self.cache.key(access_token, orgId, "course_lessons", courseId)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+
+        # Step 1: Get course details to find sessions link
+        course_url = f"{self.base_url}/{orgId}/courses/{courseId}.json"
+
+        try:
+            logger.info("Fetching course details: %s", course_url)
+            course_res = await self.http.get(course_url, headers=headers)
+            course_res.raise_for_status()
+            course_data = course_res.json()
+
+            if "course" not in course_data:
+                logger.error("'course' key missing in response")
+                return {
+                    "error": "'course' key missing in response",
+                    "raw": course_data
+                }
+
+            course_obj = course_data["course"]
+
+            sessions_link = course_obj.get("links", {}).get("sessions")
+            if not sessions_link:
+                logger.warning("No sessions link found - course may have no lessons")
+                return {
+                    "course": {
+                        "courseId": course_obj.get("courseId"),
+                        "courseName": course_obj.get("courseName")
+                    },
+                    "lessons": [],
+                    "total_lessons": 0
+                }
+
+            # Step 2: Get lessons from sessions endpoint
+            sessions_url = f"{self.base_url.split('/api/v4')[0]}{sessions_link}"
+
+            logger.info("Fetching lessons: %s", sessions_url)
+            sessions_res = await self.http.get(sessions_url, headers=headers)
+            sessions_res.raise_for_status()
+            sessions_data = sessions_res.json()
+
+            lessons_list = []
+            for session in sessions_data.get("sessions", []):
+                lessons_list.append({
+                    "sessionId": session.get("sessionId"),
+                    "name": session.get("name"),
+                    "description": session.get("description", ""),
+                    "deliveryMode": session.get("deliveryMode"),
+                    "sectionId": session.get("sectionId"),
+                    "links": session.get("links", {})
+                })
+
+            logger.info("Found %d lessons", len(lessons_list))
+
+            result = {
+                "course": {
+                    "courseId": course_obj.get("courseId"),
+                    "courseName": course_obj.get("courseName")
+                },
+                "lessons": lessons_list,
+                "total_lessons": len(lessons_list)
+            }
+            self.cache.set(cache_key, result)
+            return result
+
+        except httpx.HTTPError as e:
+            logger.error("Failed to get course lessons: %s", e)
+            return {
+                "error": f"Failed to retrieve lessons: {str(e)}",
+                "courseId": courseId
+            }
+        except Exception as e:
+            logger.error("Unexpected error: %s", e, exc_info=True)
+            return {
+                "error": f"Unexpected error: {str(e)}",
+                "courseId": courseId
+            }
+
+    async def update_lesson(self, session_id: str, updates: dict, orgId: str, access_token: str) -> dict:
+        url = f"{self.base_url}/{orgId}/sessions/{session_id}.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        payload = {"session": updates}
+        response = (await self.http.put(url, json=payload, headers=headers)).json()
+        # The session's course isn't known here, so drop every course's lessons.
+        self.cache.invalidate_course_content(orgId)
+        return response
+
+    async def delete_lesson(self, session_id: str, orgId: str, access_token: str) -> dict:
+        response = await self.common.delete_resource("sessions", session_id, orgId, access_token)
+        # The session's course isn't known here, so drop every course's lessons.
+        self.cache.invalidate_course_content(orgId)
+        return response
@@ -1,6 +1,16 @@
 import os
-import requests
+import time
+import httpx
+from library.http_client import get_http_client, get_async_http_client
+from library.cache import get_response_cache
+from library.pagination import AsyncPaginator, DEFAULT_PAGE_SIZE
 from library.common_utils import DateConverter
+from library.concurrency import map_bounded, get_rate_limiter
+from library.recurrence import expand_occurrences, reschedule_window, parse_local_datetime, to_millis
+from library.recipients import iter_recipients, chunked, summarize
+
+# sessionMembers.json accepts many members per request; this many are sent per call.
+INVITE_BATCH_SIZE = int(os.getenv("TC_INVITE_BATCH_SIZE", "50"))
 
 
 class TrainerCentralLiveWorkshops:
@@ -28,6 +38,8 @@ class TrainerCentralLiveWorkshops:
     def __init__(self):
         tc_api = os.getenv("TC_API_BASE_URL")
         self.base_url = f"{tc_api}/api/v4"
+        self.http = get_http_client()
+        self.cache = get_response_cache()
         self.date_converter = DateConverter()  
 
 
@@ -76,7 +88,9 @@ class TrainerCentralLiveWorkshops:
             }
         }
 
-        return requests.post(url, json=body, headers=headers).json()
+        response = self.http.post(url, json=body, headers=headers).json()
+        self.cache.invalidate(orgId, "workshops")
+        return response
 
 
     def update_workshop(self, session_id: str, updates: dict, orgId: str, access_token: str) -> dict:
@@ -105,7 +119,9 @@ class TrainerCentralLiveWorkshops:
         }
 
         payload = {"session": updates}
-        return requests.put(url, json=payload, headers=headers).json()
+        response = self.http.put(url, json=payload, headers=headers).json()
+        self.cache.invalidate(orgId, "workshops")
+        return response
 
 
     def create_occurrence(self, talk_data: dict, orgId: str, access_token: str) -> dict:
@@ -132,7 +148,9 @@ class TrainerCentralLiveWorkshops:
         }
 
         payload = {"talk": talk_data}
-        return requests.post(url, json=payload, headers=headers).json()
+        response = self.http.post(url, json=payload, headers=headers).json()
+        self.cache.invalidate(orgId, "workshops")
+        return response
 
 
     def update_occurrence(self, talk_id: str, updates: dict, orgId: str, access_token: str) -> dict:
@@ -160,7 +178,9 @@ class TrainerCentralLiveWorkshops:
         }
 
         payload = {"talk": updates}
-        return requests.put(url, json=payload, headers=headers).json()
+        response = self.http.put(url, json=payload, headers=headers).json()
+        self.cache.invalidate(orgId, "workshops")
+        return response
 
     def list_all_upcoming_workshops(self, orgId: str, access_token: str, filter_type: int = 5, limit: int = 50, si: int = 0) -> dict:
         """
@@ -175,11 +195,20 @@ class TrainerCentralLiveWorkshops:
         Returns:
             dict: API response with sessions list.
         """
+        cache_key = self.cache.key(access_token, orgId, "workshops", f"{filter_type}:{limit}:{si}")
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         url = f"{self.base_url}/{orgId}/talks.json?filter={filter_type}&limit={limit}&si={si}"
         headers = {
             "Authorization": f"Bearer {access_token}"
         }
-        return requests.get(url, headers=headers).json()
+        response = self.http.get(url, headers=headers)
+        workshops = response.json()
+        if response.status_code < 400:
+            self.cache.set(cache_key, workshops)
+        return workshops
 
     def invite_user_to_workshop(self, session_id: str, email: str, orgId: str, access_token: str, role: int = 3, source: int = 1) -> dict:
         """
@@ -209,6 +238,396 @@ class TrainerCentralLiveWorkshops:
                 }
             ]
         }
-        resp = requests.post(url, json=body, headers=headers)
+        resp = self.http.post(url, json=body, headers=headers)
         resp.raise_for_status()
-        return resp.json()
\ No newline at end of file
+        return resp.json()
+
+
+class AsyncTrainerCentralLiveWorkshops:
+    """
+    Async version of TrainerCentralLiveWorkshops (GLOBAL live workshops),
+    for callers running on an event loop. See TrainerCentralLiveWorkshops
+    for the API references and argument formats.
+    """
+
+    def __init__(self):
+        tc_api = os.getenv("TC_API_BASE_URL")
+        self.base_url = f"{tc_api}/api/v4"
+        self.http = get_async_http_client()
+        self.cache = get_response_cache()
+        self.date_converter = DateConverter()
+
+    async def create_global_workshop(
+        self,
+        name: str,
+        description_html: str,
+        start_time_str: str,
+        end_time_str: str,
+        orgId: str,
+        access_token: str
+    ) -> dict:
+        """
+        Create a GLOBAL live workshop.
+
+        Args (LLM REQUIRED FORMAT):
+            start_time_str: "DD-MM-YYYY HH:MMAM/PM"
+            end_time_str:   "DD-MM-YYYY HH:MMAM/PM"
+        """
+        start_ms = int(self.date_converter.convert_date_to_time(start_time_str))
+        end_ms = int(self.date_converter.convert_date_to_time(end_time_str))
+
+        url = f"{self.base_url}/{orgId}/sessions.json"
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+
+        body = {
+            "session": {
+                "name": name,
+                "description": description_html,
+                "deliveryMode": 3,
+                "scheduledTime": start_ms,
+                "scheduledEndTime": end_ms,
+                "durationTime": end_ms - start_ms
+            }
+        }
+
+        response = (await self.http.post(url, json=body, headers=headers)).json()
+        self.cache.invalidate(orgId, "workshops")
+        return response
+
+    async def update_workshop(self, session_id: str, updates: dict, orgId: str, access_token: str) -> dict:
+        """
+        Update an existing global live workshop.
+        """
+        url = f"{self.base_url}/{orgId}/sessions/{session_id}.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+
+        payload = {"session": updates}
+        response = (await self.http.put(url, json=payload, headers=headers)).json()
+        self.cache.invalidate(orgId, "workshops")
+        return response
+
+    async def create_occurrence(self, talk_data: dict, orgId: str, access_token: str) -> dict:
+        """
+        Create an occurrence (talk) for a workshop.
+        """
+        url = f"{self.base_url}/{orgId}/talks.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+
+        payload = {"talk": talk_data}
+        response = (await self.http.post(url, json=payload, headers=headers)).json()
+        self.cache.invalidate(orgId, "workshops")
+        return response
+
+    async def create_recurring_occurrences(self, session_id: str, recurrence: str, start_time: str,
+                                           end_time: str, orgId: str, access_token: str,
+                                           timezone: str = None) -> dict:
+        """
+        Create every occurrence (talk) of a recurring schedule for a workshop.
+
+        The rule is expanded locally (see library.recurrence) and the talks
+        are created concurrently, TC_BULK_CONCURRENCY at a time and under
+        the org's rate limit.
+
+        Returns:
+            dict: {
+                "talkIds": ["1920...", ...],       # created talks, in schedule order
+                "results": [{"index": 0, "scheduledTime": ..., "status": "created", "talkId": ...}],
+                "created": 24, "failed": 0, "total": 24
+            }
+        """
+        windows = expand_occurrences(recurrence, start_time, end_time, timezone)
+
+        async def create_talk(window):
+            start_ms, end_ms = window
+            talk_data = {
+                "sessionId": session_id,
+                "scheduledTime": start_ms,
+                "scheduledEndTime": end_ms,
+                "durationTime": end_ms - start_ms
+            }
+            return await self.create_occurrence(talk_data, orgId, access_token)
+
+        responses = await map_bounded(create_talk, windows, rate_limiter=get_rate_limiter(orgId))
+
+        results = []
+        for index, ((start_ms, end_ms), response) in enumerate(zip(windows, responses)):
+            result = {"index": index, "scheduledTime": start_ms, "scheduledEndTime": end_ms}
+            talk = response.get("talk") if isinstance(response, dict) else None
+            talk_id = (talk.get("talkId") or talk.get("id")) if isinstance(talk, dict) else None
+            if talk_id:
+                result.update(status="created", talkId=talk_id)
+            else:
+                result.update(status="failed", error=str(response))
+            results.append(result)
+
+        created = [result["talkId"] for result in results if result["status"] == "created"]
+        return {
+            "talkIds": created,
+            "results": results,
+            "created": len(created),
+            "failed": len(results) - len(created),
+            "total": len(results)
+        }
+
+    async def update_occurrence(self, talk_id: str, updates: dict, orgId: str, access_token: str) -> dict:
+        """
+        Update or cancel a workshop occurrence.
+        """
+        url = f"{self.base_url}/{orgId}/talks/{talk_id}.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+
+        payload = {"talk": updates}
+        response = (await self.http.put(url, json=payload, headers=headers)).json()
+        self.cache.invalidate(orgId, "workshops")
+        return response
+
+    async def list_all_upcoming_workshops(self, orgId: str, access_token: str, filter_type: int = 5, limit: int = 50, si: int = 0) -> dict:
+        """
+        Fetch all upcoming global live workshops.
+        Uses: GET /talks.json?filter=&limit=&si=
+
+        The response lists the occurrences under "talks" (talkId, sessionId,
+        scheduledTime, ...) and the workshops they belong to under "sessions".
+        """
+        cache_key = self.cache.key(access_token, orgId, "workshops", f"{filter_type}:{limit}:{si}")
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        url = f"{self.base_url}/{orgId}/talks.json?filter={filter_type}&limit={limit}&si={si}"
+        headers = {
+            "Authorization": f"Bearer {access_token}"
+        }
+        response = await self.http.get(url, headers=headers)
+        workshops = response.json()
+        if response.status_code < 400:
+            self.cache.set(cache_key, workshops)
+        return workshops
+
+    def iter_upcoming_workshops(self, orgId: str, access_token: str, filter_type: int = 5,
+                                page_size: int = DEFAULT_PAGE_SIZE, si: int = 0,
+                                max_items: int = None) -> AsyncPaginator:
+        """
+        Lazily iterate upcoming global live workshops across all pages.
+        """
+        async def fetch_page(page_si, page_limit):
+            return await self.list_all_upcoming_workshops(orgId, access_token, filter_type, page_limit, page_si)
+
+        return AsyncPaginator(fetch_page, "sessions", page_size, si, max_items)
+
+    def iter_upcoming_talks(self, orgId: str, access_token: str, filter_type: int = 5,
+                            page_size: int = DEFAULT_PAGE_SIZE) -> AsyncPaginator:
+        """
+        Lazily iterate the occurrences (talks) listed by talks.json.
+        """
+        async def fetch_page(page_si, page_limit):
+            return await self.list_all_upcoming_workshops(orgId, access_token, filter_type, page_limit, page_si)
+
+        return AsyncPaginator(fetch_page, "talks", page_size)
+
+    async def update_occurrence_series(
+        self,
+        session_id: str,
+        orgId: str,
+        access_token: str,
+        shift_minutes: int = None,
+        move_to_weekday=None,
+        cancel_after: str = None,
+        from_time: str = None,
+        timezone: str = None,
+        inform_registrants: bool = True,
+        dry_run: bool = False,
+    ) -> dict:
+        """
+        Reschedule or cancel every future occurrence of one workshop.
+
+        The workshop's upcoming talks starting at or after `from_time` (default:
+        now) are collected first, their new times computed locally, and the
+        talks/<talkId>.json PUTs sent concurrently (TC_BULK_CONCURRENCY at a
+        time, within the org's rate limit), all with the same
+        `informRegistrants` value.
+
+        Args:
+            shift_minutes (int, optional): Move each talk by this many minutes.
+            move_to_weekday (optional): Move each talk to this weekday of its
+                week ("MO".."SU", a day name, or 0-6 with Monday = 0).
+            cancel_after (str, optional): Cancel every talk starting at or after
+                this "DD-MM-YYYY HH:MMAM/PM" time instead of moving them.
+            from_time (str, optional): Only touch talks from this time on.
+            timezone (str, optional): IANA zone for the times and weekday moves.
+            dry_run (bool): Only report the planned changes.
+
+        Returns:
+            dict: {
+                "results": [{"talkId", "scheduledTime", "newScheduledTime", "status"}],
+                "updated": 10, "cancelled": 0, "failed": 0, "total": 10
+            }
+        """
+        if cancel_after and (shift_minutes or move_to_weekday is not None):
+            raise ValueError("cancel_after cannot be combined with shift_minutes or move_to_weekday")
+        if not (cancel_after or shift_minutes or move_to_weekday is not None):
+            raise ValueError("Give shift_minutes, move_to_weekday or cancel_after")
+
+        earliest = to_millis(parse_local_datetime(from_time, timezone)) if from_time else int(time.time() * 1000)
+        if cancel_after:
+            earliest = max(earliest, to_millis(parse_local_datetime(cancel_after, timezone)))
+
+        plan = []
+        pages = self.iter_upcoming_talks(orgId, access_token)
+        async for talk in pages:
+            if str(talk.get("sessionId")) != str(session_id):
+                continue
+            start_ms = int(talk.get("scheduledTime") or 0)
+            end_ms = int(talk.get("scheduledEndTime") or start_ms)
+            if start_ms < earliest or talk.get("isCancelled") in (True, "true"):
+                continue
+            item = {"talkId": talk.get("talkId") or talk.get("id"), "scheduledTime": start_ms}
+            if cancel_after:
+                updates = {"isCancelled": True}
+            else:
+                new_start, new_end = reschedule_window(start_ms, end_ms, shift_minutes, move_to_weekday, timezone)
+                updates = {"scheduledTime": new_start, "scheduledEndTime": new_end}
+                item.update(newScheduledTime=new_start, newScheduledEndTime=new_end)
+            updates["informRegistrants"] = inform_registrants
+            plan.append((item, updates))
+        # An error body lists no talks; that must not read as "nothing to change".
+        if "talks" not in (pages.first_page or {}):
+            raise RuntimeError(f"Cannot list the talks of {orgId}: {pages.first_page}")
+
+        if dry_run:
+            return {"results": [{**item, "status": "planned"} for item, _ in plan], "total": len(plan)}
+
+        done_status = "cancelled" if cancel_after else "updated"
+
+        async def update(entry):
+            item, updates = entry
+            url = f"{self.base_url}/{orgId}/talks/{item['talkId']}.json"
+            headers = {
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {access_token}"
+            }
+            response = await self.http.put(url, json={"talk": updates}, headers=headers)
+            if response.status_code >= 400:
+                return {**item, "status": "failed", "error": response.text}
+            return {**item, "status": done_status}
+
+        outcomes = await map_bounded(update, plan, rate_limiter=get_rate_limiter(orgId))
+        self.cache.invalidate(orgId, "workshops")
+
+        results = [
+            outcome if isinstance(outcome, dict) else {**item, "status": "failed", "error": str(outcome)}
+            for (item, _), outcome in zip(plan, outcomes)
+        ]
+        done = sum(1 for result in results if result["status"] == done_status)
+        return {"results": results, done_status: done, "failed": len(results) - done, "total": len(results)}
+
+    async def invite_user_to_workshop(self, session_id: str, email: str, orgId: str, access_token: str, role: int = 3, source: int = 1) -> dict:
+        """
+        Invite / add a member (by email) to a course-linked live workshop / session.
+        """
+        url = f"{self.base_url}/{orgId}/sessionMembers.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        body = {
+            "sessionMembers": [
+                {
+                    "emailId": email,
+                    "sessionId": session_id,
+                    "role": role,
+                    "source": source
+                }
+            ]
+        }
+        resp = await self.http.post(url, json=body, headers=headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _post_session_members(self, session_id: str, recipients: list, orgId: str,
+                                    access_token: str, role: int, source: int) -> dict:
+        url = f"{self.base_url}/{orgId}/sessionMembers.json"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        body = {
+            "sessionMembers": [
+                {
+                    "emailId": recipient["email"],
+                    "sessionId": session_id,
+                    "role": role,
+                    "source": source
+                }
+                for recipient in recipients
+            ]
+        }
+        await get_rate_limiter(orgId).acquire()
+        resp = await self.http.post(url, json=body, headers=headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def invite_users_to_workshop_bulk(self, session_id: str, orgId: str, access_token: str,
+                                            recipients: list = None, csv_text: str = None,
+                                            role: int = 3, source: int = 1,
+                                            batch_size: int = None) -> dict:
+        """
+        Invite many members (by email) to a session.
+
+        Recipients are streamed from `recipients` and/or `csv_text` (see
+        library.recipients) and sent TC_INVITE_BATCH_SIZE per sessionMembers
+        request; batches go out concurrently under the org's rate limit. A
+        rejected batch is retried one member at a time so a single bad
+        address only fails itself.
+
+        Returns:
+            dict: {
+                "results": [{"email": ..., "status": "invited" | "failed" | "skipped", "error": ...}],
+                "invited": 1998, "failed": 1, "skipped": 1, "total": 2000
+            }
+        """
+        async def invite_one(recipient):
+            try:
+                await self._post_session_members(session_id, [recipient], orgId, access_token, role, source)
+            except httpx.HTTPError as e:
+                return {"email": recipient["email"], "status": "failed", "error": str(e)}
+            return {"email": recipient["email"], "status": "invited"}
+
+        async def send(batch):
+            valid = [recipient for recipient in batch if "error" not in recipient]
+            outcomes = {}
+            if len(valid) > 1:
+                try:
+                    await self._post_session_members(session_id, valid, orgId, access_token, role, source)
+                    outcomes = {recipient["email"]: {"email": recipient["email"], "status": "invited"}
+                                for recipient in valid}
+                except httpx.HTTPError:
+                    pass
+            for recipient in valid:
+                if recipient["email"] not in outcomes:
+                    outcomes[recipient["email"]] = await invite_one(recipient)
+            return [
+                outcomes.get(recipient["email"])
+                or {"email": recipient["email"], "status": "skipped", "error": recipient["error"]}
+                for recipient in batch
+            ]
+
+        batches = chunked(iter_recipients(recipients, csv_text), batch_size or INVITE_BATCH_SIZE)
+        results = []
+        for batch_results in await map_bounded(send, batches):
+            if isinstance(batch_results, BaseException):
+                raise batch_results
+            results.extend(batch_results)
+        return summarize(results)
@@ -0,0 +1,125 @@
+"""
+Non-blocking logging for the MCP server.
+
+configure_logging() routes every record through a QueueHandler, so request
+handlers only enqueue records; a QueueListener thread formats them and does
+the actual I/O. Request and response bodies go through log_payload(), which
+truncates them and logs the full body for only a sample of calls.
+
+Configuration (environment variables):
+    TC_LOG_LEVEL          root log level (default INFO)
+    TC_LOG_FORMAT         "text" (default) or "json" for one JSON object per line
+    TC_LOG_BODY_MAX_BYTES bodies longer than this are truncated (default 2048)
+    TC_LOG_BODY_SAMPLE    fraction of bodies logged in full, 0.0-1.0 (default 0.0)
+"""
+
+import os
+import queue
+import atexit
+import random
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+from . import json_utils
+
+BODY_MAX_BYTES = int(os.getenv("TC_LOG_BODY_MAX_BYTES", "2048"))
+BODY_SAMPLE_RATE = float(os.getenv("TC_LOG_BODY_SAMPLE", "0.0"))
+
+_listener = None
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Format each record as a single-line JSON object.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json_utils.dumps_str(entry)
+
+
+def configure_logging(level: str = None, fmt: str = None) -> QueueListener:
+    """
+    Install a queue-backed root handler and start its listener thread.
+
+    Safe to call more than once; later calls return the running listener.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    level = level or os.getenv("TC_LOG_LEVEL", "INFO")
+    fmt = fmt or os.getenv("TC_LOG_FORMAT", "text")
+
+    stream_handler = logging.StreamHandler()
+    if fmt == "json":
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """
+    Flush queued records and stop the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def log_payload(logger: logging.Logger, label: str, payload, level: int = logging.INFO) -> None:
+    """
+    Log a request/response body, truncated unless this call is sampled.
+
+    Nothing is encoded or copied when `level` is disabled for `logger`.
+
+    Args:
+        logger: Logger to write to.
+        label (str): Prefix, e.g. "MCP Response".
+        payload: bytes, str, or any JSON-serializable object.
+        level (int): Log level (default INFO).
+    """
+    if not logger.isEnabledFor(level):
+        return
+
+    if not isinstance(payload, (bytes, str)):
+        payload = json_utils.dumps(payload)
+    size = len(payload)
+
+    if size > BODY_MAX_BYTES and not (BODY_SAMPLE_RATE and random.random() < BODY_SAMPLE_RATE):
+        payload = payload[:BODY_MAX_BYTES]
+        suffix = f" ... [truncated, {size} bytes]"
+    else:
+        suffix = ""
+    if isinstance(payload, bytes):
+        payload = payload.decode(errors="replace")
+    logger.log(level, "%s: %s%s", label, payload, suffix)
+
+
+def redact_token(authorization: str) -> str:
+    """
+    Keep the auth scheme and the last characters of a token, drop the rest.
+    """
+    if not authorization:
+        return authorization
+    scheme, _, token = authorization.rpartition(" ")
+    masked = f"...{token[-4:]}" if len(token) > 8 else "***"
+    return f"{scheme} {masked}".strip()
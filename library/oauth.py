@@ -1,14 +1,27 @@
+import os
 import requests
+import httpx
 import logging
+from .http_client import get_http_client, get_async_http_client
+from .cache import get_response_cache
 
 logger = logging.getLogger(__name__)
 
+PORTALS_URL = f"{os.getenv('TC_API_BASE_URL', 'https://myacademy.trainercentral.in')}/api/v4/org/portals.json"
+
 
 def get_user_portals(access_token: str) -> dict:
     """
     Retrieve all portals (organizations) for the authenticated user.
+
+    Responses are cached per access token for the "portals" TTL.
     """
-    url = "https://myacademy.trainercentral.in/api/v4/org/portals.json"
+    cache = get_response_cache()
+    cache_key = cache.key(access_token, "", "portals")
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
@@ -16,7 +29,7 @@ def get_user_portals(access_token: str) -> dict:
 
     try:
         logger.info("Fetching user portals")
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = get_http_client().get(PORTALS_URL, headers=headers, timeout=10)
         resp.raise_for_status()
 
         data = resp.json()
@@ -24,6 +37,7 @@ def get_user_portals(access_token: str) -> dict:
         portals = data.get("portals", [])
         logger.info("Retrieved %d portals", len(portals))
 
+        cache.set(cache_key, data)
         return data
 
     except requests.RequestException as e:
@@ -31,6 +45,46 @@ def get_user_portals(access_token: str) -> dict:
         raise RuntimeError("Failed to retrieve portals") from e
 
 
+async def get_user_portals_async(access_token: str) -> dict:
+    """
+    Async version of get_user_portals(), sharing its cache.
+    """
+    cache = get_response_cache()
+    cache_key = cache.key(access_token, "", "portals")
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json"
+    }
+
+    try:
+        logger.info("Fetching user portals")
+        resp = await get_async_http_client().get(PORTALS_URL, headers=headers, timeout=10)
+        resp.raise_for_status()
+
+        data = resp.json()
+
+        portals = data.get("portals", [])
+        logger.info("Retrieved %d portals", len(portals))
+
+        cache.set(cache_key, data)
+        return data
+
+    except httpx.HTTPError as e:
+        logger.exception("Failed to get portals")
+        raise RuntimeError("Failed to retrieve portals") from e
+
+
+async def resolve_default_org_id(access_token: str) -> str:
+    """
+    Return the caller's default orgId, from cached portals when possible.
+    """
+    return extract_default_org_id(await get_user_portals_async(access_token))
+
+
 def extract_default_org_id(portals_data: dict) -> str:
     """
     Extract the default portal's orgId.
@@ -0,0 +1,155 @@
+"""
+Lazy pagination over TrainerCentral list endpoints.
+
+TrainerCentral pages its list APIs with `limit` (page size) and `si`
+(start index). AsyncPaginator walks such an endpoint item by item, keeping
+only one page in memory and fetching the next page while the current one
+is being consumed.
+
+MCP list tools return at most TC_TOOL_PAGE_SIZE items per call plus an
+opaque `nextCursor` that encodes where the next call should resume.
+"""
+
+import os
+import json
+import base64
+import asyncio
+import logging
+import binascii
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+TOOL_PAGE_SIZE = int(os.getenv("TC_TOOL_PAGE_SIZE", "25"))
+
+
+class AsyncPaginator:
+    """
+    Async iterator over the items of a si/limit paginated endpoint.
+
+    Usage:
+        async for course in AsyncPaginator(fetch_page, "courses"):
+            ...
+
+    Args:
+        fetch_page: coroutine function (si, limit) -> page dict.
+        items_key (str): key of the item list in each page, e.g. "courses".
+        page_size (int): `limit` sent upstream for every page.
+        start (int): `si` of the first item.
+        max_items (int, optional): stop after this many items.
+    """
+
+    def __init__(self, fetch_page, items_key: str, page_size: int = DEFAULT_PAGE_SIZE,
+                 start: int = 0, max_items: int = None):
+        self.fetch_page = fetch_page
+        self.items_key = items_key
+        self.page_size = page_size
+        self.start = start
+        self.max_items = max_items
+        self.first_page = None
+        self.pages_fetched = 0
+        self.next_si = start      # si of the first item not yet yielded
+        self.exhausted = False    # True once upstream returned a short page
+
+    async def __aiter__(self):
+        si = self.start
+        remaining = self.max_items
+        if remaining == 0:
+            return
+        limit = self._limit(remaining)
+        next_page = asyncio.ensure_future(self.fetch_page(si, limit))
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = None
+                self.pages_fetched += 1
+                if self.first_page is None:
+                    self.first_page = page
+
+                items = (page.get(self.items_key) or [])[:limit]
+                full_page = len(items) >= limit
+                si += len(items)
+                if remaining is not None:
+                    remaining -= len(items)
+
+                # Fetch the next page while this one is being consumed.
+                if full_page and remaining != 0:
+                    limit = self._limit(remaining)
+                    next_page = asyncio.ensure_future(self.fetch_page(si, limit))
+                else:
+                    self.exhausted = not full_page
+
+                for item in items:
+                    self.next_si += 1
+                    yield item
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def collect(self) -> list:
+        """
+        Read every remaining item into a list.
+        """
+        return [item async for item in self]
+
+    def _limit(self, remaining: int) -> int:
+        if remaining is None:
+            return self.page_size
+        return min(self.page_size, remaining)
+
+
+def encode_cursor(si: int, **filters) -> str:
+    """
+    Pack the upstream start index and the list filters into an opaque cursor.
+    """
+    state = json.dumps({"si": si, **filters}, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(state.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Reverse encode_cursor(). Raises ValueError for a malformed cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(state, dict) or not isinstance(state.get("si"), int):
+        raise ValueError("Invalid cursor")
+    return state
+
+
+def resolve_tool_page(cursor: str = None, limit: int = None, si: int = None, **filters) -> tuple:
+    """
+    Work out which window a list tool should return.
+
+    A cursor wins over `si` and the passed filters; `limit` is capped at
+    TOOL_PAGE_SIZE so every result stays small.
+
+    Returns:
+        tuple: (si, limit, filters)
+    """
+    if cursor:
+        state = decode_cursor(cursor)
+        si = state.pop("si")
+        filters.update(state)
+    page_limit = min(limit or TOOL_PAGE_SIZE, TOOL_PAGE_SIZE)
+    return si or 0, page_limit, filters
+
+
+async def collect_tool_page(pages: AsyncPaginator, items_key: str, **filters) -> dict:
+    """
+    Read one bounded window from `pages` into a tool result.
+
+    The first upstream page's fields (meta, categories, ...) are kept, its
+    item list is replaced by the window, and `nextCursor` is added while
+    upstream may have more items.
+    """
+    items = await pages.collect()
+
+    response = dict(pages.first_page or {})
+    response[items_key] = items
+    if not pages.exhausted:
+        response["nextCursor"] = encode_cursor(pages.next_si, **filters)
+    return response
@@ -0,0 +1,53 @@
+"""
+Progress reporting for multi-step TrainerCentral operations.
+
+Library code calls report_progress() after each upstream step. Outside a
+streaming tool call nothing is listening and the call is a no-op; inside
+one, the MCP server has bound a reporter that forwards each step to the
+client as a `notifications/progress` message.
+
+The reporter is held in a context variable, so it follows the tool call
+into awaited coroutines and (via contextvars.copy_context) into the worker
+thread of a sync handler. Reporters must be safe to call from any thread.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+_reporter = contextvars.ContextVar("tc_progress_reporter", default=None)
+
+
+def report_progress(progress: float, total: float = None, message: str = None) -> None:
+    """
+    Report that `progress` of `total` steps are done.
+
+    Args:
+        progress (float): Steps completed so far; must increase with every call.
+        total (float, optional): Total number of steps, if known.
+        message (str, optional): Human-readable description of the step.
+    """
+    reporter = _reporter.get()
+    if reporter is not None:
+        reporter(progress, total, message)
+
+
+def current_reporter():
+    """
+    Return the reporter bound for the current context, or None.
+
+    Lets an operation that runs several progress-reporting steps in parallel
+    bind its own reporter per step and combine them into the outer one.
+    """
+    return _reporter.get()
+
+
+@contextmanager
+def progress_reporter(reporter):
+    """
+    Bind `reporter(progress, total, message)` for the current context.
+    """
+    token = _reporter.set(reporter)
+    try:
+        yield
+    finally:
+        _reporter.reset(token)
@@ -0,0 +1,110 @@
+"""
+Recipient lists for bulk invitations.
+
+iter_recipients() turns either a list (of emails or of dicts) or CSV text
+into a stream of normalized recipients, reading the CSV row by row so a
+large cohort is never held twice in memory. Duplicate emails are dropped
+and malformed ones are yielded with an "error" so they can be reported
+per recipient rather than failing the whole batch.
+
+CSV input needs an "email" column; "first_name"/"firstName" and
+"last_name"/"lastName" columns are optional.
+
+Configuration (environment variables):
+    TC_INVITE_MAX_RECIPIENTS  largest accepted recipient list (default 5000)
+"""
+
+import io
+import os
+import csv
+import re
+from itertools import islice
+
+INVITE_MAX_RECIPIENTS = int(os.getenv("TC_INVITE_MAX_RECIPIENTS", "5000"))
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _normalize(entry) -> dict:
+    if isinstance(entry, str):
+        entry = {"email": entry}
+    if not isinstance(entry, dict):
+        return {"email": str(entry), "error": "Recipient must be an email or an object"}
+    email = (entry.get("email") or entry.get("emailId") or "").strip()
+    recipient = {
+        "email": email,
+        "first_name": (entry.get("first_name") or entry.get("firstName") or "").strip(),
+        "last_name": (entry.get("last_name") or entry.get("lastName") or "").strip(),
+    }
+    if not _EMAIL_RE.match(email):
+        recipient["error"] = "Invalid email"
+    return recipient
+
+
+def _entries(recipients: list, csv_text: str):
+    yield from recipients or []
+    if csv_text:
+        for row in csv.DictReader(io.StringIO(csv_text)):
+            yield {key.strip(): value for key, value in row.items() if key}
+
+
+def _unique(entries):
+    seen = set()
+    for entry in entries:
+        recipient = _normalize(entry)
+        key = recipient["email"].lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        yield recipient
+
+
+def iter_recipients(recipients: list = None, csv_text: str = None):
+    """
+    Return an iterator of normalized recipients from `recipients` and/or
+    `csv_text`.
+
+    The input is validated before the iterator is returned, so a bad
+    list fails before the first invitation is sent; the CSV is then read
+    a second time, row by row, as the iterator is consumed.
+
+    Yields:
+        dict: {"email", "first_name", "last_name"} plus "error" when the
+        entry cannot be invited.
+
+    Raises:
+        ValueError: the CSV has no "email" column, or more than
+        TC_INVITE_MAX_RECIPIENTS recipients are given.
+    """
+    if csv_text:
+        fields = {name.strip() for name in csv.DictReader(io.StringIO(csv_text)).fieldnames or []}
+        if "email" not in fields and "emailId" not in fields:
+            raise ValueError("CSV needs an 'email' column")
+
+    count = sum(1 for _ in islice(_unique(_entries(recipients, csv_text)), INVITE_MAX_RECIPIENTS + 1))
+    if count > INVITE_MAX_RECIPIENTS:
+        raise ValueError(f"Too many recipients (max {INVITE_MAX_RECIPIENTS})")
+
+    return _unique(_entries(recipients, csv_text))
+
+
+def chunked(iterable, size: int):
+    """
+    Yield lists of up to `size` items, reading `iterable` lazily.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def summarize(results: list) -> dict:
+    """
+    Count per-recipient outcomes.
+    """
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return {"results": results, **counts, "total": len(results)}
@@ -0,0 +1,133 @@
+"""
+Recurring schedule expansion and rescheduling for workshop occurrences.
+
+A schedule is an RFC 5545 recurrence rule (as accepted by
+dateutil.rrule.rrulestr) plus the start and end of the first occurrence in
+the "DD-MM-YYYY HH:MMAM/PM" format used everywhere else in this library.
+Occurrences are expanded in local wall-clock time, so "every Tuesday 6PM"
+stays at 6PM across daylight-saving changes, and only then converted to
+epoch milliseconds.
+
+Examples of rules:
+    "FREQ=WEEKLY;BYDAY=TU,TH;COUNT=24"
+    "FREQ=DAILY;INTERVAL=2;UNTIL=20260301T000000"
+    "FREQ=DAILY;UNTIL=20260301T000000Z"     # UNTIL must be UTC when a timezone is given
+
+reschedule_window() moves an existing occurrence (by minutes and/or to
+another weekday) with the same wall-clock rules.
+"""
+
+from datetime import datetime, timedelta
+from itertools import islice
+
+from dateutil import tz
+from dateutil.rrule import rrulestr
+
+from library.concurrency import BULK_MAX_ITEMS
+
+
+def parse_local_datetime(value: str, timezone: str = None) -> datetime:
+    """
+    Parse "DD-MM-YYYY HH:MMAM/PM" into a datetime.
+
+    Naive (server local time) unless `timezone` names an IANA zone,
+    e.g. "Asia/Kolkata".
+    """
+    date_str, time_str = value.split()
+    day, month, year = map(int, date_str.split('-'))
+    time_obj = datetime.strptime(time_str, "%I:%M%p")
+    parsed = datetime(year, month, day, time_obj.hour, time_obj.minute)
+    if timezone:
+        zone = tz.gettz(timezone)
+        if zone is None:
+            raise ValueError(f"Unknown timezone: {timezone}")
+        parsed = parsed.replace(tzinfo=zone)
+    return parsed
+
+
+def to_millis(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+def expand_occurrences(rule: str, start_time: str, end_time: str, timezone: str = None,
+                       max_occurrences: int = None) -> list:
+    """
+    Expand a recurrence rule into occurrence windows.
+
+    Args:
+        rule (str): RFC 5545 RRULE, with or without the "RRULE:" prefix.
+        start_time (str): Start of the first occurrence, "DD-MM-YYYY HH:MMAM/PM".
+        end_time (str): End of the first occurrence; sets every occurrence's duration.
+        timezone (str, optional): IANA zone the times are given in.
+        max_occurrences (int, optional): Cap (default TC_BULK_MAX_ITEMS).
+
+    Returns:
+        list: [(start_ms, end_ms), ...] in chronological order.
+
+    Raises:
+        ValueError: malformed input, end before start, or more occurrences
+        than the cap (including rules without COUNT or UNTIL).
+    """
+    cap = max_occurrences or BULK_MAX_ITEMS
+    start = parse_local_datetime(start_time, timezone)
+    end = parse_local_datetime(end_time, timezone)
+    duration = end - start
+    if duration.total_seconds() <= 0:
+        raise ValueError("end_time must be after start_time")
+
+    rule = rule.strip()
+    if rule.upper().startswith("RRULE:"):
+        rule = rule[len("RRULE:"):]
+    try:
+        recurrence = rrulestr(rule, dtstart=start)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence rule: {e}") from e
+
+    starts = list(islice(recurrence, cap + 1))
+    if len(starts) > cap:
+        raise ValueError(f"Recurrence yields more than {cap} occurrences; add COUNT or UNTIL")
+    if not starts:
+        raise ValueError("Recurrence yields no occurrences")
+
+    return [(to_millis(occurrence), to_millis(occurrence + duration)) for occurrence in starts]
+
+
+WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+
+def parse_weekday(value) -> int:
+    """
+    Accept "TU", "tuesday", 1 or "1" (Monday = 0) and return the weekday number.
+    """
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, int) and 0 <= value <= 6:
+        return value
+    key = str(value).strip().upper()[:2]
+    if key not in WEEKDAYS:
+        raise ValueError(f"Unknown weekday: {value}")
+    return WEEKDAYS[key]
+
+
+def reschedule_window(start_ms: int, end_ms: int, shift_minutes: int = None, weekday=None,
+                      timezone: str = None) -> tuple:
+    """
+    Move one occurrence, keeping its duration.
+
+    `weekday` moves it to that day of the same Monday-based week;
+    `shift_minutes` then moves it by a number of minutes. Both apply in
+    local wall-clock time of `timezone` (server local time by default).
+
+    Returns:
+        tuple: (start_ms, end_ms)
+    """
+    zone = tz.gettz(timezone) if timezone else tz.tzlocal()
+    if zone is None:
+        raise ValueError(f"Unknown timezone: {timezone}")
+    start = datetime.fromtimestamp(start_ms / 1000, tz=zone)
+    duration = timedelta(milliseconds=end_ms - start_ms)
+    if weekday is not None:
+        start += timedelta(days=parse_weekday(weekday) - start.weekday())
+    if shift_minutes:
+        start += timedelta(minutes=shift_minutes)
+    return to_millis(start), to_millis(start + duration)
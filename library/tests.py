@@ -1,7 +1,7 @@
 
 import os
-import requests
-from .oauth import ZohoOAuth
+from .http_client import get_http_client, get_async_http_client
+# from .oauth import ZohoOAuth
 
 
 class TrainerCentralTests:
@@ -23,6 +23,7 @@ class TrainerCentralTests:
     def __init__(self):
         tc_api = os.getenv("TC_API_BASE_URL")
         self.base_url = f"{tc_api}/api/v4"
+        self.http = get_http_client()
 
     def create_test_form(self, session_id: str, name: str, description_html: str) -> dict:
         """
@@ -65,7 +66,7 @@ class TrainerCentralTests:
             }
         }
 
-        return requests.post(url, json=body, headers=headers).json()
+        return self.http.post(url, json=body, headers=headers).json()
 
     def add_questions(self, session_id: str, form_id_value: str, questions_body: dict) -> dict:
         """
@@ -98,7 +99,7 @@ class TrainerCentralTests:
             "Authorization": f"Bearer {self.oauth.get_access_token()}",
         }
 
-        return requests.post(url, json=questions_body, headers=headers).json()
+        return self.http.post(url, json=questions_body, headers=headers).json()
 
     def create_full_test(self, session_id: str, name: str, description_html: str, questions_body: dict) -> dict:
         """
@@ -140,4 +141,65 @@ class TrainerCentralTests:
             "questions": questions_resp
         }
 
-    
\ No newline at end of file
+    
+
+class AsyncTrainerCentralTests:
+    """
+    Async version of TrainerCentralTests, for callers running on an event loop.
+    Takes the org and the caller's token like the other async wrappers.
+    """
+
+    def __init__(self):
+        tc_api = os.getenv("TC_API_BASE_URL")
+        self.base_url = f"{tc_api}/api/v4"
+        self.http = get_async_http_client()
+
+    async def create_test_form(self, session_id: str, name: str, description_html: str,
+                               orgId: str, access_token: str) -> dict:
+        """
+        STEP 1 — Create a test form; the response carries "form.formIdValue".
+        """
+        url = f"{self.base_url}/{orgId}/session/{session_id}/forms.json?type=3"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        }
+        body = {
+            "form": {
+                "name": name,
+                "description": description_html,
+                "sessionId": session_id,
+                "type": 3  # Test
+            }
+        }
+        return (await self.http.post(url, json=body, headers=headers)).json()
+
+    async def add_questions(self, session_id: str, form_id_value: str, questions_body: dict,
+                            orgId: str, access_token: str) -> dict:
+        """
+        STEP 2 — Add questions ({"field": [...]}) to the test form.
+        """
+        url = f"{self.base_url}/{orgId}/session/{session_id}/form/{form_id_value}/fields.json?type=3"
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {access_token}",
+        }
+        return (await self.http.post(url, json=questions_body, headers=headers)).json()
+
+    async def create_full_test(self, session_id: str, name: str, description_html: str,
+                               questions_body: dict, orgId: str, access_token: str) -> dict:
+        """
+        Create the form, then add its questions.
+        """
+        form_resp = await self.create_test_form(session_id, name, description_html, orgId, access_token)
+        form_id_value = (form_resp.get("form") or {}).get("formIdValue")
+        if not form_id_value:
+            raise RuntimeError(
+                f"Could not extract formIdValue from form response: {form_resp}"
+            )
+
+        questions_resp = await self.add_questions(session_id, form_id_value, questions_body, orgId, access_token)
+        return {
+            "form": form_resp,
+            "questions": questions_resp
+        }
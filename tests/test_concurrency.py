@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+
+from library.concurrency import run_dag, map_bounded, gather_bounded
+
+
+def node(deps=(), result=None, error=None, delay=0.0, log=None, key=None):
+    async def func(results):
+        if log is not None:
+            log.append((key, dict(results)))
+        await asyncio.sleep(delay)
+        if error:
+            raise RuntimeError(error)
+        return result
+    return (tuple(deps), func)
+
+
+class RunDagTests(unittest.IsolatedAsyncioTestCase):
+    async def test_dependencies_run_first_and_see_results(self):
+        log = []
+        outcomes = await run_dag({
+            "a": node(result=1, log=log, key="a"),
+            "b": node(("a",), result=2, log=log, key="b"),
+            "c": node(("a", "b"), result=3, log=log, key="c"),
+        })
+        self.assertEqual({k: o["result"] for k, o in outcomes.items()}, {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(log, [("a", {}), ("b", {"a": 1}), ("c", {"a": 1, "b": 2})])
+
+    async def test_failure_skips_only_its_dependents(self):
+        outcomes = await run_dag({
+            "a": node(error="boom"),
+            "b": node(("a",)),
+            "c": node(("b",)),
+            "d": node(result="independent"),
+            "e": node(("d",), result="also fine"),
+        })
+        self.assertEqual(outcomes["a"], {"status": "failed", "error": "boom"})
+        self.assertEqual(outcomes["b"], {"status": "skipped", "error": "dependency a failed"})
+        self.assertEqual(outcomes["c"], {"status": "skipped", "error": "dependency a failed"})
+        self.assertEqual(outcomes["e"], {"status": "done", "result": "also fine"})
+
+    async def test_node_with_a_failed_and_a_done_dependency_is_skipped_once(self):
+        finished = []
+        outcomes = await run_dag({
+            "a": node(error="boom", delay=0.01),
+            "b": node(result=1),
+            "c": node(("a", "b")),
+        }, on_done=lambda key, outcome: finished.append(key))
+        self.assertEqual(outcomes["c"]["status"], "skipped")
+        self.assertEqual(sorted(finished), ["a", "b", "c"])
+
+    async def test_cycle_fails_before_anything_runs(self):
+        log = []
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            await run_dag({
+                "start": node(log=log, key="start"),
+                "a": node(("b",), log=log, key="a"),
+                "b": node(("a",), log=log, key="b"),
+            })
+        self.assertEqual(log, [])
+
+    async def test_unknown_dependency_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "unknown node"):
+            await run_dag({"a": node(("missing",))})
+
+    async def test_limit_caps_running_nodes(self):
+        running = 0
+        peak = 0
+
+        async def func(results):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await run_dag({str(i): ((), func) for i in range(8)}, limit=3)
+        self.assertEqual(peak, 3)
+
+
+class BoundedFanOutTests(unittest.IsolatedAsyncioTestCase):
+    async def test_map_bounded_returns_exceptions_in_order(self):
+        async def func(item):
+            if item == 2:
+                raise ValueError("two")
+            return item * 10
+
+        results = await map_bounded(func, iter(range(4)), limit=2)
+        self.assertEqual(results[:2] + results[3:], [0, 10, 30])
+        self.assertIsInstance(results[2], ValueError)
+
+    async def test_gather_bounded_caps_concurrency(self):
+        running = 0
+        peak = 0
+
+        async def work():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        await gather_bounded([work for _ in range(6)], limit=2)
+        self.assertEqual(peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from library import course_archive
+from library.course_archive import (
+    ArchivePayloads,
+    ArchiveWriter,
+    AsyncCourseCloner,
+    AsyncCourseImporter,
+    archive_path,
+    iter_archive,
+    open_archive,
+    spec_from_archive,
+)
+
+SPEC = {
+    "course": {"courseName": "Course"},
+    "chapters": [
+        {"name": "One", "lessons": [
+            {"name": "L1", "content_html": "<p>1</p>", "tests": [{"name": "Quiz"}]},
+            {"name": "L2", "contents": [{"content_html": "<p>2a</p>"}, {"content_html": "<p>2b</p>"}]},
+        ]},
+        {"name": "Two", "lessons": [{"name": "L3"}]},
+    ],
+    "lessons": [{"name": "Loose"}],
+}
+
+
+def write_archive(path: str, orgId: str = "111") -> None:
+    with ArchiveWriter(path) as writer:
+        writer.write({"type": "archive", "version": course_archive.ARCHIVE_VERSION, "courseId": "c1",
+                      "orgId": orgId, "exportedAt": 0})
+        writer.write({"type": "course", "data": {"courseName": "Course", "courseId": "c1", "views": 3}})
+        writer.write({"type": "section", "data": {"sectionId": "s1", "name": "One"}})
+        writer.write({"type": "section", "data": {"sectionId": "s2", "name": "Two"}})
+        writer.write({"type": "session", "data": {"sessionId": "a", "sectionId": "s1", "name": "L1"}})
+        writer.write({"type": "session", "data": {"sessionId": "live", "sectionId": "s1", "name": "Live",
+                                                  "deliveryMode": 3}})
+        writer.write({"type": "session", "data": {"sessionId": "b", "sectionId": "s1", "name": "L2"}})
+        writer.write({"type": "session", "data": {"sessionId": "c", "sectionId": "s2", "name": "L3"}})
+        writer.write({"type": "session", "data": {"sessionId": "d", "name": "Loose"}})
+        writer.write({"type": "content", "sessionId": "b", "data": {"richTextContent": "<p>2</p>"}})
+        writer.write({"type": "content", "sessionId": "a", "data": {"richTextContent": "<p>1</p>",
+                                                                    "fileName": "Intro"}})
+        writer.write({"type": "test", "sessionId": "a", "form": {"name": "Quiz"}, "fields": [{"label": "Q"}]})
+        writer.write({"type": "error", "sessionId": "c", "error": "files.json: 500"})
+        writer.write({"type": "end", "counts": {}})
+
+
+class ArchivePathTests(unittest.TestCase):
+    def test_names_stay_inside_the_portal_directory(self):
+        with mock.patch.object(course_archive, "EXPORT_DIR", "/exports"):
+            self.assertEqual(archive_path("../../etc/passwd", "111"), "/exports/111/passwd.ndjson.gz")
+            self.assertEqual(archive_path("x.ndjson.gz", "../222"), "/exports/222/x.ndjson.gz")
+            for name, org in (("", "111"), ("x", ""), ("x", "..")):
+                with self.assertRaises(ValueError):
+                    archive_path(name, org)
+
+
+class OpenArchiveTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patches = [
+            mock.patch.object(course_archive, "EXPORT_DIR", self.tmp.name),
+            mock.patch.object(course_archive, "get_user_portals_async",
+                              mock.AsyncMock(return_value={"portals": [{"id": "111"}, {"id": "222"}]})),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        write_archive(archive_path("course", "111"))
+
+    async def test_own_portal_archive_opens(self):
+        path = await open_archive("course", "111", "token")
+        self.assertEqual(next(iter_archive(path))["courseId"], "c1")
+
+    async def test_other_portals_are_refused(self):
+        with self.assertRaisesRegex(ValueError, "Not one of your portals"):
+            await open_archive("course", "333", "token")
+        with self.assertRaisesRegex(ValueError, "No archive"):
+            await open_archive("course", "222", "token")
+
+    async def test_archive_moved_to_another_portal_is_refused(self):
+        os.makedirs(os.path.dirname(archive_path("copy", "222")))
+        os.replace(archive_path("course", "111"), archive_path("copy", "222"))
+        with self.assertRaisesRegex(ValueError, "not exported from portal 222"):
+            await open_archive("copy", "222", "token")
+
+
+class ImporterPlanTests(unittest.TestCase):
+    def setUp(self):
+        self.importer = AsyncCourseImporter()
+
+    def test_chapters_and_lessons_are_chained(self):
+        deps = {key: deps for key, (deps, _) in self.importer.plan(SPEC, "o", "t").items()}
+        self.assertEqual(deps["course"], ())
+        self.assertEqual(deps["chapter:0"], ("course",))
+        self.assertEqual(deps["chapter:1"], ("course", "chapter:0"))
+        self.assertEqual(deps["lesson:0:0"], ("chapter:0",))
+        self.assertEqual(deps["lesson:0:1"], ("chapter:0", "lesson:0:0"))
+        self.assertEqual(deps["lesson:-:0"], ("course",))
+        self.assertEqual(deps["content:0:0:0"], ("lesson:0:0",))
+        self.assertEqual(deps["test:0:0:0"], ("lesson:0:0",))
+        self.assertEqual([k for k in deps if k.startswith("content:0:1:")], ["content:0:1:0", "content:0:1:1"])
+
+    def test_course_name_is_required(self):
+        with self.assertRaises(ValueError):
+            self.importer.plan({"course": {}}, "o", "t")
+
+
+class ImporterRunTests(unittest.IsolatedAsyncioTestCase):
+    async def test_error_bodies_are_failures(self):
+        importer = AsyncCourseImporter()
+        ids = iter(range(100))
+
+        async def post_course(data, orgId, access_token):
+            return {"course": {"courseId": "new"}}
+
+        async def create_chapter(data, orgId, access_token):
+            return {"section": {"sectionId": f"s{next(ids)}"}}
+
+        async def create_session(data, orgId, access_token):
+            return {}, f"l{next(ids)}"
+
+        async def upload_content(session_id, html, filename, orgId, access_token):
+            return {"error": "quota"} if html == "<p>2b</p>" else {"file": {}}
+
+        async def create_full_test(session_id, name, description, questions, orgId, access_token):
+            return {"form": {}, "questions": {"errors": ["bad field"]}}
+
+        importer.courses.post_course = post_course
+        importer.chapters.create_chapter = create_chapter
+        importer.lessons.create_session = create_session
+        importer.lessons.upload_content = upload_content
+        importer.tests.create_full_test = create_full_test
+
+        result = await importer.import_course(SPEC, "o", "t")
+        self.assertEqual(result["courseId"], "new")
+        self.assertEqual(sorted(f["step"] for f in result["failures"]), ["content:0:1:1", "test:0:0:0"])
+        self.assertEqual((result["failed"], result["skipped"]), (2, 0))
+
+
+class StreamedImportTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "course.ndjson.gz")
+        write_archive(self.path)
+        self.importer = AsyncCourseImporter()
+
+    def test_spec_keeps_export_errors_and_drops_live_workshops(self):
+        spec = spec_from_archive(self.path)
+        self.assertEqual([lesson["name"] for lesson in spec["chapters"][0]["lessons"]], ["L1", "L2"])
+        self.assertEqual(spec["chapters"][1]["lessons"][0]["exportError"], "files.json: 500")
+
+    def test_streamed_plan_matches_the_spec_plan(self):
+        spec_nodes = self.importer.plan(spec_from_archive(self.path), "o", "t")
+        with ArchivePayloads() as payloads:
+            archive_nodes = self.importer.plan_archive(self.path, "o", "t", payloads)
+        self.assertEqual({k: deps for k, (deps, _) in archive_nodes.items()},
+                         {k: deps for k, (deps, _) in spec_nodes.items()})
+        self.assertIn("export:1:0", archive_nodes)
+
+    def test_payloads_are_stored_once_per_record(self):
+        with ArchivePayloads() as payloads:
+            ref = payloads.store(3, {"html": "<p>x</p>"})
+            self.assertEqual(payloads.store(3, {"html": "ignored"}), ref)
+            payloads.store(4, {"html": "<p>y</p>"})
+            self.assertEqual(payloads.load(ref), {"html": "<p>x</p>"})
+
+    async def test_export_error_fails_the_import_without_blocking_the_lesson(self):
+        created = []
+
+        async def post_course(data, orgId, access_token):
+            return {"course": {"courseId": "new"}}
+
+        async def create_chapter(data, orgId, access_token):
+            return {"section": {"sectionId": data["name"]}}
+
+        async def create_session(data, orgId, access_token):
+            created.append(data["name"])
+            return {}, data["name"]
+
+        async def upload_content(session_id, html, filename, orgId, access_token):
+            return {"file": {}}
+
+        async def create_full_test(session_id, name, description, questions, orgId, access_token):
+            return {"form": {}, "questions": {}}
+
+        self.importer.courses.post_course = post_course
+        self.importer.chapters.create_chapter = create_chapter
+        self.importer.lessons.create_session = create_session
+        self.importer.lessons.upload_content = upload_content
+        self.importer.tests.create_full_test = create_full_test
+
+        result = await self.importer.import_archive(self.path, "o", "t", course_overrides={"courseName": "Copy"})
+        self.assertEqual(sorted(created), ["L1", "L2", "L3", "Loose"])
+        self.assertEqual([f["step"] for f in result["failures"]], ["export:1:0"])
+
+
+class CloneTests(unittest.IsolatedAsyncioTestCase):
+    async def test_numeric_portal_ids_are_accepted(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        portals = {"portals": [{"id": 111}, {"id": 222}, {"id": 333}]}
+        patches = [
+            mock.patch.object(course_archive, "EXPORT_DIR", tmp.name),
+            mock.patch.object(course_archive, "get_user_portals_async", mock.AsyncMock(return_value=portals)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        async def export_course(courseId, orgId, access_token, path):
+            write_archive(path, orgId)
+            return {"counts": {}}
+
+        async def import_archive(path, orgId, access_token, course_overrides=None, payloads=None):
+            return {"courseId": f"copy-{orgId}", "failed": 0}
+
+        cloner = AsyncCourseCloner()
+        cloner.exporter.export_course = export_course
+        cloner.importer.import_archive = import_archive
+        result = await cloner.clone_course("c1", "111", ["222", 333], "token")
+        self.assertEqual(result["targets"]["333"]["courseId"], "copy-333")
+        self.assertEqual((result["cloned"], result["failed"]), (2, 0))
+        with self.assertRaisesRegex(ValueError, "Not one of your portals: 444"):
+            await cloner.clone_course("c1", "111", ["444"], "token")
+
+
+if __name__ == "__main__":
+    unittest.main()
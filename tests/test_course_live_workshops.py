@@ -0,0 +1,33 @@
+import unittest
+
+import httpx
+
+from library.course_live_workshops import AsyncTrainerCentralLiveWorkshops
+
+ANSWERS = {
+    "ok@example.com": (200, {"courseAttendee": {}}),
+    "denied@example.com": (403, {"message": "forbidden"}),
+    "quota@example.com": (200, {"error": {"message": "quota exceeded"}}),
+}
+
+
+class InviteLearnersBulkTests(unittest.IsolatedAsyncioTestCase):
+    async def test_http_status_and_error_bodies_are_failures(self):
+        workshops = AsyncTrainerCentralLiveWorkshops()
+
+        async def post(url, json=None, headers=None):
+            status, body = ANSWERS[json["courseAttendee"]["email"]]
+            return httpx.Response(status, json=body, request=httpx.Request("POST", url))
+
+        workshops.http = type("FakeClient", (), {"post": staticmethod(post)})()
+        result = await workshops.invite_learners_bulk(
+            "o", "t", recipients=list(ANSWERS) + ["not-an-email"], courseId="c1"
+        )
+        statuses = {r["email"]: r["status"] for r in result["results"]}
+        self.assertEqual(statuses, {"ok@example.com": "invited", "denied@example.com": "failed",
+                                    "quota@example.com": "failed", "not-an-email": "skipped"})
+        self.assertEqual((result["invited"], result["failed"], result["skipped"]), (1, 2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
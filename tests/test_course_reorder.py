@@ -0,0 +1,88 @@
+import random
+import unittest
+
+from library.course_reorder import longest_increasing_subsequence, plan_moves
+
+
+def apply_moves(current: dict, moves: list) -> dict:
+    lists = {container: list(items) for container, items in current.items()}
+    for item, container, index, _ in moves:
+        for items in lists.values():
+            if item in items:
+                items.remove(item)
+        lists[container].insert(index, item)
+    return lists
+
+
+class LongestIncreasingSubsequenceTests(unittest.TestCase):
+    def test_positions_of_a_longest_run(self):
+        values = [3, 1, 4, 1, 5, 9, 2, 6]
+        positions = longest_increasing_subsequence(values)
+        self.assertEqual(len(positions), 4)
+        picked = [values[p] for p in positions]
+        self.assertEqual(picked, sorted(set(picked)))
+        self.assertEqual(positions, sorted(positions))
+
+    def test_edge_cases(self):
+        self.assertEqual(longest_increasing_subsequence([]), [])
+        self.assertEqual(len(longest_increasing_subsequence([2, 2, 2])), 1)
+        self.assertEqual(longest_increasing_subsequence([0, 1, 2]), [0, 1, 2])
+        self.assertEqual(len(longest_increasing_subsequence([5, 4, 3, 2, 1])), 1)
+
+
+class PlanMovesTests(unittest.TestCase):
+    def test_same_order_needs_no_moves(self):
+        self.assertEqual(plan_moves({"s": ["a", "b", "c"]}, {"s": ["a", "b", "c"]}), [])
+
+    def test_one_displaced_item_is_one_move(self):
+        current = {"s": ["a", "b", "c", "d", "e"]}
+        target = {"s": ["a", "c", "d", "b", "e"]}
+        moves = plan_moves(current, target)
+        self.assertEqual(moves, [("b", "s", 3, False)])
+        self.assertEqual(apply_moves(current, moves), target)
+
+    def test_reversal_moves_all_but_one(self):
+        current = {"s": list("abcdef")}
+        target = {"s": list("fedcba")}
+        moves = plan_moves(current, target)
+        self.assertEqual(len(moves), 5)
+        self.assertEqual(apply_moves(current, moves), target)
+
+    def test_items_change_container(self):
+        current = {"s1": ["a", "b"], "s2": ["c"]}
+        target = {"s1": ["a"], "s2": ["b", "c"]}
+        moves = plan_moves(current, target)
+        self.assertEqual(moves, [("b", "s2", 0, True)])
+        self.assertEqual(apply_moves(current, moves), target)
+
+    def test_invalid_targets_are_rejected(self):
+        current = {"s": ["a", "b"]}
+        for target, message in (({"s": ["a", "z"]}, "Unknown item"),
+                                ({"s": ["a", "a"]}, "listed twice"),
+                                ({"x": ["a"]}, "Unknown container")):
+            with self.assertRaisesRegex(ValueError, message):
+                plan_moves(current, target)
+
+    def test_random_shuffles_reach_the_target_with_minimal_moves(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            items = [f"i{n}" for n in range(rng.randint(0, 12))]
+            containers = [f"s{n}" for n in range(rng.randint(1, 3))]
+            current = {c: [] for c in containers}
+            target = {c: [] for c in containers}
+            for item in items:
+                current[rng.choice(containers)].append(item)
+            shuffled = items[:]
+            rng.shuffle(shuffled)
+            for item in shuffled:
+                target[rng.choice(containers)].append(item)
+
+            moves = plan_moves(current, target)
+            self.assertEqual(apply_moves(current, moves), target)
+            if len(containers) == 1:
+                kept = longest_increasing_subsequence([target[containers[0]].index(i) for i in items])
+                self.assertEqual(len(moves), len(items) - len(kept))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from library.course_archive import lesson_contents
+from library.course_sync import AsyncCourseSync, content_hash
+
+TREE = {
+    "course": {"courseName": "Course", "courseId": "c1"},
+    "sections": [{"sectionId": "s1", "name": "One"}, {"sectionId": "s2", "name": "Old"}],
+    "sessions": [
+        {"sessionId": "a", "sectionId": "s1", "name": "L1"},
+        {"sessionId": "b", "sectionId": "s2", "name": "L2"},
+    ],
+}
+
+
+class ContentHelperTests(unittest.TestCase):
+    def test_content_html_comes_before_contents(self):
+        lesson = {"content_html": "<p>main</p>", "contents": [{"content_html": "<p>extra</p>"}]}
+        self.assertEqual([c["content_html"] for c in lesson_contents(lesson)], ["<p>main</p>", "<p>extra</p>"])
+        self.assertEqual(lesson_contents(lesson)[0]["content_filename"], "Content")
+        self.assertEqual(lesson_contents({"name": "empty"}), [])
+
+    def test_hash_ignores_surrounding_whitespace(self):
+        self.assertEqual(content_hash(" <p>x</p>\n"), content_hash("<p>x</p>"))
+        self.assertEqual(content_hash(None), content_hash(""))
+        self.assertNotEqual(content_hash("<p>x</p>"), content_hash("<p>y</p>"))
+
+
+class SyncPlanTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sync = AsyncCourseSync()
+        self.files = {}
+
+        async def fetch_tree(courseId, orgId, access_token):
+            return TREE
+
+        async def lesson_files(session_id, orgId, access_token):
+            return self.files.get(session_id, [])
+
+        self.sync.fetch_tree = fetch_tree
+        self.sync._lesson_files = lesson_files
+
+    async def plan(self, spec, prune=False):
+        steps, nodes = await self.sync.plan("c1", spec, "o", "t", prune)
+        return {step["step"]: step for step in steps}, {key: deps for key, (deps, _) in nodes.items()}
+
+    async def test_matching_spec_plans_nothing(self):
+        steps, _ = await self.plan({
+            "course": {"courseName": "Course"},
+            "chapters": [{"name": "One", "lessons": [{"name": "L1"}]},
+                         {"name": "Old", "lessons": [{"name": "L2"}]}],
+        })
+        self.assertEqual(steps, {})
+
+    async def test_existing_contents_are_kept_and_spare_files_reused(self):
+        self.files["a"] = [
+            {"fileId": "f1", "richTextContent": "<p>b</p>"},
+            {"fileId": "f2", "richTextContent": "<p>stale</p>"},
+        ]
+        steps, _ = await self.plan({"chapters": [{"name": "One", "lessons": [{
+            "name": "L1",
+            "contents": [{"content_html": "<p>a</p>"}, {"content_html": " <p>b</p> "}, {"content_html": "<p>c</p>"}],
+        }]}]})
+        self.assertEqual({key: step["op"] for key, step in steps.items()},
+                         {"content:0:0:0": "update_content", "content:0:0:2": "upload_content"})
+
+    async def test_new_lessons_are_chained_per_chapter(self):
+        steps, deps = await self.plan({"chapters": [
+            {"name": "One", "lessons": [{"name": "L1"}, {"name": "N1"}, {"name": "N2", "content_html": "<p>x</p>"}]},
+            {"name": "New", "lessons": [{"name": "N3"}, {"name": "N4"}]},
+        ]})
+        self.assertEqual(deps["create_lesson:0:1"], ())
+        self.assertEqual(deps["create_lesson:0:2"], ("create_lesson:0:1",))
+        self.assertEqual(deps["content:0:2:0"], ("create_lesson:0:2",))
+        self.assertEqual(deps["create_lesson:1:0"], ("create_chapter:1",))
+        self.assertEqual(deps["create_lesson:1:1"], ("create_chapter:1", "create_lesson:1:0"))
+
+    async def test_new_chapters_are_chained(self):
+        _, deps = await self.plan({"chapters": [
+            {"name": "One"}, {"name": "New 1"}, {"name": "New 2"}, {"name": "Old"}, {"name": "New 3"},
+        ]})
+        self.assertEqual(deps["create_chapter:1"], ())
+        self.assertEqual(deps["create_chapter:2"], ("create_chapter:1",))
+        self.assertEqual(deps["create_chapter:4"], ("create_chapter:2",))
+
+    async def test_prune_deletes_a_chapter_after_its_lessons_move_out(self):
+        steps, deps = await self.plan({"chapters": [
+            {"name": "One", "lessons": [{"name": "L1"}, {"sessionId": "b"}]},
+        ]}, prune=True)
+        self.assertEqual(steps["update_lesson:0:1"]["fields"], ["sectionId"])
+        self.assertEqual(deps["delete_chapter:s2"], ("update_lesson:0:1",))
+        self.assertNotIn("delete_lesson:b", steps)
+
+    async def test_unknown_ids_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "sessionId zz"):
+            await self.plan({"lessons": [{"sessionId": "zz"}]})
+        with self.assertRaisesRegex(ValueError, "sectionId zz"):
+            await self.plan({"chapters": [{"sectionId": "zz"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+
+from library.lessons import AsyncTrainerCentralLessons
+
+
+class CreateLessonsBulkTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.lessons = AsyncTrainerCentralLessons()
+        self.created = []
+        self.uploads_in_flight = 0
+        self.max_uploads_in_flight = 0
+
+        async def create_session(session_data, orgId, access_token):
+            if session_data["name"] == "bad":
+                raise RuntimeError("create failed")
+            self.created.append(session_data["name"])
+            return {"session": {"id": session_data["name"]}}, session_data["name"]
+
+        async def upload_content(session_id, content_html, content_filename, orgId, access_token):
+            self.uploads_in_flight += 1
+            self.max_uploads_in_flight = max(self.max_uploads_in_flight, self.uploads_in_flight)
+            try:
+                await asyncio.sleep(0.01)
+                if content_html == "fail":
+                    raise RuntimeError("upload failed")
+                if content_html == "rejected":
+                    return {"error": {"message": "quota exceeded"}}
+                return {"file": session_id}
+            finally:
+                self.uploads_in_flight -= 1
+
+        self.lessons.create_session = create_session
+        self.lessons.upload_content = upload_content
+
+    def lesson(self, name, html="<p>x</p>"):
+        return {"session_data": {"name": name, "courseId": "c1"}, "content_html": html}
+
+    async def test_sessions_are_created_in_order(self):
+        names = [f"l{i}" for i in range(10)]
+        result = await self.lessons.create_lessons_bulk([self.lesson(n) for n in names], "o", "t")
+        self.assertEqual(self.created, names)
+        self.assertEqual([r["sessionId"] for r in result["results"]], names)
+        self.assertEqual(result["created"], 10)
+
+    async def test_uploads_are_bounded(self):
+        await self.lessons.create_lessons_bulk([self.lesson(f"l{i}") for i in range(10)], "o", "t", concurrency=2)
+        self.assertLessEqual(self.max_uploads_in_flight, 2)
+
+    async def test_failures_are_reported_per_item(self):
+        result = await self.lessons.create_lessons_bulk(
+            [self.lesson("a"), self.lesson("bad"), self.lesson("c", "fail"), {"session_data": {}}], "o", "t"
+        )
+        self.assertEqual([r["status"] for r in result["results"]], ["created", "failed", "partial", "failed"])
+        self.assertEqual((result["created"], result["partial"], result["failed"]), (1, 1, 2))
+
+    async def test_error_body_from_upload_is_partial(self):
+        result = await self.lessons.create_lessons_bulk([self.lesson("a", "rejected")], "o", "t")
+        self.assertEqual(result["results"][0]["status"], "partial")
+        self.assertIn("quota exceeded", result["results"][0]["error"])
+        self.assertEqual((result["created"], result["partial"]), (0, 1))
+
+    async def test_empty_request_is_rejected(self):
+        with self.assertRaises(ValueError):
+            await self.lessons.create_lessons_bulk([], "o", "t")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import time
+import unittest
+
+from library.live_workshops import AsyncTrainerCentralLiveWorkshops
+
+HOUR_MS = 3600 * 1000
+
+
+class UpdateOccurrenceSeriesTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.workshops = AsyncTrainerCentralLiveWorkshops()
+        now = int(time.time() * 1000)
+        self.talks = [
+            {"talkId": "t1", "sessionId": "w1", "scheduledTime": now - HOUR_MS, "scheduledEndTime": now},
+            {"talkId": "t2", "sessionId": "w1", "scheduledTime": now + HOUR_MS, "scheduledEndTime": now + 2 * HOUR_MS},
+            {"talkId": "t3", "sessionId": "w2", "scheduledTime": now + HOUR_MS, "scheduledEndTime": now + 2 * HOUR_MS},
+            {"talkId": "t4", "sessionId": "w1", "scheduledTime": now + 3 * HOUR_MS,
+             "scheduledEndTime": now + 4 * HOUR_MS, "isCancelled": True},
+        ]
+
+        async def list_all_upcoming_workshops(orgId, access_token, filter_type=5, limit=50, si=0):
+            return {"talks": self.talks[si:si + limit], "sessions": []}
+
+        self.workshops.list_all_upcoming_workshops = list_all_upcoming_workshops
+
+    async def test_plans_only_future_talks_of_the_workshop(self):
+        result = await self.workshops.update_occurrence_series("w1", "o", "t", shift_minutes=30, dry_run=True)
+        self.assertEqual([r["talkId"] for r in result["results"]], ["t2"])
+        planned = result["results"][0]
+        self.assertEqual(planned["newScheduledTime"] - planned["scheduledTime"], HOUR_MS // 2)
+
+    async def test_response_without_talks_raises(self):
+        async def list_all_upcoming_workshops(orgId, access_token, filter_type=5, limit=50, si=0):
+            return {"error": "unauthorized"}
+
+        self.workshops.list_all_upcoming_workshops = list_all_upcoming_workshops
+        with self.assertRaisesRegex(RuntimeError, "Cannot list the talks"):
+            await self.workshops.update_occurrence_series("w1", "o", "t", shift_minutes=30, dry_run=True)
+
+    async def test_conflicting_or_missing_changes_are_rejected(self):
+        with self.assertRaises(ValueError):
+            await self.workshops.update_occurrence_series("w1", "o", "t", dry_run=True)
+        with self.assertRaises(ValueError):
+            await self.workshops.update_occurrence_series(
+                "w1", "o", "t", shift_minutes=30, cancel_after="01-01-2030 10:00AM", dry_run=True
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
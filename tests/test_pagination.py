@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+
+import httpx
+
+from library.courses import AsyncTrainerCentralCourses
+from library.pagination import AsyncPaginator, encode_cursor, decode_cursor, resolve_tool_page
+
+
+def fake_endpoint(total: int, cap: int = None):
+    """
+    A si/limit endpoint over `total` items that returns at most `cap` per page.
+    """
+    calls = []
+
+    async def fetch_page(si, limit):
+        calls.append((si, limit))
+        size = min(limit, cap) if cap else limit
+        return {"items": list(range(si, min(si + size, total))), "meta": {"si": si}}
+
+    return fetch_page, calls
+
+
+class AsyncPaginatorTests(unittest.IsolatedAsyncioTestCase):
+    async def test_reads_every_page_until_a_short_one(self):
+        fetch_page, calls = fake_endpoint(23)
+        pages = AsyncPaginator(fetch_page, "items", page_size=10)
+        self.assertEqual(await pages.collect(), list(range(23)))
+        self.assertEqual(calls, [(0, 10), (10, 10), (20, 10)])
+        self.assertTrue(pages.exhausted)
+        self.assertEqual(pages.first_page["meta"], {"si": 0})
+
+    async def test_exact_multiple_ends_on_an_empty_page(self):
+        fetch_page, calls = fake_endpoint(20)
+        pages = AsyncPaginator(fetch_page, "items", page_size=10)
+        self.assertEqual(len(await pages.collect()), 20)
+        self.assertEqual(calls[-1], (20, 10))
+        self.assertTrue(pages.exhausted)
+
+    async def test_page_size_above_upstream_cap_stops_early(self):
+        # Why access requests are paged at courseMembers.json's cap of 15.
+        fetch_page, _ = fake_endpoint(100, cap=15)
+        self.assertEqual(len(await AsyncPaginator(fetch_page, "items", page_size=50).collect()), 15)
+        fetch_page, _ = fake_endpoint(100, cap=15)
+        self.assertEqual(len(await AsyncPaginator(fetch_page, "items", page_size=15).collect()), 100)
+
+    async def test_max_items_limits_the_last_request(self):
+        fetch_page, calls = fake_endpoint(100)
+        pages = AsyncPaginator(fetch_page, "items", page_size=10, start=5, max_items=15)
+        self.assertEqual(await pages.collect(), list(range(5, 20)))
+        self.assertEqual(calls, [(5, 10), (15, 5)])
+        self.assertFalse(pages.exhausted)
+        self.assertEqual(pages.next_si, 20)
+
+    async def test_max_items_zero_makes_no_call(self):
+        fetch_page, calls = fake_endpoint(100)
+        self.assertEqual(await AsyncPaginator(fetch_page, "items", max_items=0).collect(), [])
+        self.assertEqual(calls, [])
+
+    async def test_missing_items_key_ends_iteration(self):
+        async def fetch_page(si, limit):
+            return {"error": "unauthorized"}
+
+        pages = AsyncPaginator(fetch_page, "items")
+        self.assertEqual(await pages.collect(), [])
+        self.assertEqual(pages.first_page, {"error": "unauthorized"})
+
+    async def test_breaking_out_cancels_the_prefetched_page(self):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fetch_page(si, limit):
+            if si == 0:
+                return {"items": list(range(limit))}
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        pages = AsyncPaginator(fetch_page, "items", page_size=5)
+        iterator = pages.__aiter__()
+        await iterator.__anext__()
+        await started.wait()
+        await iterator.aclose()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+
+class AccessRequestPagingTests(unittest.IsolatedAsyncioTestCase):
+    async def test_bulk_respond_sees_every_pending_request(self):
+        courses = AsyncTrainerCentralCourses()
+        members = [{"courseMembersId": str(i), "emailId": f"u{i}@example.com"} for i in range(40)]
+
+        async def view_course_access_requests(courseId, orgId, access_token, limit=15, si=0):
+            return {"courseMembers": members[si:si + min(limit, 15)]}
+
+        courses.view_course_access_requests = view_course_access_requests
+        result = await courses.bulk_respond_to_access_requests("c1", "o", "t", 2, all_pending=True, dry_run=True)
+        self.assertEqual((result["pending"], result["matched"]), (40, 40))
+
+    async def test_requests_without_an_id_are_never_sent(self):
+        courses = AsyncTrainerCentralCourses()
+        sent = []
+
+        async def view_course_access_requests(courseId, orgId, access_token, limit=15, si=0):
+            return {"courseMembers": [{"courseMembersId": "7", "emailId": "a@example.com"},
+                                      {"emailId": "b@example.com"}][si:]}
+
+        async def respond_to_access_request(member_id, orgId, access_token, responseStatus):
+            sent.append(member_id)
+            return httpx.Response(200, json={})
+
+        courses.view_course_access_requests = view_course_access_requests
+        courses._respond_to_access_request = respond_to_access_request
+        result = await courses.bulk_respond_to_access_requests("c1", "o", "t", 2, all_pending=True)
+        self.assertEqual(sent, ["7"])
+        self.assertEqual([r["status"] for r in result["results"]], ["accepted", "failed"])
+        self.assertEqual((result["accepted"], result["failed"]), (1, 1))
+
+
+class CursorTests(unittest.TestCase):
+    def test_round_trip(self):
+        cursor = encode_cursor(40, courseId="c1")
+        self.assertEqual(decode_cursor(cursor), {"si": 40, "courseId": "c1"})
+        self.assertEqual(resolve_tool_page(cursor=cursor, si=3), (40, resolve_tool_page()[1], {"courseId": "c1"}))
+
+    def test_malformed_cursor_is_rejected(self):
+        for cursor in ("%%%", encode_cursor(1)[:-2] + "!!", "eyJmb28iOjF9"):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from unittest import mock
+
+from library import recipients
+from library.recipients import iter_recipients, chunked, summarize
+
+
+class IterRecipientsTests(unittest.TestCase):
+    def test_list_and_csv_are_normalized_and_deduplicated(self):
+        csv_text = "email,firstName,last_name\nb@example.com,Bo,B\nA@example.com,Dup,\n"
+        result = list(iter_recipients(["a@example.com", {"emailId": "c@example.com"}], csv_text))
+        self.assertEqual([r["email"] for r in result], ["a@example.com", "c@example.com", "b@example.com"])
+        self.assertEqual(result[2]["first_name"], "Bo")
+        self.assertEqual(result[2]["last_name"], "B")
+
+    def test_malformed_entries_are_yielded_with_an_error(self):
+        result = list(iter_recipients(["not-an-email", 42]))
+        self.assertEqual([r["error"] for r in result], ["Invalid email", "Recipient must be an email or an object"])
+
+    def test_csv_without_email_column_fails_before_iteration(self):
+        with self.assertRaisesRegex(ValueError, "email"):
+            iter_recipients(["a@example.com"], "name\nBo\n")
+
+    def test_too_many_recipients_fails_before_iteration(self):
+        with mock.patch.object(recipients, "INVITE_MAX_RECIPIENTS", 2):
+            with self.assertRaisesRegex(ValueError, "Too many"):
+                iter_recipients(["a@example.com", "b@example.com"], "email\nc@example.com\n")
+            # Duplicates do not count against the cap.
+            self.assertEqual(len(list(iter_recipients(["a@example.com", "A@example.com", "b@example.com"]))), 2)
+
+
+class ChunkedTests(unittest.TestCase):
+    def test_chunks_are_read_lazily(self):
+        consumed = []
+
+        def items():
+            for i in range(5):
+                consumed.append(i)
+                yield i
+
+        chunks = chunked(items(), 2)
+        self.assertEqual(next(chunks), [0, 1])
+        self.assertEqual(consumed, [0, 1])
+        self.assertEqual(list(chunks), [[2, 3], [4]])
+
+
+class SummarizeTests(unittest.TestCase):
+    def test_counts_by_status(self):
+        summary = summarize([{"status": "invited"}, {"status": "skipped"}, {"status": "invited"}])
+        self.assertEqual((summary["invited"], summary["skipped"], summary["total"]), (2, 1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from datetime import datetime
+
+from dateutil import tz
+
+from library.recurrence import expand_occurrences, reschedule_window, parse_local_datetime, to_millis, parse_weekday
+
+NEW_YORK = "America/New_York"
+HOUR_MS = 3600 * 1000
+DAY_MS = 24 * HOUR_MS
+
+
+def local(ms: int, timezone: str = NEW_YORK) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=tz.gettz(timezone))
+
+
+class ExpandOccurrencesTests(unittest.TestCase):
+    def test_wall_clock_time_is_kept_across_dst(self):
+        # US daylight saving time starts on 8 March 2026.
+        windows = expand_occurrences("FREQ=WEEKLY;BYDAY=TU;COUNT=3", "03-03-2026 06:00PM", "03-03-2026 07:30PM",
+                                     NEW_YORK)
+        starts = [local(start) for start, _ in windows]
+        self.assertEqual([(s.month, s.day, s.hour, s.minute) for s in starts],
+                         [(3, 3, 18, 0), (3, 10, 18, 0), (3, 17, 18, 0)])
+        self.assertEqual(windows[1][0] - windows[0][0], 7 * DAY_MS - HOUR_MS)
+        self.assertEqual(windows[2][0] - windows[1][0], 7 * DAY_MS)
+        self.assertTrue(all(end - start == 90 * 60 * 1000 for start, end in windows))
+
+    def test_rrule_prefix_and_until(self):
+        windows = expand_occurrences("RRULE:FREQ=DAILY;INTERVAL=2;UNTIL=20260110T235959Z", "01-01-2026 09:00AM",
+                                     "01-01-2026 10:00AM", "UTC")
+        self.assertEqual([local(start, "UTC").day for start, _ in windows], [1, 3, 5, 7, 9])
+
+    def test_unbounded_or_oversized_rules_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "COUNT or UNTIL"):
+            expand_occurrences("FREQ=DAILY", "01-01-2026 09:00AM", "01-01-2026 10:00AM", "UTC", max_occurrences=10)
+        with self.assertRaisesRegex(ValueError, "more than 10"):
+            expand_occurrences("FREQ=DAILY;COUNT=11", "01-01-2026 09:00AM", "01-01-2026 10:00AM", "UTC",
+                               max_occurrences=10)
+        self.assertEqual(len(expand_occurrences("FREQ=DAILY;COUNT=10", "01-01-2026 09:00AM", "01-01-2026 10:00AM",
+                                                "UTC", max_occurrences=10)), 10)
+
+    def test_invalid_input_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "after start_time"):
+            expand_occurrences("FREQ=DAILY;COUNT=2", "01-01-2026 10:00AM", "01-01-2026 09:00AM", "UTC")
+        with self.assertRaisesRegex(ValueError, "Invalid recurrence rule"):
+            expand_occurrences("FREQ=SOMETIMES", "01-01-2026 09:00AM", "01-01-2026 10:00AM", "UTC")
+        with self.assertRaisesRegex(ValueError, "Unknown timezone"):
+            expand_occurrences("FREQ=DAILY;COUNT=2", "01-01-2026 09:00AM", "01-01-2026 10:00AM", "Mars/Olympus")
+
+
+class RescheduleWindowTests(unittest.TestCase):
+    def window(self, value: str, minutes: int = 60) -> tuple:
+        start = to_millis(parse_local_datetime(value, NEW_YORK))
+        return start, start + minutes * 60 * 1000
+
+    def test_weekday_move_keeps_wall_clock_time_across_dst(self):
+        # Friday 6 March 2026 (EST) to Sunday 8 March (EDT) of the same week.
+        start, end = self.window("06-03-2026 06:00PM")
+        new_start, new_end = reschedule_window(start, end, weekday="SU", timezone=NEW_YORK)
+        moved = local(new_start)
+        self.assertEqual((moved.day, moved.hour, moved.minute), (8, 18, 0))
+        self.assertEqual(new_start - start, 2 * DAY_MS - HOUR_MS)
+        self.assertEqual(new_end - new_start, HOUR_MS)
+
+    def test_weekday_move_stays_in_the_same_monday_based_week(self):
+        start, end = self.window("08-03-2026 06:00PM")      # a Sunday
+        new_start, _ = reschedule_window(start, end, weekday=0, timezone=NEW_YORK)
+        self.assertEqual(local(new_start).day, 2)
+
+    def test_shift_is_in_wall_clock_minutes(self):
+        start, end = self.window("07-03-2026 06:00PM", 90)
+        new_start, new_end = reschedule_window(start, end, shift_minutes=24 * 60, timezone=NEW_YORK)
+        self.assertEqual((local(new_start).day, local(new_start).hour), (8, 18))
+        self.assertEqual(new_end - new_start, 90 * 60 * 1000)
+
+    def test_weekday_then_shift(self):
+        start, end = self.window("03-03-2026 06:00PM")      # a Tuesday
+        new_start, _ = reschedule_window(start, end, shift_minutes=-30, weekday="TH", timezone=NEW_YORK)
+        moved = local(new_start)
+        self.assertEqual((moved.day, moved.hour, moved.minute), (5, 17, 30))
+
+
+class ParseWeekdayTests(unittest.TestCase):
+    def test_accepted_forms(self):
+        self.assertEqual([parse_weekday(v) for v in ("TU", "tuesday", 1, " Fr ", "0", " 6 ")], [1, 1, 1, 4, 0, 6])
+        for value in ("someday", "7", 7, "-1"):
+            with self.assertRaises(ValueError):
+                parse_weekday(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
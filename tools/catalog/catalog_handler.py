@@ -0,0 +1,45 @@
+"""
+Catalog tools answered from the local mirror (see library.catalog_mirror).
+"""
+
+from library.catalog_mirror import get_catalog_mirror
+
+
+async def tc_query_catalog(
+    orgId: str,
+    access_token: str,
+    kind: str = "courses",
+    name_contains: str = None,
+    courseId: str = None,
+    without_lessons: bool = False,
+    limit: int = 25,
+    refresh: bool = False,
+) -> dict:
+    """
+    Search the portal's courses, chapters, lessons or upcoming workshops from a
+    local mirror, in milliseconds.
+
+    Examples:
+        Find a course by topic:        kind="courses", name_contains="kubernetes"
+        Courses with no lessons:       kind="courses", without_lessons=True
+        Lessons of one course:         kind="sessions", courseId="..."
+
+    Args:
+        kind (str): "courses", "sections", "sessions" or "workshops".
+        name_contains (str, optional): Case-insensitive name filter.
+        courseId (str, optional): Only rows of this course.
+        without_lessons (bool): Courses only; those without lessons.
+        limit (int): Max rows (default 25, max 200).
+        refresh (bool): Refresh the mirror from TrainerCentral before answering.
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: {<kind>: [...], "truncated": bool,
+               "mirror": {"refreshedAt", "ageSeconds", "stale", "refreshing", ...}}
+        Use refresh=True or the live tools when "stale" is true.
+    """
+    mirror = get_catalog_mirror()
+    if mirror is None:
+        raise ValueError("The catalog mirror is disabled on this server (TC_MIRROR_PATH is not set)")
+    return await mirror.query(orgId, access_token, kind, name_contains, courseId, without_lessons, limit, refresh)
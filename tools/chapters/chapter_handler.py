@@ -2,14 +2,14 @@
 FastMCP tools that expose TrainerCentral chapter (section) APIs.
 """
 
-from library.chapters import TrainerCentralChapters
+from library.chapters import AsyncTrainerCentralChapters
 from tools.mcp_registry import mcp  
 
-tc = TrainerCentralChapters()
+tc = AsyncTrainerCentralChapters()
 
 
 #@mcp.tool()
-def tc_create_chapter(section_data: dict, orgId: str, access_token: str) -> dict:
+async def tc_create_chapter(section_data: dict, orgId: str, access_token: str) -> dict:
     """
     Create a new chapter (section) under a course in TrainerCentral.
 
@@ -46,11 +46,11 @@ def tc_create_chapter(section_data: dict, orgId: str, access_token: str) -> dict
             - lastUpdatedTime
             - status
     """
-    return tc.create_chapter(section_data, orgId, access_token)
+    return await tc.create_chapter(section_data, orgId, access_token)
 
 
 #@mcp.tool()
-def tc_update_chapter(courseId: str, section_id: str, updates: dict, orgId: str, access_token: str) -> dict:
+async def tc_update_chapter(courseId: str, section_id: str, updates: dict, orgId: str, access_token: str) -> dict:
     """
     Update an existing chapter's name and/or position in a course.
 
@@ -90,11 +90,11 @@ def tc_update_chapter(courseId: str, section_id: str, updates: dict, orgId: str,
     Returns:
         dict: API response containing the updated chapter (section) object.
     """
-    return tc.update_chapter(courseId, section_id, updates, orgId, access_token)
+    return await tc.update_chapter(courseId, section_id, updates, orgId, access_token)
 
 
 #@mcp.tool()
-def tc_delete_chapter(courseId: str, section_id: str, orgId: str, access_token: str) -> dict:
+async def tc_delete_chapter(courseId: str, section_id: str, orgId: str, access_token: str) -> dict:
     """
     Delete a chapter from a course in TrainerCentral.
 
@@ -122,4 +122,4 @@ def tc_delete_chapter(courseId: str, section_id: str, orgId: str, access_token:
         dict: API delete response (may be an empty object or status details,
               depending on TrainerCentral's response format).
     """
-    return tc.delete_chapter(courseId, section_id, orgId, access_token)
+    return await tc.delete_chapter(courseId, section_id, orgId, access_token)
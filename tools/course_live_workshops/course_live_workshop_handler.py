@@ -3,13 +3,14 @@ FastMCP tools that expose TrainerCentral live workshop / session inside the cour
 """
 
 from tools.mcp_registry import mcp
-from library.course_live_workshops import TrainerCentralLiveWorkshops
+from library.course_live_workshops import AsyncTrainerCentralLiveWorkshops
+from library.pagination import resolve_tool_page, collect_tool_page
 
-tc_live = TrainerCentralLiveWorkshops()
+tc_live = AsyncTrainerCentralLiveWorkshops()
 
 
 #@mcp.tool()
-def tc_create_course_live_session(
+async def tc_create_course_live_session(
     courseId: str,
     name: str,
     description_html: str,
@@ -27,7 +28,7 @@ def tc_create_course_live_session(
     The system automatically converts start_time and end_time using DateConverter.
     """
 
-    return tc_live.create_course_live_workshop(
+    return await tc_live.create_course_live_workshop(
         orgId=orgId,  # FIXED: Pass orgId first
         access_token=access_token,  # FIXED: Pass access_token second
         courseId=courseId,
@@ -39,12 +40,13 @@ def tc_create_course_live_session(
 
 
 #@mcp.tool()
-def tc_list_course_live_sessions(
+async def tc_list_course_live_sessions(
     orgId: str,  # FIXED: Added orgId
     access_token: str,  # FIXED: Added access_token
     filter_type: int = 5,
-    limit: int = 50,
-    si: int = 0
+    limit: int = None,
+    si: int = 0,
+    cursor: str = None
 ) -> dict:
     """
     List upcoming live workshop sessions, inside the course alone.
@@ -57,17 +59,20 @@ def tc_list_course_live_sessions(
 
     Args:
         filter_type (int): Filter for sessions (e.g., 1=your upcoming, 5=all upcoming).
-        limit (int): Number of sessions to fetch.
+        limit (int): Number of sessions to fetch, capped at TC_TOOL_PAGE_SIZE.
         si (int): Start index for pagination.
+        cursor (str): `nextCursor` from a previous call, to get the next page.
 
     Returns:
-        dict: API response with sessions list.
+        dict: API response with sessions list, plus `nextCursor` when more exist.
     """
-    return tc_live.list_upcoming_live_sessions(orgId, access_token, filter_type, limit, si)
+    si, limit, filters = resolve_tool_page(cursor, limit, si, filter=filter_type)
+    pages = tc_live.iter_upcoming_live_sessions(orgId, access_token, filters["filter"], si=si, max_items=limit)
+    return await collect_tool_page(pages, "sessions", **filters)
 
 
 #@mcp.tool()
-def tc_delete_course_live_session(
+async def tc_delete_course_live_session(
     session_id: str,
     orgId: str,  # FIXED: Added orgId
     access_token: str  # FIXED: Added access_token
@@ -87,11 +92,11 @@ def tc_delete_course_live_session(
     Returns:
         dict: API response for the delete operation.
     """
-    return tc_live.delete_live_session(session_id, orgId, access_token)
+    return await tc_live.delete_live_session(session_id, orgId, access_token)
 
 
 #@mcp.tool()
-def invite_learner_to_course_or_course_live_session(
+async def invite_learner_to_course_or_course_live_session(
     email: str,
     first_name: str,
     last_name: str,
@@ -117,7 +122,7 @@ def invite_learner_to_course_or_course_live_session(
         }
     }
     """
-    return tc_live.invite_learner_to_course_or_course_live_session(
+    return await tc_live.invite_learner_to_course_or_course_live_session(
         email=email,
         orgId=orgId,  # FIXED: Added orgId
         access_token=access_token,  # FIXED: Added access_token
@@ -128,4 +133,36 @@ def invite_learner_to_course_or_course_live_session(
         is_access_granted=is_access_granted,
         expiry_time=expiry_time,
         expiry_duration=expiry_duration
-    )
\ No newline at end of file
+    )
+
+
+async def tc_invite_learners_bulk(
+    orgId: str,
+    access_token: str,
+    recipients: list = None,
+    csv_text: str = None,
+    courseId: str = None,
+    session_id: str = None,
+    is_access_granted: bool = True,
+    expiry_time: int = None,
+    expiry_duration: str = None
+) -> dict:
+    """
+    Invite many learners to a COURSE or COURSE LIVE WORKSHOP in one call.
+
+    Args:
+        recipients (list, optional): [{"email", "first_name", "last_name"}] or plain emails.
+        csv_text (str, optional): CSV with "email", "first_name" and "last_name" columns.
+        courseId (str, optional): Course to invite into.
+        session_id (str, optional): Course live workshop to invite into.
+        is_access_granted (bool): Grant access immediately (default True).
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: per-recipient "results" plus "invited" / "failed" / "skipped" counts.
+    """
+    return await tc_live.invite_learners_bulk(
+        orgId, access_token, recipients, csv_text, courseId, session_id,
+        is_access_granted, expiry_time, expiry_duration
+    )
@@ -2,14 +2,32 @@
 FastMCP tools that expose TrainerCentral course APIs.
 """
 
-from library.courses import TrainerCentralCourses
+import os
+import time
+
+from library.courses import AsyncTrainerCentralCourses
+from library.course_archive import (
+    AsyncCourseExporter,
+    AsyncCourseImporter,
+    AsyncCourseCloner,
+    archive_path,
+    open_archive,
+)
+from library.course_sync import AsyncCourseSync
+from library.course_reorder import AsyncCourseReorder
+from library.pagination import resolve_tool_page, collect_tool_page
 from tools.mcp_registry import mcp 
 
-tc = TrainerCentralCourses()
+tc = AsyncTrainerCentralCourses()
+exporter = AsyncCourseExporter(tc)
+importer = AsyncCourseImporter()
+cloner = AsyncCourseCloner(exporter, importer)
+syncer = AsyncCourseSync()
+reorderer = AsyncCourseReorder()
 
 
 #@mcp.tool()
-def tc_create_course(course_data: dict, orgId: str, access_token: str) -> dict:
+async def tc_create_course(course_data: dict, orgId: str, access_token: str) -> dict:
     """
     Create a new course in TrainerCentral.
 
@@ -90,7 +108,7 @@ def tc_create_course(course_data: dict, orgId: str, access_token: str) -> dict:
             - ticket
             - course
     """
-    return tc.post_course(course_data, orgId, access_token)
+    return await tc.post_course(course_data, orgId, access_token)
 
 
 #@mcp.tool()
@@ -191,21 +209,22 @@ def tc_create_course(course_data: dict, orgId: str, access_token: str) -> dict:
 
 
 # #@mcp.tool()
-def tc_list_courses(orgId: str, access_token: str, limit: int = None, si: int = None) -> dict:
+async def tc_list_courses(orgId: str, access_token: str, limit: int = None, si: int = None, cursor: str = None) -> dict:
     """
-    List all courses (or a paginated subset).
+    List courses one page at a time.
 
     Syntax:
         tc_list_courses(orgId, access_token)
-        tc_list_courses(orgId, access_token, limit=30)
         tc_list_courses(orgId, access_token, limit=20, si=10)
+        tc_list_courses(orgId, access_token, cursor="<nextCursor from previous call>")
         
 
     Note:
         Note: Provide orgId and access token of the user, after OAuth, as parameters.  
         TrainerCentral uses `limit` and `si` as query parameters.
-        Current implementation returns all courses — pagination support
-        can be added later.
+        Each call returns at most TC_TOOL_PAGE_SIZE courses (default 25).
+        When more exist the result has a `nextCursor`; pass it back as
+        `cursor` to get the next page.
 
     Required OAuth scope:
         TrainerCentral.courseapi.READ
@@ -215,8 +234,11 @@ def tc_list_courses(orgId: str, access_token: str, limit: int = None, si: int =
             - courses []
             - courseCategories []
             - meta { totalCourseCount }
+            - nextCursor (only when more courses exist)
     """
-    return tc.list_courses(orgId, access_token)
+    si, limit, _ = resolve_tool_page(cursor, limit, si)
+    pages = tc.iter_courses(orgId, access_token, si=si, max_items=limit)
+    return await collect_tool_page(pages, "courses")
 
 
 # def tc_list_courses_with_widget(orgId: str, access_token: str, limit=None, si=None):
@@ -250,9 +272,9 @@ def tc_list_courses(orgId: str, access_token: str, limit: int = None, si: int =
 #     }
 # }
 
-def tc_list_courses_with_widget(orgId: str, access_token: str, limit=None, si=None):
-    # call TrainerCentral API
-    courses_response = tc.list_courses(orgId, access_token)
+async def tc_list_courses_with_widget(orgId: str, access_token: str, limit=None, si=None, cursor=None):
+    # call TrainerCentral API, one bounded page per call
+    courses_response = await tc_list_courses(orgId, access_token, limit, si, cursor)
 
     courses = courses_response.get("courses", [])
     meta = courses_response.get("meta", {})
@@ -272,13 +294,14 @@ def tc_list_courses_with_widget(orgId: str, access_token: str, limit=None, si=No
         "courses": courses,
         "totalCourseCount": total,
         "publishedCount": published_count,
-        "draftCount": draft_count
+        "draftCount": draft_count,
+        "nextCursor": courses_response.get("nextCursor")
     }
 
 
 
-def tc_get_course(orgId: str, courseId: str, access_token: str):
-    course = tc.get_course(orgId, access_token, courseId)
+async def tc_get_course(orgId: str, courseId: str, access_token: str):
+    course = await tc.get_course(courseId, orgId, access_token)
     return {
         "structuredContent": {"summary": f"Details for {course.get('name')}"},
         "content": [
@@ -290,6 +313,182 @@ def tc_get_course(orgId: str, courseId: str, access_token: str):
     }
 
 
+async def tc_get_course_outline(courseId: str, orgId: str, access_token: str) -> dict:
+    """
+    Get a course's full outline in one call: course details, chapters with
+    their lessons, lessons outside any chapter, and the course's live workshops.
+
+    Args:
+        courseId (str): Course ID.
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: {
+            "course": {...},
+            "chapters": [{"sectionId", "name", "lessons": [...]}],
+            "unassigned_lessons": [...],
+            "live_workshops": [...],
+            "total_lessons": 12
+        }
+    """
+    return await tc.get_course_outline(courseId, orgId, access_token)
+
+
+async def tc_export_course(courseId: str, orgId: str, access_token: str, archive_name: str = None) -> dict:
+    """
+    Snapshot a course (details, chapters, lessons with their content, and tests)
+    into a compressed line-delimited archive on the server.
+
+    Args:
+        courseId (str): Course ID.
+        archive_name (str, optional): File name for the archive
+            (default "course-<courseId>-<timestamp>").
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: {"archive": "<name>.ndjson.gz", "bytes": 48213, "counts": {"section": 4, "session": 31, ...}}
+    """
+    path = archive_path(archive_name or f"course-{courseId}-{int(time.time())}", orgId)
+    result = await exporter.export_course(courseId, orgId, access_token, path)
+    return {"archive": os.path.basename(path), "bytes": result["bytes"], "counts": result["counts"]}
+
+
+async def tc_import_course(
+    orgId: str,
+    access_token: str,
+    spec: dict = None,
+    archive_name: str = None,
+    archive_org_id: str = None,
+    course_overrides: dict = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Build a whole course (course, chapters, lessons with content, tests) in one call,
+    from a spec or from an archive written by tc_export_course.
+
+    Spec:
+        {
+            "course": {"courseName": "...", "subTitle": "...", "description": "..."},
+            "chapters": [
+                {"name": "Chapter 1", "lessons": [
+                    {"name": "Lesson 1", "description": "...", "content_html": "<p>...</p>",
+                     "tests": [{"name": "Quiz", "description_html": "...",
+                                "questions": {"field": [...]}}]}
+                ]}
+            ],
+            "lessons": [...]     # optional, lessons outside any chapter
+        }
+    The question format is the one tc_create_full_test uses.
+
+    Args:
+        spec (dict, optional): Course spec as above.
+        archive_name (str, optional): Archive to import instead of a spec.
+        archive_org_id (str, optional): Portal the archive was exported from
+            (default orgId); it must be one of the user's portals.
+        course_overrides (dict, optional): Course fields to change, e.g. {"courseName": "Copy of ..."}.
+        dry_run (bool): Only return the planned steps.
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: "courseId", created "chapters" and "lessons" ids, "failures", and step counts.
+    """
+    if archive_name:
+        path = await open_archive(archive_name, archive_org_id or orgId, access_token)
+        return await importer.import_archive(path, orgId, access_token, course_overrides, dry_run)
+    if not spec:
+        raise ValueError("Give spec or archive_name")
+    if course_overrides:
+        spec = {**spec, "course": {**(spec.get("course") or {}), **course_overrides}}
+    return await importer.import_course(spec, orgId, access_token, dry_run)
+
+
+async def tc_clone_course(
+    courseId: str,
+    target_org_ids: list,
+    orgId: str,
+    access_token: str,
+    course_overrides: dict = None,
+) -> dict:
+    """
+    Copy a course (chapters, lessons with content, tests) from portal orgId into
+    one or more of the user's other portals, all targets in parallel.
+
+    Args:
+        courseId (str): Course to copy, in portal orgId.
+        target_org_ids (list): orgIds of the portals to copy it into (see tc_get_org_id).
+        course_overrides (dict, optional): Course fields to change in the copies,
+            e.g. {"courseName": "..."}.
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: per-target results (new "courseId", step counts, "failures"),
+        plus "cloned", "failed" and "total".
+    """
+    return await cloner.clone_course(courseId, orgId, target_org_ids, access_token, course_overrides)
+
+
+async def tc_sync_course(
+    courseId: str,
+    spec: dict,
+    orgId: str,
+    access_token: str,
+    prune: bool = False,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Make an existing course match a spec, sending only the calls that change something.
+
+    The spec has the tc_import_course format. Chapters are matched by name (or
+    "sectionId"), lessons by name within their chapter (or "sessionId"); give the
+    ids to rename or move. Lesson content is compared by hash, so unchanged
+    lessons cost nothing. Tests of existing lessons are not synced.
+
+    Args:
+        courseId (str): Course to sync.
+        spec (dict): Desired course, chapters and lessons.
+        prune (bool): Also delete chapters and lessons missing from the spec (default False).
+        dry_run (bool): Only return the planned calls.
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: "steps" (one per call, with its status) plus "done", "failed", "skipped" and "total".
+    """
+    return await syncer.sync_course(courseId, spec, orgId, access_token, prune, dry_run)
+
+
+async def tc_reorder_course(courseId: str, order: list, orgId: str, access_token: str, dry_run: bool = False) -> dict:
+    """
+    Reorder a course's chapters and lessons, moving lessons across chapters if needed,
+    with the fewest update calls.
+
+    Syntax:
+        tc_reorder_course("3200000000001000001", [
+            {"sectionId": "3200000000002000012", "sessionIds": ["330...21", "330...20"]},
+            {"sectionId": "3200000000002000011", "sessionIds": ["330...19", "330...22"]}
+        ])
+
+    Chapters are listed in their new order, each with its lessons in their new order.
+    Chapters left out keep their order after the listed ones; lessons left out stay
+    in their chapter after the listed ones. Items already in the right relative
+    order are not touched.
+
+    Args:
+        courseId (str): Course ID.
+        order (list): Target order as above.
+        dry_run (bool): Only return the planned moves.
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: the "moves" made (with status), the course's chapter and lesson counts,
+        and "done", "failed", "skipped" and "total".
+    """
+    return await reorderer.reorder(courseId, order, orgId, access_token, dry_run)
 
 
 # # Plain version without widget
@@ -299,7 +498,7 @@ def tc_get_course(orgId: str, courseId: str, access_token: str):
 
 
 #@mcp.tool()
-def tc_update_course(courseId: str, updates: dict, orgId: str, access_token: str) -> dict:
+async def tc_update_course(courseId: str, updates: dict, orgId: str, access_token: str) -> dict:
     """
     Update an existing course.
 
@@ -335,11 +534,11 @@ def tc_update_course(courseId: str, updates: dict, orgId: str, access_token: str
     Returns:
         dict: Updated course object.
     """
-    return tc.update_course(courseId, updates, orgId, access_token)
+    return await tc.update_course(courseId, updates, orgId, access_token)
 
 
 #@mcp.tool()
-def tc_delete_course(courseId: str, orgId: str, access_token: str) -> dict:
+async def tc_delete_course(courseId: str, orgId: str, access_token: str) -> dict:
     """
     Delete a course permanently.
 
@@ -357,10 +556,10 @@ def tc_delete_course(courseId: str, orgId: str, access_token: str) -> dict:
     Returns:
         dict: API delete response.
     """
-    return tc.delete_course(courseId, orgId, access_token)
+    return await tc.delete_course(courseId, orgId, access_token)
 
 
-def tc_view_course_access_requests(courseId: str, orgId: str, access_token: str, limit: int = 15) -> dict:
+async def tc_view_course_access_requests(courseId: str, orgId: str, access_token: str, limit: int = 15, si: int = 0, cursor: str = None) -> dict:
     """
     Get the list of pending access requests for the respective course
 
@@ -370,7 +569,10 @@ def tc_view_course_access_requests(courseId: str, orgId: str, access_token: str,
     Note: Provide orgId and access token of the user, after OAuth, as parameters.  
 
     This will call the TrainerCentral View Course Access Request API:
-        GET /api/v4/{orgId}/courses/{courseId}/courseMembers.json?filter=2&limit={limit}
+        GET /api/v4/{orgId}/courses/{courseId}/courseMembers.json?filter=2&limit={limit}&si={si}
+
+    At most TC_TOOL_PAGE_SIZE requests are returned per call; pass the
+    result's `nextCursor` back as `cursor` to continue.
 
     Required OAuth scope:
         TrainerCentral.courseapi.READ
@@ -378,9 +580,11 @@ def tc_view_course_access_requests(courseId: str, orgId: str, access_token: str,
     Returns:
         dict: API list of pending access requests.
     """
-    return tc.view_course_access_requests(courseId, orgId, access_token, limit)
+    si, limit, filters = resolve_tool_page(cursor, limit, si, courseId=courseId)
+    pages = tc.iter_course_access_requests(filters["courseId"], orgId, access_token, si=si, max_items=limit)
+    return await collect_tool_page(pages, "courseMembers", **filters)
 
-def tc_accept_or_reject_course_view_access_request(courseMembersId: str, orgId: str, access_token:str, responseStatus: int) -> dict:
+async def tc_accept_or_reject_course_view_access_request(courseMembersId: str, orgId: str, access_token:str, responseStatus: int) -> dict:
     """
     Accept or Reject a user's course view access request.
 
@@ -402,4 +606,38 @@ def tc_accept_or_reject_course_view_access_request(courseMembersId: str, orgId:
         dict: Updated course object.
    
     """
-    return tc.accept_or_reject_course_view_access_request(courseMembersId, orgId, access_token, responseStatus)
+    return await tc.accept_or_reject_course_view_access_request(courseMembersId, orgId, access_token, responseStatus)
+
+
+async def tc_bulk_respond_to_course_access_requests(
+    courseId: str,
+    orgId: str,
+    access_token: str,
+    responseStatus: int,
+    courseMembersIds: list = None,
+    emails: list = None,
+    email_domain: str = None,
+    all_pending: bool = False,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Accept or reject many pending course access requests at once.
+
+    Select requests by courseMembersIds, by emails, by email_domain
+    (e.g. "example.com"), or set all_pending=True for every pending request.
+    Use dry_run=True to see which requests match without changing anything.
+
+    responseStatus:
+        2 - accept
+        3 - reject
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: per-request "results" plus "pending", "matched", "accepted"/"rejected"
+        and "failed" counts.
+    """
+    return await tc.bulk_respond_to_access_requests(
+        courseId, orgId, access_token, responseStatus,
+        courseMembersIds, emails, email_domain, all_pending, dry_run
+    )
@@ -3,9 +3,9 @@ FastMCP tools that expose TrainerCentral lesson (session) APIs.
 """
 
 from tools.mcp_registry import mcp
-from library.lessons import TrainerCentralLessons
+from library.lessons import AsyncTrainerCentralLessons
 
-tc_lessons = TrainerCentralLessons()
+tc_lessons = AsyncTrainerCentralLessons()
 
 
 # #@mcp.tool()
@@ -33,7 +33,7 @@ tc_lessons = TrainerCentralLessons()
 #     return tc_lessons.create_lesson(session_data)
 
 #@mcp.tool()
-def tc_create_lesson(
+async def tc_create_lesson(
     session_data: dict,
     content_html: str,
     orgId: str,
@@ -53,9 +53,36 @@ def tc_create_lesson(
     Returns:
         dict: { "lesson": ..., "content": ... }
     """
-    return tc_lessons.create_lesson_with_content(session_data, content_html, orgId, access_token, content_filename)
+    return await tc_lessons.create_lesson_with_content(session_data, content_html, orgId, access_token, content_filename)
 
-def tc_get_course_lessons(courseId: str, orgId: str, access_token: str) -> dict:
+async def tc_create_lessons_bulk(lessons: list, orgId: str, access_token: str) -> dict:
+    """
+    Create many lessons, each with its rich-text content, in one call.
+
+    Lessons are created in the given order; content uploads run concurrently.
+    One failed lesson does not stop the others.
+
+    Args:
+        lessons (list): [
+            {
+                "session_data": {"name": "...", "courseId": "...", "sectionId": "...", "deliveryMode": 4},
+                "content_html": "<p>...</p>",
+                "content_filename": "Content"   # optional
+            },
+            ...
+        ]
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+        dict: {
+            "results": [{"index": 0, "status": "created" | "partial" | "failed", ...}],
+            "created": 39, "partial": 0, "failed": 1, "total": 40
+        }
+    """
+    return await tc_lessons.create_lessons_bulk(lessons, orgId, access_token)
+
+async def tc_get_course_lessons(courseId: str, orgId: str, access_token: str) -> dict:
     """
     Get all lessons (sessions) for a specific course.
     
@@ -116,11 +143,11 @@ def tc_get_course_lessons(courseId: str, orgId: str, access_token: str) -> dict:
         - Provide orgId from tc_get_org_id() tool
         - OAuth scope required: TrainerCentral.sessionapi.READ
     """
-    return tc_lessons.get_course_lessons(courseId, orgId, access_token)
+    return await tc_lessons.get_course_lessons(courseId, orgId, access_token)
 
 
 #@mcp.tool()
-def tc_update_lesson(session_id: str, updates: dict, orgId: str, access_token: str) -> dict:
+async def tc_update_lesson(session_id: str, updates: dict, orgId: str, access_token: str) -> dict:
     """
     Update an existing lesson in TrainerCentral.
 
@@ -147,11 +174,11 @@ def tc_update_lesson(session_id: str, updates: dict, orgId: str, access_token: s
     Returns:
         dict: API response containing the updated session.
     """
-    return tc_lessons.update_lesson(session_id, updates, orgId, access_token)
+    return await tc_lessons.update_lesson(session_id, updates, orgId, access_token)
 
 
 #@mcp.tool()
-def tc_delete_lesson(session_id: str, orgId: str, access_token: str) -> dict:
+async def tc_delete_lesson(session_id: str, orgId: str, access_token: str) -> dict:
     """
     Delete a lesson (or live session) by session ID.
 
@@ -169,4 +196,4 @@ def tc_delete_lesson(session_id: str, orgId: str, access_token: str) -> dict:
     Returns:
         dict: API response for the delete operation.
     """
-    return tc_lessons.delete_lesson(session_id, orgId, access_token)
+    return await tc_lessons.delete_lesson(session_id, orgId, access_token)
@@ -1,11 +1,12 @@
 from tools.mcp_registry import mcp
-from library.live_workshops import TrainerCentralLiveWorkshops
+from library.live_workshops import AsyncTrainerCentralLiveWorkshops
+from library.pagination import resolve_tool_page, collect_tool_page
 
-workshops = TrainerCentralLiveWorkshops()
+workshops = AsyncTrainerCentralLiveWorkshops()
 
 
 #@mcp.tool()
-def tc_create_workshop(session_data: dict, orgId: str, access_token: str) -> dict:
+async def tc_create_workshop(session_data: dict, orgId: str, access_token: str) -> dict:
     """
     Create a GLOBAL Live Workshop (deliveryMode = 3).
 
@@ -33,11 +34,11 @@ def tc_create_workshop(session_data: dict, orgId: str, access_token: str) -> dic
     Returns:
         dict: workshop creation response
     """
-    return workshops.create_global_workshop(session_data, orgId, access_token)
+    return await workshops.create_global_workshop(session_data, orgId, access_token)
 
 
 #@mcp.tool()
-def tc_update_workshop(session_id: str, updates: dict, orgId: str, access_token: str) -> dict:
+async def tc_update_workshop(session_id: str, updates: dict, orgId: str, access_token: str) -> dict:
     """
     Update an existing global workshop.
 
@@ -57,11 +58,11 @@ def tc_update_workshop(session_id: str, updates: dict, orgId: str, access_token:
     Returns:
         dict
     """
-    return workshops.update_workshop(session_id, updates, orgId, access_token)
+    return await workshops.update_workshop(session_id, updates, orgId, access_token)
 
 
 #@mcp.tool()
-def tc_create_workshop_occurrence(talk_data: dict, orgId: str, access_token: str) -> dict:
+async def tc_create_workshop_occurrence(talk_data: dict, orgId: str, access_token: str) -> dict:
     """
     Create a new occurrence (talk) for a workshop.
 
@@ -78,11 +79,37 @@ def tc_create_workshop_occurrence(talk_data: dict, orgId: str, access_token: str
     Returns:
         dict
     """
-    return workshops.create_occurrence(talk_data, orgId, access_token)
+    return await workshops.create_occurrence(talk_data, orgId, access_token)
+
+
+async def tc_create_recurring_workshop_occurrences(session_id: str, recurrence: str, start_time: str,
+                                                   end_time: str, orgId: str, access_token: str,
+                                                   timezone: str = None) -> dict:
+    """
+    Create all occurrences (talks) of a recurring workshop schedule in one call.
+
+    Args:
+      session_id (str): ID of the workshop.
+      recurrence (str): RFC 5545 recurrence rule with COUNT or UNTIL, e.g.
+          "FREQ=WEEKLY;BYDAY=TU,TH;COUNT=24" for a 12-week, twice-weekly bootcamp.
+      start_time (str): Start of the FIRST occurrence, "DD-MM-YYYY HH:MMAM/PM".
+      end_time (str): End of the FIRST occurrence, "DD-MM-YYYY HH:MMAM/PM".
+      timezone (str, optional): IANA timezone of the times, e.g. "Asia/Kolkata".
+
+    Do NOT compute timestamps; the server expands the schedule.
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+      dict: {"talkIds": [...], "results": [...], "created": 24, "failed": 0, "total": 24}
+    """
+    return await workshops.create_recurring_occurrences(
+        session_id, recurrence, start_time, end_time, orgId, access_token, timezone
+    )
 
 
 #@mcp.tool()
-def tc_update_workshop_occurrence(talk_id: str, updates: dict, orgId: str, access_token: str) -> dict:
+async def tc_update_workshop_occurrence(talk_id: str, updates: dict, orgId: str, access_token: str) -> dict:
     """
     Update a workshop occurrence.
 
@@ -101,28 +128,31 @@ def tc_update_workshop_occurrence(talk_id: str, updates: dict, orgId: str, acces
     Returns:
         dict
     """
-    return workshops.update_occurrence(talk_id, updates, orgId, access_token)
+    return await workshops.update_occurrence(talk_id, updates, orgId, access_token)
 
 #@mcp.tool()
-def tc_list_all_global_workshops(org_id: str, access_token: str, filter_type: int = 5, limit: int = 50, si: int = 0) -> dict:
+async def tc_list_all_global_workshops(orgId: str, access_token: str, filter_type: int = 5, limit: int = None, si: int = 0, cursor: str = None) -> dict:
     """
     List upcoming global live workshops (not tied to any course).
 
     Args:
         filter_type (int): 1 = your upcoming, 5 = all upcoming.
-        limit (int): Max number of workshops.
+        limit (int): Max number of workshops, capped at TC_TOOL_PAGE_SIZE.
         si (int): Start index for pagination.
+        cursor (str): `nextCursor` from a previous call, to get the next page.
 
     Note: Provide orgId and access token of the user, after OAuth, as parameters.  
 
     Returns:
-        dict: API response with workshop list.
+        dict: API response with workshop list, plus `nextCursor` when more exist.
     """
-    return workshops.list_all_upcoming_workshops(org_id, access_token, filter_type, limit, si)
+    si, limit, filters = resolve_tool_page(cursor, limit, si, filter=filter_type)
+    pages = workshops.iter_upcoming_workshops(orgId, access_token, filters["filter"], si=si, max_items=limit)
+    return await collect_tool_page(pages, "sessions", **filters)
 
 
 #@mcp.tool()
-def tc_invite_user_to_session(session_id: str, email: str, orgId: str, access_token: str, role: int = 3, source: int = 1) -> dict:
+async def tc_invite_user_to_session(session_id: str, email: str, orgId: str, access_token: str, role: int = 3, source: int = 1) -> dict:
     """
     Invite an existing user (by email) to a course-linked live workshop session.
 
@@ -137,4 +167,63 @@ def tc_invite_user_to_session(session_id: str, email: str, orgId: str, access_to
     Returns:
       dict: JSON response from TrainerCentral API.
     """
-    return workshops.invite_user_to_workshop(session_id, email, orgId, access_token, role, source)
+    return await workshops.invite_user_to_workshop(session_id, email, orgId, access_token, role, source)
+
+
+async def tc_invite_users_to_session_bulk(session_id: str, orgId: str, access_token: str,
+                                          emails: list = None, csv_text: str = None,
+                                          role: int = 3, source: int = 1) -> dict:
+    """
+    Invite many users (by email) to a session in one call.
+
+    Args:
+      session_id (str): ID of the session / live workshop.
+      emails (list, optional): Email IDs, or objects with an "email" field.
+      csv_text (str, optional): CSV with an "email" column.
+      role (int, optional): Session role for every user (default = 3 → attendee).
+      source (int, optional): Source code as per API spec (default = 1).
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+      dict: per-recipient "results" plus "invited" / "failed" / "skipped" counts.
+    """
+    return await workshops.invite_users_to_workshop_bulk(
+        session_id, orgId, access_token, emails, csv_text, role, source
+    )
+
+
+async def tc_update_workshop_occurrence_series(
+    session_id: str,
+    orgId: str,
+    access_token: str,
+    shift_minutes: int = None,
+    move_to_weekday: str = None,
+    cancel_after: str = None,
+    from_time: str = None,
+    timezone: str = None,
+    inform_registrants: bool = True,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Reschedule or cancel all future occurrences of a workshop in one call.
+
+    Args:
+      session_id (str): ID of the workshop.
+      shift_minutes (int, optional): Move every occurrence by N minutes (negative = earlier).
+      move_to_weekday (str, optional): Move every occurrence to this weekday of its week, e.g. "TH" or "3" (Monday = 0).
+      cancel_after (str, optional): Cancel all occurrences from this "DD-MM-YYYY HH:MMAM/PM" on.
+      from_time (str, optional): Only change occurrences from this "DD-MM-YYYY HH:MMAM/PM" on (default: now).
+      timezone (str, optional): IANA timezone, e.g. "Asia/Kolkata".
+      inform_registrants (bool): Notify registrants of every change (default True).
+      dry_run (bool): Only list the planned changes.
+
+    Note: Provide orgId and access token of the user, after OAuth, as parameters.
+
+    Returns:
+      dict: per-occurrence "results" plus "updated"/"cancelled" and "failed" counts.
+    """
+    return await workshops.update_occurrence_series(
+        session_id, orgId, access_token, shift_minutes, move_to_weekday, cancel_after,
+        from_time, timezone, inform_registrants, dry_run
+    )
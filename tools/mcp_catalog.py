@@ -0,0 +1,206 @@
+"""
+MCP tool catalog derived from the tool handlers' signatures.
+
+Each handler's parameters become its JSON input schema: annotations map to
+JSON types and parameters without a default are required. `access_token`
+is injected by the server from the Authorization header, so it never
+appears in a schema. Descriptions come from TOOL_DESCRIPTIONS, falling back
+to the first line of the handler's docstring.
+
+With TC_AUTO_ORG_ID enabled (the default) orgId is never required: the
+server resolves the caller's default portal when it is omitted.
+"""
+
+import os
+import inspect
+
+from library import json_utils
+
+# When enabled, tools/call fills a missing orgId with the caller's default
+# portal, so orgId is optional in every schema.
+AUTO_ORG_ID = os.getenv("TC_AUTO_ORG_ID", "true").lower() == "true"
+
+# Parameters supplied by the server rather than by the model.
+SERVER_PARAMS = {"access_token"}
+
+JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    dict: "object",
+    list: "array",
+}
+
+# Parameters whose JSON type cannot be read from an annotation.
+UNANNOTATED_TYPES = {
+    "limit": "integer",
+    "si": "integer",
+    "cursor": "string",
+}
+
+TOOL_DESCRIPTIONS = {
+    "tc_get_org_id": "Get organizations. Call FIRST in every conversation.",
+    "tc_query_catalog": (
+        "Fast search of courses, chapters, lessons or workshops from a local mirror, "
+        "e.g. by name or courses without lessons; reports the data's age. Requires orgId."
+    ),
+    "tc_create_course": "Create course. Requires orgId.",
+    "tc_get_course": "Get course. Requires orgId.",
+    "tc_list_courses": "List courses. Requires orgId.",
+    "tc_get_course_outline": (
+        "Get a course with its chapters, lessons and live workshops in one call. "
+        "Requires orgId."
+    ),
+    "tc_export_course": (
+        "Snapshot a course with its chapters, lessons, content and tests into a "
+        "compressed archive on the server. Requires orgId."
+    ),
+    "tc_import_course": (
+        "Build a whole course (chapters, lessons with HTML content, tests) in one call "
+        "from a spec or an exported archive. Requires orgId."
+    ),
+    "tc_clone_course": (
+        "Copy a course from portal orgId into one or more of the user's other portals "
+        "(target_org_ids), in parallel. Requires orgId."
+    ),
+    "tc_sync_course": (
+        "Update an existing course to match a spec (tc_import_course format) with only "
+        "the needed creates, updates and (with prune) deletes. Requires orgId."
+    ),
+    "tc_reorder_course": (
+        "Reorder chapters and lessons (also across chapters) with the fewest updates. "
+        "order: [{sectionId, sessionIds: [...]}, ...] in the new order. Requires orgId."
+    ),
+    "tc_update_course": "Update course. Requires orgId.",
+    "tc_delete_course": "Delete course. Requires orgId.",
+    "tc_view_course_access_requests": "View pending access requests for a course. Requires orgId.",
+    "tc_accept_or_reject_course_view_access_request": (
+        "Accept or Reject a user's course view access request. "
+        "responseStatus - 2 : Accept, 3 : Reject. Requires courseMembersId "
+        "(found for each user when getting the list of user's requested). Requires orgId."
+    ),
+    "tc_bulk_respond_to_course_access_requests": (
+        "Accept (responseStatus 2) or reject (3) many pending course access requests. "
+        "Select by courseMembersIds, emails, email_domain or all_pending; "
+        "dry_run lists matches only. Requires orgId."
+    ),
+    "tc_create_chapter": "Create chapter. Requires orgId.",
+    "tc_update_chapter": "Update chapter. Requires orgId.",
+    "tc_delete_chapter": "Delete chapter. Requires orgId.",
+    "tc_create_lesson": "Create lesson. Requires orgId.",
+    "tc_create_lessons_bulk": (
+        "Create many lessons with content in one call. Each item: "
+        "{session_data, content_html, content_filename?}. Requires orgId."
+    ),
+    "tc_update_lesson": "Update lesson. Requires orgId.",
+    "tc_delete_lesson": "Delete lesson. Requires orgId.",
+    "tc_create_workshop": "Create workshop. Requires orgId.",
+    "tc_update_workshop": "Update workshop. Requires orgId.",
+    "tc_create_workshop_occurrence": "Create workshop occurrence. Requires orgId.",
+    "tc_create_recurring_workshop_occurrences": (
+        "Create every occurrence of a recurring workshop from an RRULE "
+        "(e.g. FREQ=WEEKLY;BYDAY=TU,TH;COUNT=24) and the first occurrence's "
+        "start/end as DD-MM-YYYY HH:MMAM/PM. Requires orgId."
+    ),
+    "tc_update_workshop_occurrence": "Update workshop occurrence. Requires orgId.",
+    "tc_update_workshop_occurrence_series": (
+        "Reschedule (shift_minutes, move_to_weekday) or cancel (cancel_after) every "
+        "future occurrence of a workshop in one call. Times as DD-MM-YYYY HH:MMAM/PM. "
+        "Requires orgId."
+    ),
+    "tc_list_all_global_workshops": "List workshops. Requires orgId.",
+    "tc_invite_user_to_session": "Invite user. Requires orgId.",
+    "tc_invite_users_to_session_bulk": (
+        "Invite many users to a session. Pass emails (list) or csv_text "
+        "(CSV with an email column). Requires orgId."
+    ),
+    "tc_create_course_live_session": "Create course live session. Requires orgId.",
+    "tc_list_course_live_sessions": "List course live sessions. Requires orgId.",
+    "tc_delete_course_live_session": "Delete course live session. Requires orgId.",
+    "invite_learner_to_course_or_course_live_session": "Invite learner. Requires orgId.",
+    "tc_invite_learners_bulk": (
+        "Invite many learners to a course or course live session. Pass recipients "
+        "(list of {email, first_name, last_name}) or csv_text. Requires orgId."
+    ),
+}
+
+
+def _json_type(param: inspect.Parameter) -> str:
+    annotation = param.annotation
+    if annotation in JSON_TYPES:
+        return JSON_TYPES[annotation]
+    if param.name in UNANNOTATED_TYPES:
+        return UNANNOTATED_TYPES[param.name]
+    if param.default is not inspect.Parameter.empty and param.default is not None:
+        return JSON_TYPES.get(type(param.default), "string")
+    return "string"
+
+
+def input_schema(func) -> dict:
+    """
+    Build the JSON schema of a handler's model-supplied arguments.
+    """
+    params = [
+        param for param in inspect.signature(func).parameters.values()
+        if param.name not in SERVER_PARAMS
+        and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+    ]
+    # orgId leads every schema, as in the hand-written catalog it replaces.
+    params.sort(key=lambda param: param.name != "orgId")
+    return {
+        "type": "object",
+        "properties": {param.name: {"type": _json_type(param)} for param in params},
+        "required": [
+            param.name for param in params
+            if param.default is inspect.Parameter.empty
+            and not (AUTO_ORG_ID and param.name == "orgId")
+        ],
+    }
+
+
+AUTO_ORG_ID_DESCRIPTIONS = {
+    "tc_get_org_id": (
+        "Get organizations. orgId defaults to the user's default portal, "
+        "so call this only to work in another portal."
+    ),
+}
+
+
+def tool_description(name: str, func) -> str:
+    if AUTO_ORG_ID:
+        if name in AUTO_ORG_ID_DESCRIPTIONS:
+            return AUTO_ORG_ID_DESCRIPTIONS[name]
+        if name in TOOL_DESCRIPTIONS:
+            return TOOL_DESCRIPTIONS[name].replace(
+                "Requires orgId.", "orgId defaults to the user's default portal."
+            )
+    if name in TOOL_DESCRIPTIONS:
+        return TOOL_DESCRIPTIONS[name]
+    doc = inspect.getdoc(func) or ""
+    return doc.strip().splitlines()[0] if doc.strip() else name
+
+
+def build_tool_catalog(registry: dict) -> list:
+    """
+    Describe every tool in `registry` ({name: handler}) for tools/list.
+    """
+    return [
+        {
+            "name": name,
+            "description": tool_description(name, func),
+            "inputSchema": input_schema(func),
+        }
+        for name, func in registry.items()
+    ]
+
+
+class ToolCatalog:
+    """
+    tools/list result built once, with its JSON encoding cached.
+    """
+
+    def __init__(self, registry: dict):
+        self.tools = build_tool_catalog(registry)
+        self.result = {"tools": self.tools}
+        self.encoded = json_utils.dumps(self.result)
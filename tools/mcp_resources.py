@@ -0,0 +1,153 @@
+"""
+In-memory widget resources served by resources/read.
+
+Each widget is an HTML document wrapping one esbuild bundle from web/dist.
+The documents are built once, together with a content-hash ETag and gzip
+(and, when the `brotli` package is installed, brotli) variants, and are only
+rebuilt when the bundle's mtime or size changes.
+
+Configuration (environment variables):
+    TC_WIDGET_RECHECK_SECONDS  how often a lookup may stat the bundle to pick
+                               up a rebuild (default 2, 0 = never re-check)
+"""
+
+import os
+import gzip
+import time
+import hashlib
+import logging
+import threading
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+WIDGET_DIST_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "web", "dist")
+WIDGET_MIME_TYPE = "text/html+skybridge"
+RECHECK_SECONDS = float(os.getenv("TC_WIDGET_RECHECK_SECONDS", "2"))
+
+WIDGET_BUNDLES = {
+    "ui://widget/courses.html": "courses-widget.js",
+    "ui://widget/course-details.html": "course-details.js",
+}
+
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html><body>
+  <div id="root"></div>
+  <script type="module">{bundle}</script>
+</body></html>
+"""
+
+
+class WidgetResource:
+    """
+    One built widget document and its precompressed variants.
+    """
+
+    def __init__(self, uri: str, path: str, bundle: str, stamp: tuple):
+        self.uri = uri
+        self.path = path
+        self.stamp = stamp
+        self.html = HTML_TEMPLATE.format(bundle=bundle)
+        body = self.html.encode()
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.encodings = {"identity": body, "gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.encodings["br"] = brotli.compress(body)
+        self.checked_at = time.monotonic()
+
+    def variant(self, accept_encoding: str = None) -> tuple:
+        """
+        Pick the smallest variant the client accepts.
+
+        Returns:
+            tuple: (content_encoding, body_bytes)
+        """
+        accepted = {
+            part.split(";")[0].strip().lower()
+            for part in (accept_encoding or "").split(",")
+        }
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.encodings:
+                return encoding, self.encodings[encoding]
+        return "identity", self.encodings["identity"]
+
+
+class WidgetStore:
+    """
+    URI -> WidgetResource map, rebuilt per widget when its bundle changes.
+    """
+
+    def __init__(self, bundles: dict = None, dist_dir: str = WIDGET_DIST_DIR):
+        self.bundles = dict(bundles or WIDGET_BUNDLES)
+        self.dist_dir = dist_dir
+        self._resources = {}
+        self._lock = threading.Lock()
+
+    def preload(self) -> None:
+        """
+        Build every widget whose bundle exists; missing builds are logged.
+        """
+        for uri in self.bundles:
+            try:
+                self.get(uri)
+            except FileNotFoundError as e:
+                logger.warning("Widget bundle missing: %s", e.filename)
+
+    def get(self, uri: str) -> WidgetResource:
+        """
+        Return the built resource for `uri`.
+
+        Raises:
+            KeyError: unknown URI.
+            FileNotFoundError: the bundle has not been built.
+        """
+        resource = self._resources.get(uri)
+        if resource is not None and (
+            RECHECK_SECONDS <= 0 or time.monotonic() - resource.checked_at < RECHECK_SECONDS
+        ):
+            return resource
+
+        path = os.path.join(self.dist_dir, self.bundles[uri])
+        with self._lock:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self._resources.pop(uri, None)
+                raise FileNotFoundError(2, "Widget bundle missing", path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+
+            resource = self._resources.get(uri)
+            if resource is not None and resource.stamp == stamp:
+                resource.checked_at = time.monotonic()
+                return resource
+
+            with open(path, "r") as f:
+                bundle = f.read()
+            resource = WidgetResource(uri, path, bundle, stamp)
+            self._resources[uri] = resource
+            logger.info(
+                "Built widget %s (%d bytes, etag %s)",
+                uri, len(resource.encodings["identity"]), resource.etag
+            )
+            return resource
+
+    def by_filename(self, filename: str) -> WidgetResource:
+        """
+        Look a widget up by the last path segment of its URI, e.g. "courses.html".
+        """
+        return self.get(f"ui://widget/{filename}")
+
+
+widget_store = WidgetStore()
+
+
+def get_widget_store() -> WidgetStore:
+    """
+    Return the process-wide widget store.
+    """
+    return widget_store
@@ -3,16 +3,19 @@ Portal management tools
 """
 
 from library.oauth import (
-    get_user_portals,
+    get_user_portals_async,
     extract_default_org_id,
     extract_all_org_ids,
 )
 
 
-def tc_get_org_id(access_token: str) -> dict:
+async def tc_get_org_id(access_token: str) -> dict:
     """
     Get all portals (organizations) for the authenticated user.
 
+    The portal list is cached per access token, so repeated calls within a
+    conversation do not reach TrainerCentral.
+
     This tool should be called ONCE at the start of a conversation to:
     1. Retrieve all available portals for the user
     2. Get the default portal's orgId
@@ -26,7 +29,7 @@ def tc_get_org_id(access_token: str) -> dict:
             "total_portals": 2
         }
     """
-    portals_data = get_user_portals(access_token)
+    portals_data = await get_user_portals_async(access_token)
 
     # default_org_id = extract_default_org_id(portals_data)
     all_org_ids = extract_all_org_ids(portals_data)
@@ -6,8 +6,19 @@ export default function ChaptersTab({ courseId }) {
 
   useEffect(() => {
     window.openai
-      ?.callTool("tc_get_course_lessons", { courseId })
-      .then((res) => setChapters(res.chapters || []));
+      ?.callTool("tc_get_course_outline", { courseId })
+      .then((res) => {
+        // The outline arrives as JSON text content, not structuredContent.
+        let outline = res?.structuredContent;
+        if (!outline?.chapters) {
+          try {
+            outline = JSON.parse(res?.content?.[0]?.text || "{}");
+          } catch {
+            outline = {};
+          }
+        }
+        setChapters(outline.chapters || []);
+      });
   }, [courseId]);
 
   if (!chapters) return <Spinner />;